@@ -1,18 +1,27 @@
+from Utils.IdAllocator import IdAllocator
+
+
 class Product:
-    __idActual= 1
+    # Sin __dict__ por instancia: menos memoria y acceso a atributos más rápido
+    __slots__ = ("_productID", "_name", "_author", "_category", "_quantity", "_price", "_listener")
+    _ids = IdAllocator()
     def __init__(self, name: str, author: str, category: str, quantity: int, price: float, product_id: int | None = None):
         if product_id is None:
-            self._productID = Product.__idActual
-            Product.__idActual += 1
+            self._productID = Product._ids.next()
         else:
             self._productID = int(product_id)
-            if self._productID >= Product.__idActual:
-                Product.__idActual = self._productID + 1
+            Product._ids.observe(self._productID)
         self._name = name
         self._author = author
         self._category = category
         self._quantity = quantity
         self._price = price
+        # Callback opcional (p. ej. Inventory) avisado en cada cambio vía setters
+        self._listener = None
+
+    def _changed(self) -> None:
+        if self._listener is not None:
+            self._listener(self)
 
     @property
     def productID(self) -> int:
@@ -23,30 +32,35 @@ class Product:
     @name.setter
     def name(self, value: str):
         self._name = value
+        self._changed()
     @property
     def author(self) -> str:
         return self._author
     @author.setter
     def author(self, value: str):
         self._author = value
+        self._changed()
     @property
     def category(self) -> str:
         return self._category
     @category.setter
     def category(self, value: str):
         self._category = value
+        self._changed()
     @property
     def quantity(self) -> int:
         return self._quantity
     @quantity.setter
     def quantity(self, value: int):
         self._quantity = value
+        self._changed()
     @property
     def price(self) -> float:
         return self._price
     @price.setter
     def price(self, value: float):
         self._price = value
+        self._changed()
     @property
     def total(self) -> float:
         return self._price * self._quantity
\ No newline at end of file
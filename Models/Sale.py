@@ -1,21 +1,28 @@
 # python
+from Utils.IdAllocator import IdAllocator
+
 class Sale:
-    __idActual = 1
+    # Sin __dict__ por instancia: menos memoria y acceso a atributos más rápido
+    __slots__ = ("_saleID", "_username", "_product", "_quantity", "_price", "_role", "_timestamp", "_productID")
+    _ids = IdAllocator()
 
-    def __init__(self, username: str, product: str, quantity: int, price: float, role: int, sale_id: int | None = None):
+    def __init__(self, username: str, product: str, quantity: int, price: float, role: int, sale_id: int | None = None,
+                 timestamp: float | None = None, product_id: int | None = None):
         if sale_id is None:
-            self._saleID = Sale.__idActual
-            Sale.__idActual += 1
+            self._saleID = Sale._ids.next()
         else:
             self._saleID = int(sale_id)
-            if self._saleID >= Sale.__idActual:
-                Sale.__idActual = self._saleID + 1
+            Sale._ids.observe(self._saleID)
 
         self._username = username
         self._product = product
         self._quantity = int(quantity)
         self._price = float(price)
         self._role = int(role)
+        # Momento de la venta (segundos epoch); None en ventas antiguas sin fecha
+        self._timestamp = float(timestamp) if timestamp else None
+        # ID del producto vendido: enlaza la venta con Inventory aunque el producto cambie de nombre
+        self._productID = int(product_id) if product_id is not None and product_id >= 0 else None
 
     @property
     def saleID(self) -> int:
@@ -49,6 +56,14 @@ class Sale:
     def role(self) -> int:
         return self._role
 
+    @property
+    def productID(self) -> int | None:
+        return self._productID
+
+    @property
+    def timestamp(self) -> float | None:
+        return self._timestamp
+
     @property
     def total(self) -> float:
         return self._price * self._quantity
@@ -1,15 +1,17 @@
 # Models/User.py
+from Utils.IdAllocator import IdAllocator
+
 class User:
-    __idActual = 1
+    # Sin __dict__ por instancia: menos memoria y acceso a atributos más rápido
+    __slots__ = ("_userID", "_name", "_username", "_password", "_role")
+    _ids = IdAllocator()
 
     def __init__(self, name: str, username: str, password: str, role: int, user_id: int | None = None):
         if user_id is None:
-            self._userID = User.__idActual
-            User.__idActual += 1
+            self._userID = User._ids.next()
         else:
             self._userID = int(user_id)
-            if self._userID >= User.__idActual:
-                User.__idActual = self._userID + 1
+            User._ids.observe(self._userID)
         self._name = name
         self._username = username
         self._password = password
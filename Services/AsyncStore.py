@@ -0,0 +1,190 @@
+from Models.Product import Product
+from Models.Sale import Sale
+from Models.User import User
+from Services.Inventory import Inventory
+from Services.Repository import CsvRepository, Repository
+from Services.SaleService import SaleService
+from Services.UserService import UserService
+from Utils.Events import EventSink, NullSink
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncStore:
+    """
+    Fachada asyncio sobre Inventory, SaleService y UserService.
+    - Las operaciones en memoria (búsquedas, altas, compras aplazadas) se
+      ejecutan directamente en el event loop: son rápidas y no tocan disco.
+    - Todo lo que hace E/S (cargar, guardar, compras en SQLite, estadísticas
+      por SQL) se ejecuta en un hilo aparte, así el loop nunca se bloquea.
+    - Las escrituras se acumulan y una tarea de fondo las persiste por lotes
+      cada flushInterval segundos (un fsync por lote, no por compra). Si un
+      lote falla, sigue pendiente y se reintenta cada retryInterval segundos.
+    Uso:
+        async with AsyncStore(repo=CsvRepository("../Archivos")) as store:
+            sale = await store.purchase(user, "Dune", 2)
+    """
+
+    def __init__(self, inventory: Inventory | None = None, sales: SaleService | None = None,
+                 users: UserService | None = None, repo: Repository | None = None,
+                 flushInterval: float = 0.2, retryInterval: float = 1.0, events: EventSink | None = None):
+        # Sin consola: por defecto los servicios creados aquí no emiten mensajes
+        events = events if events is not None else NullSink()
+        self._events = events
+        self.inventory = inventory if inventory is not None else Inventory(events)
+        self.sales = sales if sales is not None else SaleService(events, self.inventory.categoryOf,
+                                                                   self.inventory.productIdOf)
+        self.users = users if users is not None else UserService(events)
+        self.repo = repo if repo is not None else CsvRepository()
+        self._flushInterval = flushInterval
+        self._retryInterval = retryInterval
+        # Un solo hilo de E/S: las escrituras llegan al disco en orden
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store-io")
+        self._wake = asyncio.Event()
+        self._flushLock = asyncio.Lock()
+        self._pendingWrites = 0
+        self._usersDirty = False
+        self._flusher: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "AsyncStore":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _load(self) -> None:
+        self.repo.loadInventory(self.inventory)
+        self.repo.loadSales(self.sales)
+        self.repo.loadUsers(self.users)
+
+    async def start(self, load: bool = True) -> None:
+        """Carga los datos del repositorio (fuera del loop) y arranca la persistencia de fondo."""
+        if load:
+            await self._run(self._load)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flushLoop())
+
+    async def close(self) -> None:
+        """Detiene la tarea de fondo, persiste lo pendiente y libera el repositorio."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                self._events.emit(f"Background flush stopped: {e}", "red")
+            self._flusher = None
+        # Un último lote que falla se propaga, pero el repositorio se cierra igual
+        try:
+            await self.flush()
+        finally:
+            await self._run(self.repo.close)
+            self._executor.shutdown(wait=True)
+
+    # --- Persistencia por lotes ---
+
+    def _markDirty(self, users: bool = False) -> None:
+        self._pendingWrites += 1
+        self._usersDirty = self._usersDirty or users
+        self._wake.set()
+
+    async def _flushLoop(self) -> None:
+        while True:
+            await self._wake.wait()
+            # Se espera un intervalo para agrupar todas las escrituras que lleguen mientras tanto
+            await asyncio.sleep(self._flushInterval)
+            try:
+                await self.flush()
+            except Exception as e:
+                # Lo pendiente sigue marcado (flush lo devuelve) y el bucle lo reintenta
+                self._events.emit(f"Error persisting pending writes: {e}", "red")
+                await asyncio.sleep(self._retryInterval)
+
+    def _flushSync(self, users: bool) -> None:
+        self.repo.flush(self.inventory, self.sales)
+        if users:
+            self.repo.saveUsers(self.users)
+
+    async def flush(self) -> int:
+        """Persiste ya las escrituras pendientes; devuelve cuántas había."""
+        async with self._flushLock:
+            pending, users = self._pendingWrites, self._usersDirty
+            if not pending:
+                return 0
+            # Se limpia antes de escribir: lo que llegue durante el flush va al siguiente lote
+            self._pendingWrites, self._usersDirty = 0, False
+            self._wake.clear()
+            try:
+                await self._run(self._flushSync, users)
+            except Exception:
+                self._pendingWrites += pending
+                self._usersDirty = self._usersDirty or users
+                self._wake.set()
+                raise
+            return pending
+
+    # --- Inventario ---
+
+    async def findProduct(self, name: str) -> Product | None:
+        return self.inventory.findProductByName(name)
+
+    async def searchProduct(self, query: str, limit: int | None = None) -> list[Product]:
+        return self.inventory.searchProduct(query, limit)
+
+    async def addProduct(self, name: str, author: str, category: str, quantity: int, price: float) -> bool:
+        added = self.inventory.addProduct(name, author, category, quantity, price)
+        if added:
+            self._markDirty()
+        return added
+
+    async def updateProduct(self, name: str, **changes) -> bool:
+        updated = self.inventory.updateProduct(name, **changes)
+        if updated:
+            self._markDirty()
+        return updated
+
+    async def purchase(self, user: User, name: str, qty: int) -> Sale | None:
+        """Compra qty unidades de name; la escritura a disco queda para el siguiente lote."""
+        if self.repo.deferredWrites:
+            sale = self.repo.purchase(self.inventory, self.sales, user, name, qty, defer=True)
+        else:
+            sale = await self._run(self.repo.purchase, self.inventory, self.sales, user, name, qty)
+        if sale is not None:
+            self._markDirty()
+        return sale
+
+    # --- Ventas ---
+
+    async def salesStatistics(self, top: int = 3) -> dict:
+        return await self._run(self.repo.salesStatistics, self.sales, top)
+
+    # --- Usuarios ---
+
+    async def findUser(self, name: str) -> User | None:
+        return self.users.findUserByName(name)
+
+    async def _hash(self, password: str) -> str:
+        # El hash es lento a propósito: se calcula en el pool por defecto, sin
+        # bloquear el bucle ni la cola de escrituras de store-io
+        return await asyncio.get_running_loop().run_in_executor(None, self.users.hashPassword, password)
+
+    async def addUser(self, name: str, username: str, password: str, role: int) -> bool:
+        added = self.users.addUser(name, username, await self._hash(password), role, hashed=True)
+        if added:
+            self._markDirty(users=True)
+        return added
+
+    async def updateUser(self, name: str, **changes) -> bool:
+        password = changes.get("new_password")
+        if password is not None and password.strip() != "" and not changes.get("hashed"):
+            changes["new_password"] = await self._hash(password)
+            changes["hashed"] = True
+        updated = self.users.updateUser(name, **changes)
+        if updated:
+            self._markDirty(users=True)
+        return updated
@@ -0,0 +1,114 @@
+from Models.User import User
+from Services.UserService import UserService
+from Utils.Passwords import PBKDF2_ITERATIONS, SCRYPT_N, needs_rehash, verify_password
+from collections import OrderedDict
+from typing import Callable
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+
+class AuthService:
+    """
+    Autenticación sobre UserService:
+    - username -> User en O(1) (índice de UserService), sin recorrer la lista
+    - contraseñas con hash y sal (pbkdf2 o scrypt, coste configurable, también
+      para las altas de UserService); un hash con otro coste se rehace al
+      iniciar sesión y se avisa a onUpgrade para guardarlo
+    - sesiones: login devuelve un token y authenticate(token) no vuelve a
+      calcular el hash; las sesiones viven en una caché LRU con caducidad
+    - credenciales ya verificadas: un segundo login con la misma contraseña
+      se comprueba con un HMAC rápido en lugar del hash lento
+    """
+
+    def __init__(self, users: UserService, algorithm: str = "pbkdf2",
+                 iterations: int = PBKDF2_ITERATIONS, n: int = SCRYPT_N,
+                 maxSessions: int = 4096, sessionTTL: float = 3600.0,
+                 onUpgrade: Callable[[User], None] | None = None):
+        self._users = users
+        self._algorithm = algorithm
+        self._iterations = iterations
+        self._n = n
+        # Las altas y cambios de contraseña de UserService usan el mismo coste
+        users.setPasswordHashing(algorithm=algorithm, iterations=iterations, n=n)
+        self._maxSessions = maxSessions
+        self._sessionTTL = sessionTTL
+        self._onUpgrade = onUpgrade
+        self._lock = threading.Lock()
+        # token -> (userID, caducidad)
+        self._sessions: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        # userID -> (hash guardado, HMAC de la contraseña verificada)
+        self._verified: OrderedDict[int, tuple[str, bytes]] = OrderedDict()
+        # Clave del proceso: los HMAC no sirven fuera de esta ejecución
+        self._secret = secrets.token_bytes(32)
+
+    def hashPassword(self, password: str) -> str:
+        return self._users.hashPassword(password)
+
+    def _mac(self, password: str) -> bytes:
+        return hmac.new(self._secret, password.encode("utf-8"), hashlib.sha256).digest()
+
+    def _remember(self, cache: OrderedDict, key, value) -> None:
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self._maxSessions:
+                cache.popitem(last=False)
+
+    def verify(self, user: User, password: str) -> bool:
+        """
+        Comprueba password. La caché solo sirve para aceptar: si coincide con la
+        última contraseña verificada (y el hash guardado no cambió) se evita el hash
+        lento; si no, se verifica con el hash, así un intento fallido cuesta lo mismo
+        con o sin caché.
+        """
+        mac = self._mac(password)
+        with self._lock:
+            cached = self._verified.get(user.userID)
+            if cached is not None and cached[0] == user.password and hmac.compare_digest(cached[1], mac):
+                self._verified.move_to_end(user.userID)
+                return True
+        if not verify_password(password, user.password):
+            return False
+        if needs_rehash(user.password, self._algorithm, self._iterations, self._n):
+            # Contraseña en texto plano o con otro coste: se rehace con el actual
+            user.password = self.hashPassword(password)
+            if self._onUpgrade is not None:
+                self._onUpgrade(user)
+        self._remember(self._verified, user.userID, (user.password, mac))
+        return True
+
+    def login(self, username: str, password: str) -> tuple[User, str] | None:
+        """Devuelve (usuario, token de sesión) o None si las credenciales no valen."""
+        user = self._users.findUserByUsername(username)
+        if user is None or not self.verify(user, password):
+            return None
+        token = secrets.token_urlsafe(32)
+        self._remember(self._sessions, token, (user.userID, time.monotonic() + self._sessionTTL))
+        return user, token
+
+    def authenticate(self, token: str) -> User | None:
+        """Usuario de una sesión abierta (sin recalcular ningún hash) o None."""
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            user_id, expires = entry
+            if expires < time.monotonic():
+                del self._sessions[token]
+                return None
+            self._sessions.move_to_end(token)
+        return self._users.findUserByID(user_id)
+
+    def logout(self, token: str) -> None:
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def forget(self, user: User) -> None:
+        """Cierra las sesiones y olvida la verificación de user (p. ej. al cambiar su contraseña)."""
+        with self._lock:
+            self._verified.pop(user.userID, None)
+            for token in [t for t, (uid, _) in self._sessions.items() if uid == user.userID]:
+                del self._sessions[token]
@@ -0,0 +1,40 @@
+from Models.Sale import Sale
+from Models.User import User
+from Services.Inventory import Inventory
+from Services.SaleService import SaleService
+from Utils.Events import EventSink
+
+
+class CheckoutService:
+    """
+    Motor de compras seguro entre hilos. Cada compra bloquea solo su producto
+    (Inventory.productLock), así que compras de productos distintos avanzan en
+    paralelo; la comprobación de stock, el descuento y el registro de la venta
+    ocurren dentro del mismo lock y nunca se vende más de lo disponible.
+    """
+
+    def __init__(self, inventory: Inventory, sales: SaleService, events: EventSink | None = None):
+        self._inventory = inventory
+        self._sales = sales
+        self._events = events if events is not None else inventory._events
+
+    def checkout(self, user: User, name: str, qty: int, defer: bool = False) -> Sale | None:
+        """defer=True deja stock y venta en memoria para persistirlos por lotes."""
+        if qty <= 0:
+            self._events.emit("Quantity must be positive.", "red")
+            return None
+        product = self._inventory.findProductByName(name)
+        if not product:
+            self._events.emit("Product not found.", "red")
+            return None
+        with self._inventory.productLock(product):
+            if not self._inventory.purchase(product.name, qty, defer=defer):
+                return None
+            try:
+                return self._sales.addSale(username=user.username, product=product.name, quantity=qty,
+                                           price=product.price, role=int(user.role), defer=defer,
+                                           product_id=product.productID)
+            except Exception:
+                # Sin venta registrada la compra no cuenta: se devuelve el stock
+                self._inventory.restock(product.name, qty, defer=defer)
+                raise
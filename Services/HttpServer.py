@@ -0,0 +1,371 @@
+from Models.Product import Product
+from Models.Sale import Sale
+from Models.User import User
+from Services.Inventory import Inventory
+from Services.Repository import CsvRepository, Repository
+from Services.SaleService import SaleService
+from Services.UserService import UserService
+from Utils.Decorator import *
+from Utils.Events import BufferedSink, EventSink, NullSink
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import json
+import threading
+import time
+
+
+def _productJSON(p: Product) -> dict:
+    return {"productID": p.productID, "name": p.name, "author": p.author, "category": p.category,
+            "quantity": p.quantity, "price": p.price, "total": p.total}
+
+
+def _saleJSON(s: Sale) -> dict:
+    return {"saleID": s.saleID, "username": s.username, "product": s.product, "quantity": s.quantity,
+            "price": s.price, "total": s.total, "timestamp": s.timestamp,
+            "productID": s.productID}
+
+
+def _intField(value) -> int:
+    # JSON: 2 y 2.0 valen, 1.7 o true no (int() los truncaría o aceptaría)
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(value)
+    return int(value)
+
+
+def _userJSON(u: User) -> dict:
+    # La contraseña nunca sale del servidor
+    return {"userID": u.userID, "name": u.name, "username": u.username, "role": int(u.role)}
+
+
+class UnsavedPurchase(Exception):
+    """La compra se aplicó en memoria pero su lote no llegó a disco (se reintenta)."""
+
+    def __init__(self, sale: Sale, error: Exception):
+        super().__init__(str(error))
+        self.sale = sale
+
+
+class GroupCommit:
+    """
+    Commit en grupo: las escrituras aplazadas (defer=True) se acumulan durante
+    `window` segundos y un hilo las persiste juntas con repo.flush. commit()
+    bloquea al llamante hasta que el lote que contiene su escritura está en
+    disco, así cada respuesta es durable pero el fsync se reparte entre todas.
+    Si un flush falla, lo pendiente sigue en los servicios y se reintenta
+    cada `retry` segundos.
+    """
+
+    def __init__(self, repo: Repository, inventory: Inventory, sales: SaleService, window: float = 0.005,
+                 retry: float = 1.0, events: EventSink | None = None):
+        self._repo = repo
+        self._events = events if events is not None else NullSink()
+        self._inventory = inventory
+        self._sales = sales
+        self._window = window
+        self._retry = retry
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._generation = 0  # último lote abierto
+        self._flushed = 0     # último lote persistido
+        self._failed: dict[int, Exception] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def mark(self) -> int:
+        """Anota una escritura ya hecha en memoria; devuelve el lote que la persistirá."""
+        with self._cond:
+            self._pending += 1
+            self._cond.notify_all()
+            return self._generation + 1
+
+    def wait(self, batch: int) -> None:
+        """Espera a que batch esté persistido; relanza el error si el flush falló."""
+        with self._cond:
+            while self._flushed < batch:
+                self._cond.wait()
+            error = self._failed.get(batch)
+        if error is not None:
+            raise error
+
+    def commit(self) -> None:
+        self.wait(self.mark())
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+            time.sleep(self._window)
+            with self._cond:
+                # Todo lo marcado hasta aquí ya está en memoria y entra en este lote
+                self._pending = 0
+                self._generation += 1
+                batch = self._generation
+            failed = False
+            try:
+                self._repo.flush(self._inventory, self._sales)
+            except Exception as e:
+                self._events.emit(f"Error persisting batch {batch}: {e}", "red")
+                failed = True
+                with self._cond:
+                    self._failed[batch] = e
+            with self._cond:
+                self._flushed = batch
+                self._failed.pop(batch - 16, None)
+                self._cond.notify_all()
+            if failed:
+                # Sin nuevas escrituras también hay que reintentar lo que quedó en memoria
+                with self._cond:
+                    self._cond.wait_for(lambda: self._closed, self._retry)
+                    if not self._closed:
+                        self._pending += 1
+
+    def close(self) -> None:
+        """Persiste lo pendiente y detiene el hilo."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+class StoreServer(ThreadingHTTPServer):
+    """Servidor HTTP/JSON sobre los servicios; un hilo por conexión (keep-alive)."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], repo: Repository | None = None,
+                 inventory: Inventory | None = None, sales: SaleService | None = None,
+                 users: UserService | None = None, window: float = 0.005, load: bool = True,
+                 events: EventSink | None = None):
+        # Por defecto sin mensajes por petición; --log usa un BufferedSink
+        self.events = events if events is not None else NullSink()
+        self.repo = repo if repo is not None else CsvRepository()
+        self.inventory = inventory if inventory is not None else Inventory(self.events)
+        self.sales = sales if sales is not None else SaleService(self.events, self.inventory.categoryOf,
+                                                                      self.inventory.productIdOf)
+        self.users = users if users is not None else UserService(self.events)
+        if load:
+            self.repo.loadInventory(self.inventory)
+            self.repo.loadSales(self.sales)
+            self.repo.loadUsers(self.users)
+        self.committer = GroupCommit(self.repo, self.inventory, self.sales, window=window,
+                                     events=self.events)
+        super().__init__(address, StoreHandler)
+
+    def findUser(self, key) -> User | None:
+        if isinstance(key, int) or (isinstance(key, str) and key.isdecimal()):
+            return self.users.findUserByID(int(key))
+        return self.users.findUserByName(str(key))
+
+    def purchase(self, user: User, name: str, qty: int) -> Sale | None:
+        """
+        Compra y espera a que esté en disco. Si el lote falla la compra ya está
+        hecha: lanza UnsavedPurchase con la venta en lugar de deshacerla.
+        """
+        if self.repo.deferredWrites:
+            sale = self.repo.purchase(self.inventory, self.sales, user, name, qty, defer=True)
+            if sale is not None:
+                try:
+                    self.committer.commit()
+                except Exception as e:
+                    raise UnsavedPurchase(sale, e) from e
+        else:
+            # La compra ya es una transacción propia; el lote solo recoge el inventario
+            sale = self.repo.purchase(self.inventory, self.sales, user, name, qty)
+            if sale is not None:
+                self.committer.mark()
+        return sale
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.committer.close()
+        self.repo.close()
+        self.events.close()
+
+
+class StoreHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1: la conexión se mantiene abierta entre peticiones (keep-alive)
+    protocol_version = "HTTP/1.1"
+    server: StoreServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        self._send(status, {"error": message})
+
+    def _contentLength(self) -> int | None:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            return None
+        return length if length >= 0 else None
+
+    def _readJSON(self, length: int) -> dict | None:
+        try:
+            data = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            match parts:
+                case ["products"]:
+                    self._listProducts(query)
+                case ["products", "search"]:
+                    limit = int(query["limit"]) if "limit" in query else None
+                    results = self.server.inventory.searchProduct(query.get("q", ""), limit)
+                    self._send(200, [_productJSON(p) for p in results])
+                case ["products", product_id] if product_id.isdigit():
+                    product = self.server.inventory.findProductByID(int(product_id))
+                    if product is None:
+                        self._error(404, "product not found")
+                    else:
+                        self._send(200, _productJSON(product))
+                case ["products", product_id, "sales"] if product_id.isdigit():
+                    product = self.server.inventory.findProductByID(int(product_id))
+                    if product is None:
+                        self._error(404, "product not found")
+                    else:
+                        self._send(200, self.server.sales.productSales(product))
+                case ["sales", "stats"]:
+                    top = int(query.get("top", 3))
+                    self._send(200, self.server.repo.salesStatistics(self.server.sales, top))
+                case ["users"] if "name" in query:
+                    user = self.server.users.findUserByName(query["name"])
+                    if user is None:
+                        self._error(404, "user not found")
+                    else:
+                        self._send(200, _userJSON(user))
+                case ["users", user_id] if user_id.isdigit():
+                    user = self.server.users.findUserByID(int(user_id))
+                    if user is None:
+                        self._error(404, "user not found")
+                    else:
+                        self._send(200, _userJSON(user))
+                case _:
+                    self._error(404, "not found")
+        except ValueError as e:
+            self._error(400, str(e))
+
+    def _listProducts(self, query: dict) -> None:
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 100))
+        if offset < 0 or limit < 0:
+            raise ValueError("offset and limit must not be negative")
+        sort = query.get("sort", "id")
+        order = query.get("order", "asc")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be 'asc' or 'desc'")
+        reverse = order == "desc"
+        inventory = self.server.inventory
+        page = inventory.listProducts(sort, offset, limit, reverse)
+        self._send(200, {"total": inventory.productCount(), "offset": offset, "sort": sort,
+                         "products": [_productJSON(p) for p in page]})
+
+    def _discardBody(self, length: int) -> None:
+        # El cuerpo no leído se tomaría como la siguiente petición de la conexión
+        while length > 0:
+            chunk = self.rfile.read(min(length, 65536))
+            if not chunk:
+                self.close_connection = True
+                return
+            length -= len(chunk)
+
+    def do_POST(self) -> None:
+        length = self._contentLength()
+        if urlsplit(self.path).path.rstrip("/") != "/purchase":
+            if length is None:
+                self.close_connection = True
+            else:
+                self._discardBody(length)
+            self._error(404, "not found")
+            return
+        if length is None:
+            # Sin longitud válida no se sabe dónde acaba el cuerpo: se cierra la conexión
+            self.close_connection = True
+            self._error(400, "invalid Content-Length")
+            return
+        data = self._readJSON(length)
+        if data is None:
+            self._error(400, "invalid JSON body")
+            return
+        try:
+            qty = _intField(data.get("qty", 1))
+        except (TypeError, ValueError):
+            self._error(400, "qty must be an integer")
+            return
+        if qty <= 0:
+            self._error(400, "qty must be positive")
+            return
+        user = self.server.findUser(data.get("user", ""))
+        if user is None:
+            self._error(404, "user not found")
+            return
+        product = self.server.inventory.findProductByName(str(data.get("product", "")))
+        if product is None:
+            self._error(404, "product not found")
+            return
+        try:
+            sale = self.server.purchase(user, product.name, qty)
+        except UnsavedPurchase as e:
+            # 202: la venta existe y se guardará en el siguiente lote; repetir
+            # la petición compraría otra vez
+            self._send(202, {**_saleJSON(e.sale), "persisted": False, "error": f"sale not saved yet: {e}"})
+            return
+        except Exception as e:
+            self._error(500, f"purchase could not be saved: {e}")
+            return
+        if sale is None:
+            self._error(409, "insufficient stock")
+        else:
+            self._send(201, _saleJSON(sale))
+
+
+def serve(repo: Repository, host: str = "127.0.0.1", port: int = 8000, window: float = 0.005,
+          log: bool = False) -> None:
+    server = StoreServer((host, port), repo=repo, window=window, events=BufferedSink() if log else None)
+    print(color(f"Store API listening on http://{host}:{server.server_address[1]}", "green"))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the store as a JSON API over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--dir", default="Archivos", help="CSV directory (default: Archivos)")
+    parser.add_argument("--db", help="SQLite database; overrides --dir")
+    parser.add_argument("--window", type=float, default=0.005, help="group commit window in seconds")
+    parser.add_argument("--log", action="store_true", help="log service messages to stderr")
+    args = parser.parse_args()
+    if args.db:
+        from Services.SqliteRepository import SqliteRepository
+        repo = SqliteRepository(args.db)
+    else:
+        repo = CsvRepository(args.dir)
+    serve(repo, args.host, args.port, args.window, args.log)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,336 @@
 from Models.Product import Product
+from Services.InventoryStats import InventoryStats
+from Utils.BulkResult import BulkResult
 from Utils.Decorator import *
+from Utils.Events import EventSink, console
+from Utils.IdAllocator import IdAllocator
+from Utils.SearchIndex import SearchIndex
+from Utils.SortedIndex import SortedIndex
+from Utils.CsvStream import LoadReport, iter_csv
+from Utils.Snapshot import SnapshotSchema, is_fresh, read_snapshot, snapshot_path, write_snapshot
+from Utils.Validator import PRODUCT_SPEC, Field, NameSet, RecordSpec, normalize_name
 import csv
+import gc
+import math
+import os
+import sys
+import threading
+from operator import attrgetter
 from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+INVENTORY_HEADER = ["productID", "name", "author", "category", "quantity", "price", "total"]
+# productID, name, author, category, quantity, price
+PRODUCT_SNAPSHOT = SnapshotSchema(1, "qIIIqd", (1, 2, 3))
+# Claves de orden para listar por páginas (displayInventory / listProducts)
+PRODUCT_SORTS = {
+    "id": lambda p: p.productID,
+    "name": lambda p: p.name.casefold(),
+    "price": lambda p: p.price,
+    "quantity": lambda p: p.quantity,
+}
+
+
+# Filas de Inventario.csv; la columna total se recalcula, solo se comprueba su formato.
+# quantity y price sin límites: el CSV debe poder releer todo lo que la aplicación guarda
+PRODUCT_CSV_SPEC = RecordSpec(
+    Field("productID", "int", min_value=0),
+    Field("name", "text", max_len=10_000),
+    Field("author", "text", max_len=10_000),
+    Field("category", "text", max_len=10_000),
+    Field("quantity", "int"),
+    Field("price", "decimal"),
+    Field("total", "decimal", optional=True),
+)
+
+
+# Fila de Inventario.csv -> Product, validada y convertida en una sola llamada
+# (argumentos posicionales de Product: name, author, category, quantity, price, product_id)
+_parseProduct = PRODUCT_CSV_SPEC.csv_parser(Product, "name", "author", "category", "quantity", "price", "productID")
+
+
+def iter_products(path, report: LoadReport | None = None, header: bool = True,
+                  unique: bool = True) -> Iterator[Product]:
+    """
+    Genera los productos de path uno a uno sin cargar el archivo entero.
+    Las filas inválidas (o con productID repetido si unique) se anotan en report.
+    """
+    if report is None:
+        report = LoadReport(path)
+    # El ID repetido se comprueba sobre el producto ya convertido (sin un segundo int())
+    key = attrgetter("productID") if unique else None
+    return iter_csv(path, _parseProduct, report, columns=7, record_key=key, header=header)
 
 
 class Inventory:
-    def __init__(self):
+    def __init__(self, events: EventSink | None = None):
+        # Destino de los mensajes (consola por defecto; NullSink para uso headless)
+        self._events = events if events is not None else console
         self._products = []
+        # Índices en memoria: nombre sin mayúsculas -> Product e ID -> Product
+        self._by_name: dict[str, Product] = {}
+        self._by_id: dict[int, Product] = {}
+        # Nombres sin mayúsculas ni acentos: solo para rechazar nombres nuevos equivalentes
+        self._names = NameSet()
+        self._ids = IdAllocator()
+        self._search = SearchIndex()
+        self._stats = InventoryStats()
+        # Un orden mantenido por clave: una página no obliga a ordenar todo
+        self._orders = {sort: SortedIndex() for sort in PRODUCT_SORTS}
+        # _lock protege la tabla de locks por producto; cada compra bloquea solo su producto
+        self._lock = threading.Lock()
+        self._productLocks: dict[int, threading.RLock] = {}
+        self._journalLock = threading.RLock()
+        self._dirtyLock = threading.Lock()
+        # Diario de cambios por fila (desactivado hasta openJournal)
+        self._csvPath: Path | None = None
+        self._journalPath: Path | None = None
+        self._journalCount = 0
+        self._compactEvery = 0
+        # IDs de productos modificados desde el último guardado
+        self._dirty: set[int] = set()
+
+    @staticmethod
+    def _key(name: str) -> str:
+        # Búsqueda sin distinguir mayúsculas; los acentos sí cuentan, así dos productos
+        # ya guardados como "Canción" y "Cancion" siguen siendo accesibles
+        return name.casefold()
+
+    def _index(self, product: Product) -> None:
+        self._by_name[self._key(product.name)] = product
+        self._names.add(product.name)
+        self._by_id[product.productID] = product
+        self._ids.observe(product.productID)
+        self._search.add(product.productID, product.name, product.author, product.category)
+        self._stats.add(product)
+        self._sort(product)
+        product._listener = self._onProductChange
+
+    def _indexAll(self, products: list[Product]) -> None:
+        # Lo mismo que _index para muchos productos nuevos (cargas, altas en bloque):
+        # cada índice se rellena de una vez; la búsqueda y los nombres equivalentes
+        # se construyen en su primera consulta y los órdenes en su primera página
+        if not products:
+            return
+        listener = self._onProductChange
+        # Crear miles de objetos dispara el GC cíclico una y otra vez sin nada que liberar
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            key = self._key
+            for product in products:
+                product._listener = listener
+            self._by_name.update((key(p.name), p) for p in products)
+            self._by_id.update((p.productID, p) for p in products)
+            self._ids.observe(max(p.productID for p in products))
+            self._names.update([p.name for p in products], lazy=True)
+            self._search.extend([(p.productID, p.name, p.author, p.category) for p in products])
+            self._stats.extend(products)
+            # Copia: las claves se calculan en la primera página, sobre estos productos
+            # (map fija ya cada sort_key)
+            batch = list(products)
+            product_id = attrgetter("productID")
+            for sort, sort_key in PRODUCT_SORTS.items():
+                self._orders[sort].extend(zip(map(product_id, batch), map(sort_key, batch)))
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _sort(self, product: Product) -> None:
+        for sort, key in PRODUCT_SORTS.items():
+            self._orders[sort].add(product.productID, key(product))
+
+    def _onProductChange(self, product: Product) -> None:
+        with self._dirtyLock:
+            self._dirty.add(product.productID)
+        self._stats.update(product)
+        self._sort(product)
+
+    def _clear(self) -> None:
+        self._products.clear()
+        self._by_name.clear()
+        self._names = NameSet()
+        self._by_id.clear()
+        self._ids.reset()
+        self._search.clear()
+        self._stats.clear()
+        for order in self._orders.values():
+            order.clear()
+        with self._dirtyLock:
+            self._dirty.clear()
+
+    def loadProducts(self, products: Iterable[Product]) -> int:
+        """Reemplaza el inventario por products (p. ej. leídos de otro repositorio)."""
+        self._clear()
+        self._products.extend(products)
+        self._indexAll(self._products)
+        return len(self._products)
+
+    def takeDirty(self) -> list[Product]:
+        """Devuelve los productos modificados desde el último guardado y los marca limpios."""
+        with self._dirtyLock:
+            dirty, self._dirty = self._dirty, set()
+        return [self._by_id[pid] for pid in sorted(dirty) if pid in self._by_id]
+
+    def _restoreDirty(self, products: list[Product]) -> None:
+        # Un guardado que falla devuelve las marcas que había tomado
+        with self._dirtyLock:
+            self._dirty.update(p.productID for p in products)
 
     def productExists(self, name: str) -> bool:
-        return self.findProductByName(name) is not None
+        """True si ya hay un producto con un nombre equivalente (sin mayúsculas ni acentos)."""
+        return name in self._names
 
     def _next_id(self) -> int:
-        return max((p.productID for p in self._products), default=0) + 1
+        return self._ids.next()
 
 
     def addProduct(self, name: str, author: str, category: str, quantity: int, price: float) -> bool:
         if self.productExists(name):
-            print(color("Item already exists.", "red"))
+            existing = self.findEquivalentProduct(name)
+            if existing is not None and existing.name.casefold() != name.casefold():
+                self._events.emit(f"Item already exists as '{existing.name}'.", "red")
+            else:
+                self._events.emit("Item already exists.", "red")
             return False
         pid = self._next_id()
         product = Product(name, author, category, quantity, price, product_id=pid)
         self._products.append(product)
-        print(color(f"Product {product.name} added successfully.", "green"))
+        self._index(product)
+        with self._dirtyLock:
+            self._dirty.add(product.productID)
+        self._events.emit(f"Product {product.name} added successfully.", "green")
         return True
 
+    def addProducts(self, rows: Iterable) -> BulkResult:
+        """
+        Alta en bloque sin imprimir por fila. Cada fila es una secuencia
+        (name, author, category, quantity, price) o un dict con esas claves.
+        Valida todas las filas, descarta nombres ya existentes o repetidos en
+        el lote con una sola pasada sobre el índice, reserva los IDs de una vez
+        y devuelve el resultado de cada fila.
+        """
+        result = BulkResult()
+        checked: list[tuple | str] = []
+        batch_names = NameSet()
+        for _, fields, errors in PRODUCT_SPEC.batch(rows):
+            if errors:
+                checked.append("; ".join(errors))
+                continue
+            if self.productExists(fields[0]) or not batch_names.claim(fields[0]):
+                checked.append(f"duplicate name '{fields[0]}'")
+                continue
+            checked.append(fields)
+
+        next_id = self._ids.reserve(len(batch_names))
+        added: list[Product] = []
+        # Crear miles de objetos dispara el GC cíclico una y otra vez sin nada que liberar
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for index, fields in enumerate(checked):
+                if isinstance(fields, str):
+                    result.reject(index, fields)
+                    continue
+                added.append(Product(*fields, product_id=next_id))
+                result.accept(index, next_id)
+                next_id += 1
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._products.extend(added)
+        self._indexAll(added)
+        with self._dirtyLock:
+            self._dirty.update(p.productID for p in added)
+        return result
+
+    def productCount(self) -> int:
+        return len(self._products)
+
     def findProductByName(self, name: str) -> Product | None:
-        for product in self._products:
-            if product.name.lower() == name.lower():
-                return product
-        return None
+        return self._by_name.get(self._key(name))
+
+    def findEquivalentProduct(self, name: str) -> Product | None:
+        """
+        El producto que hace que productExists(name) sea True: el del mismo nombre
+        o, si no hay, uno que solo cambia en acentos ("Canción" para "Cancion").
+        """
+        product = self.findProductByName(name)
+        if product is None:
+            existing = self._names.find(name)
+            if existing is not None:
+                product = self.findProductByName(existing)
+        return product
+
+    def productIdOf(self, name: str) -> int | None:
+        """ID del producto name (o None); resolvedor para SaleService(productIdOf=...)."""
+        product = self.findProductByName(name)
+        return product.productID if product is not None else None
+
+    def categoryOf(self, product_id: int) -> str | None:
+        """Categoría del producto product_id (o None); resolvedor para SaleService(categoryOf=...)."""
+        product = self.findProductByID(product_id)
+        return product.category if product is not None else None
+
+    def findProductByID(self, product_id: int) -> Product | None:
+        return self._by_id.get(product_id)
 
-    def searchProduct(self, query: str) -> Product | None:
+    def searchProduct(self, query: str, limit: int | None = None) -> list[Product]:
+        query = query.strip()
         parcial = []
-        for product in self._products:
-            if query.lower() in product.name.lower()  or str(product.productID) == query or query.lower() in product.author.lower() or query.lower() in product.category.lower():
+        # isdecimal y no isdigit: "²" es un dígito pero int() no lo acepta
+        exact = self.findProductByID(int(query)) if query.isdecimal() else None
+        if exact is not None:
+            parcial.append(exact)
+        for pid in self._search.search(query, limit):
+            product = self._by_id[pid]
+            if product is not exact:
                 parcial.append(product)
+        if limit is not None:
+            parcial = parcial[:limit]
         if parcial:
-            print(color ("Search Results:", "blue"))
-            for product in parcial:
-                print(f"ID: {product.productID} | Name: {product.name} | Quantity: {product.quantity} | Price: {product.price} | Total: {product.total}")
-            return
-        print(color("Product not found.", "red"))
-        return None
+            if self._events.enabled:
+                self._events.emit("Search Results:", "blue")
+                for product in parcial:
+                    self._events.emit(f"ID: {product.productID} | Name: {product.name} | Quantity: {product.quantity} | Price: {product.price} | Total: {product.total}")
+            return parcial
+        self._events.emit("Product not found.", "red")
+        return parcial
 
 
 
-    def displayInventory(self):
-        if not self._products:
-            print(color("Inventory is empty.", "yellow"))
-        else:
-            count = len(self._products)
-            print(color("Current Inventory:", "blue"))
-            for product in self._products:
-                print(f"ID: {product.productID} | Name: {product.name} | Author: {product.author} | Category: {product.category} | Quantity: {product.quantity} | Price: {product.price} | Total: {product.total:.2f}")
-            print(color(f"Products in inventory: {count}", "magenta"))
+    def listProducts(self, sort: str = "id", offset: int = 0, limit: int = 20,
+                     reverse: bool = False, after: int | None = None) -> list[Product]:
+        """
+        Una página de productos ordenados por sort (id, name, price, quantity).
+        Por posición (offset) o por cursor: after es el ID del último producto
+        de la página anterior, y sigue siendo válido aunque se añadan productos.
+        """
+        order = self._orders.get(sort)
+        if order is None:
+            raise ValueError(f"Unknown sort key '{sort}'. Use one of: {', '.join(PRODUCT_SORTS)}")
+        ids = order.page(offset, limit, reverse) if after is None else order.after(after, limit, reverse)
+        return [self._by_id[pid] for pid in ids]
+
+    def displayInventory(self, page: int = 1, pageSize: int = 20, sort: str = "id",
+                         reverse: bool = False, out: TextIO | None = None) -> int:
+        """
+        Muestra la página page (desde 1) del inventario con un solo write y
+        devuelve el número total de páginas. Solo se formatean las filas de la página.
+        """
+        count = len(self._products)
+        if not count:
+            print(color("Inventory is empty.", "yellow"), file=out)
+            return 0
+        pages = math.ceil(count / pageSize)
+        page = min(max(page, 1), pages)
+        order = "desc" if reverse else "asc"
+        lines = [color(f"Current Inventory (page {page}/{pages}, by {sort} {order}):", "blue")]
+        for product in self.listProducts(sort, (page - 1) * pageSize, pageSize, reverse):
+            lines.append(f"ID: {product.productID} | Name: {product.name} | Author: {product.author} | Category: {product.category} | Quantity: {product.quantity} | Price: {product.price} | Total: {product.total:.2f}")
+        lines.append(color(f"Products in inventory: {count}", "magenta"))
+        (out or sys.stdout).write("\n".join(lines) + "\n")
+        return pages
 
     def updateProduct(self, name: str,
                       new_name: str | None = None,
@@ -65,10 +341,20 @@ class Inventory:
 
         product = self.findProductByName(name)
         if not product:
-            print(color("Product not found.", "red"))
+            self._events.emit("Product not found.", "red")
             return False
         if new_name is not None and new_name.strip() != "":
+            new_key = self._key(new_name)
+            other = self.findProductByName(new_name)
+            # Cambiar solo mayúsculas o acentos del propio nombre está permitido
+            equivalent = normalize_name(new_name) == normalize_name(product.name)
+            if (other is not None and other is not product) or (not equivalent and self.productExists(new_name)):
+                self._events.emit("Item already exists.", "red")
+                return False
+            del self._by_name[self._key(product.name)]
+            self._names.rename(product.name, new_name)
             product.name = new_name
+            self._by_name[new_key] = product
         if new_author is not None and new_author.strip() != "":
             product.author = new_author
         if new_category is not None and new_category.strip() != "":
@@ -77,10 +363,65 @@ class Inventory:
             product.quantity = quantity
         if price is not None:
             product.price = price
-        print(color(f"Product {product.name} updated successfully.", "green"))
+        self._search.add(product.productID, product.name, product.author, product.category)
+        self._events.emit(f"Product {product.name} updated successfully.", "green")
         return True
 
-    def saveCSV(self, filePath: str, append: bool = False) -> None:
+    def productLock(self, product: Product) -> threading.RLock:
+        """Lock (reentrante) propio de product; compras de productos distintos no se bloquean."""
+        lock = self._productLocks.get(product.productID)
+        if lock is None:
+            with self._lock:
+                lock = self._productLocks.setdefault(product.productID, threading.RLock())
+        return lock
+
+    def purchase(self, name: str, qty: int, defer: bool = False) -> bool:
+        """
+        Descuenta qty unidades de stock de forma atómica y persiste solo la fila
+        modificada en el diario (si está activo). Nunca relee el CSV.
+        Con defer=True la fila queda marcada (dirty) y la escribe el siguiente
+        saveCSV, de modo que varias compras se sincronizan a disco de una vez.
+        """
+        if qty <= 0:
+            self._events.emit("Quantity must be positive.", "red")
+            return False
+        product = self.findProductByName(name)
+        if not product:
+            self._events.emit("Product not found.", "red")
+            return False
+        with self.productLock(product):
+            if qty > product.quantity:
+                self._events.emit("Insufficient stock.", "red")
+                return False
+            product.quantity = product.quantity - qty
+            if not defer:
+                self._persist(product)
+        return True
+
+    def restock(self, name: str, qty: int, defer: bool = False) -> bool:
+        """Devuelve qty unidades al stock (p. ej. al deshacer una compra)."""
+        if qty <= 0:
+            self._events.emit("Quantity must be positive.", "red")
+            return False
+        product = self.findProductByName(name)
+        if not product:
+            self._events.emit("Product not found.", "red")
+            return False
+        with self.productLock(product):
+            product.quantity = product.quantity + qty
+            if not defer:
+                self._persist(product)
+        return True
+
+    def _persist(self, product: Product) -> None:
+        if self._journalPath is not None:
+            with self._journalLock:
+                self._appendJournal([product])
+                with self._dirtyLock:
+                    self._dirty.discard(product.productID)
+
+    @staticmethod
+    def _resolvePath(filePath: str) -> Path:
         path = Path(filePath)
         # Si se pasa solo un directorio (sin .csv) crear y usar nombre por defecto
         if path.suffix.lower() != ".csv":
@@ -88,15 +429,107 @@ class Inventory:
             path = path / "Inventario.csv"
         else:
             path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @staticmethod
+    def _row(p: Product) -> list:
+        return [p.productID, p.name, p.author, p.category, p.quantity, p.price, p.total]
+
+    def openJournal(self, filePath: str, compactEvery: int = 0) -> None:
+        """
+        Activa el diario de cambios: las filas modificadas (dirty) se añaden a
+        `<Inventario>.journal` y se aplican sobre el CSV al cargar. A partir de
+        aquí saveCSV sobre ese mismo archivo solo escribe los cambios.
+        Con `compactEvery` filas en el diario (0 = nunca) compactIfDue lo
+        compacta en el CSV; una compra nunca lo hace.
+        """
+        self._csvPath = self._resolvePath(filePath)
+        self._journalPath = self._csvPath.with_suffix(".journal")
+        self._compactEvery = compactEvery
+
+    def _appendJournal(self, products: list[Product]) -> None:
+        with self._journalLock:
+            with self._journalPath.open("a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                for product in products:
+                    writer.writerow(self._row(product))
+                f.flush()
+                os.fsync(f.fileno())
+            self._journalCount += len(products)
+
+    def compact(self) -> None:
+        """Reescribe el CSV completo y vacía el diario."""
+        if self._csvPath is None:
+            self._events.emit("Inventory journal is not enabled.", "yellow")
+            return
+        self.saveCSV(str(self._csvPath), compact=True)
+
+    def compactIfDue(self) -> bool:
+        """
+        Compacta si el diario ya tiene compactEvery filas. Pensado para el
+        guardado por lotes o de fondo (repositorio), fuera de las compras.
+        """
+        if not self._compactEvery or self._journalCount < self._compactEvery:
+            return False
+        self.compact()
+        return True
+
+    def _isJournalTarget(self, path: Path) -> bool:
+        return self._csvPath is not None and path.resolve() == self._csvPath.resolve()
+
+    def saveCSV(self, filePath: str, append: bool = False, compact: bool = False) -> None:
+        """
+        Guarda el inventario. Si el diario está activo y filePath es su CSV,
+        solo se añaden al diario los productos modificados; la reescritura
+        completa ocurre únicamente con compact=True (o en otros archivos).
+        """
+        path = self._resolvePath(filePath)
         new_file = not path.exists()
-        mode = "a" if append else "w"
-        with path.open(mode, newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            if new_file or not append:
-                writer.writerow(["productID", "name", "author", "category", "quantity", "price", "total"])
-            for p in self._products:
-                writer.writerow([p.productID, p.name, p.author, p.category, p.quantity, p.price, p.total])
-        print(color(f"Inventory saved to {str(path)}", "green"))
+        if not append and not compact and not new_file and self._isJournalTarget(path):
+            with self._journalLock:
+                changed = self.takeDirty()
+                if changed:
+                    try:
+                        self._appendJournal(changed)
+                    except Exception:
+                        self._restoreDirty(changed)
+                        raise
+            self._events.emit(f"Inventory changes saved to {str(self._journalPath)} ({len(changed)} rows)", "green")
+            return
+        if append:
+            with path.open("a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(INVENTORY_HEADER)
+                for p in self._products:
+                    writer.writerow(self._row(p))
+        else:
+            # Escribir en un temporal y reemplazar para no dejar el CSV a medias.
+            # Con el diario bloqueado ninguna compra escribe en él mientras tanto
+            with self._journalLock:
+                # Las marcas se toman antes de recorrer los productos: una compra
+                # (defer=True) durante la escritura vuelve a marcar su fila y la
+                # escribe el siguiente guardado
+                changed = self.takeDirty() if self._csvPath is None or self._isJournalTarget(path) else []
+                try:
+                    tmp = path.with_suffix(".tmp")
+                    with tmp.open("w", newline="", encoding="utf-8") as f:
+                        writer = csv.writer(f)
+                        writer.writerow(INVENTORY_HEADER)
+                        for p in self._products:
+                            writer.writerow(self._row(p))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, path)
+                except Exception:
+                    self._restoreDirty(changed)
+                    raise
+                self._refreshSnapshot(str(path))
+                if self._isJournalTarget(path):
+                    # El CSV ya refleja todos los cambios del diario
+                    self._journalPath.unlink(missing_ok=True)
+                    self._journalCount = 0
+        self._events.emit(f"Inventory saved to {str(path)}", "green")
 
 
     def displayStatistics(self) -> None:
@@ -104,13 +537,13 @@ class Inventory:
             print(color("Inventory is empty. No statistics to show.", "yellow"))
             return
 
-        num_products = len(self._products)
-        total_value = sum(p.total for p in self._products)
+        num_products = len(self._stats)
+        total_value = self._stats.totalValue
 
-        most_expensive = max(self._products, key=lambda p: p.price)
-        least_expensive = min(self._products, key=lambda p: p.price)
-        most_stock = max(self._products, key=lambda p: p.quantity)
-        least_stock = min(self._products, key=lambda p: p.quantity)
+        most_expensive = self._stats.mostExpensive()
+        least_expensive = self._stats.leastExpensive()
+        most_stock = self._stats.mostStock()
+        least_stock = self._stats.leastStock()
 
         print(color("--- Inventory Statistics ---", "blue"))
         print(f"Total number of unique products: {color(str(num_products), 'magenta')}")
@@ -127,58 +560,115 @@ class Inventory:
         print(f"  - {least_stock.name} ({color(f'{least_stock.quantity} units', 'cyan')})")
         print(color("----------------------------", "blue"))
 
-    def loadCSV(self, filePath: str) -> None:
+    def saveSnapshot(self, filePath: str) -> None:
+        """Escribe el snapshot binario (`.snap`) junto al CSV filePath."""
+        write_snapshot(snapshot_path(filePath), PRODUCT_SNAPSHOT,
+                       ((p.productID, p.name, p.author, p.category, p.quantity, p.price)
+                        for p in self._products))
+
+    def _refreshSnapshot(self, filePath: str) -> None:
+        # El snapshot es solo una caché del CSV: si no se puede escribir se avisa y se sigue
+        try:
+            self.saveSnapshot(filePath)
+        except Exception as e:
+            self._events.emit(f"Warning: could not write snapshot for '{filePath}': {e}", "yellow")
+
+    def _loadSnapshot(self, path: Path, report: LoadReport) -> bool:
+        # Solo llena _products y _by_id; loadCSV indexa el resto tras el diario
+        snap = snapshot_path(path)
+        records = read_snapshot(snap, PRODUCT_SNAPSHOT) if is_fresh(snap, path) else None
+        if records is None:
+            return False
+        self._clear()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._products.extend(Product(name, author, category, quantity, price, product_id=product_id)
+                                  for product_id, name, author, category, quantity, price in records)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._by_id.update((p.productID, p) for p in self._products)
+        report.loaded += len(self._products)
+        return True
+
+    def _replayJournal(self, journal: Path, indexed: bool = True) -> int:
+        # Cada fila es el estado completo de un producto; la última gana.
+        # Una última fila cortada por una caída queda en el reporte y se ignora.
+        # Con indexed=False (durante la carga) solo existen _products y _by_id
+        replay = LoadReport(journal)
+        for row in iter_products(journal, replay, header=False, unique=False):
+            product = self.findProductByID(row.productID)
+            if product is None:
+                product = row
+                self._products.append(product)
+                self._by_id[product.productID] = product
+            else:
+                if indexed:
+                    self._by_name.pop(self._key(product.name), None)
+                    self._names.discard(product.name)  # _index lo vuelve a añadir
+                product.name = row.name
+                product.author = row.author
+                product.category = row.category
+                product.quantity = row.quantity
+                product.price = row.price
+            if indexed:
+                self._index(product)
+        return replay.loaded
+
+    def loadCSV(self, filePath: str, useSnapshot: bool = True) -> LoadReport | None:
+        """
+        Carga el inventario y aplica el diario. Si hay un snapshot `.snap` al
+        día se lee ese en lugar del CSV; si no, se parsea el CSV y se regenera.
+        """
         path = Path(filePath)
         if not path.is_file():
-            print(color(f"No inventory file found at '{filePath}'. Starting fresh.", "yellow"))
-            return
+            self._events.emit(f"No inventory file found at '{filePath}'. Starting fresh.", "yellow")
+            return None
 
-        loaded_ids = set()  # Conjunto para rastrear IDs ya cargados
+        report = LoadReport(filePath)
         try:
-            with path.open(mode='r', newline='', encoding='utf-8') as file:
-                reader = csv.reader(file)
+            fromCSV = not (useSnapshot and self._loadSnapshot(path, report))
+            if fromCSV:
+                products = iter_products(path, report)
+                first = next(products, None)  # Lee la cabecera antes de limpiar
+                if report.empty:
+                    self._events.emit(f"Inventory file '{filePath}' is empty.", "yellow")
+                    return report
+
+                self._clear()  # Limpiar el inventario actual antes de cargar
+                gc_enabled = gc.isenabled()
+                gc.disable()
                 try:
-                    header = next(reader)  # Omitir la cabecera
-                except StopIteration:
-                    print(color(f"Inventory file '{filePath}' is empty.", "yellow"))
-                    return
-
-                self._products.clear()  # Limpiar el inventario actual antes de cargar
-                for i, row in enumerate(reader, start=2):  # Empezar a contar desde la línea 2
-                    if not row:
-                        continue  # Ignorar filas completamente vacías
-
-                    if len(row) != 7:
-                        print(
-                            color(f"Warning: Skipping malformed row {i} (wrong number of columns) in '{filePath}'.",
-                                  "yellow"))
-                        continue
+                    if first is not None:
+                        self._products.append(first)
+                    self._products.extend(products)
+                finally:
+                    if gc_enabled:
+                        gc.enable()
+                self._by_id.update((p.productID, p) for p in self._products)
 
-                    try:
-                        product_id = int(row[0])
-                        if product_id in loaded_ids:
-                            print(color(f"Warning: Duplicate product ID '{product_id}' found in row {i}. Skipping.",
-                                        "yellow"))
-                            continue
-                        product = Product(
-                            product_id=product_id,
-                            name=str(row[1]),
-                            author=str(row[2]),
-                            category=str(row[3]),
-                            quantity=int(row[4]),
-                            price=float(row[5])
-                        )
-                        self._products.append(product)
-                        loaded_ids.add(product_id)  # Añadir el ID al conjunto de IDs cargados
-
-                    except (ValueError, IndexError) as conversion_error:
-                        print(color(f"Warning: Could not parse row {i} in '{filePath}': {conversion_error}",
-                                    "yellow"))
-
-            if not self._products and not loaded_ids:
-                print(color(f"Inventory file '{filePath}' has no valid products to load.", "yellow"))
+            # El diario se aplica antes de indexar: cada índice se construye una sola vez
+            journal = path.with_suffix(".journal")
+            if journal.is_file():
+                applied = self._replayJournal(journal, indexed=False)
+                self._journalCount = applied
+                if applied:
+                    self._events.emit(f"Applied {applied} changes from journal '{journal}'.", "cyan")
+            self._indexAll(self._products)
+            with self._dirtyLock:
+                self._dirty.clear()
+            if fromCSV and useSnapshot:
+                # Con el diario ya aplicado (reaplicarlo sobre el snapshot no cambia nada)
+                self._refreshSnapshot(filePath)
+            if report.skipped:
+                self._events.emit(f"Warning: {report.summary()}.", "yellow")
+
+            if not self._products:
+                self._events.emit(f"Inventory file '{filePath}' has no valid products to load.", "yellow")
             else:
-                print(color(f"Inventory loaded successfully from '{filePath}'.", "green"))
+                self._events.emit(f"Inventory loaded successfully from '{filePath}'.", "green")
 
         except Exception as e:
-            print(color(f"Error loading inventory from '{filePath}': {e}", "red"))
\ No newline at end of file
+            self._events.emit(f"Error loading inventory from '{filePath}': {e}", "red")
+        return report
@@ -0,0 +1,138 @@
+from Models.Product import Product
+import heapq
+import math
+import threading
+from typing import Iterable
+
+
+class InventoryStats:
+    """
+    Agregados del inventario mantenidos de forma incremental.
+    - valor total y número de productos en O(1)
+    - max/min de precio y de stock con heaps de borrado perezoso en O(log N)
+    Las entradas obsoletas se descartan al consultar y los heaps se
+    reconstruyen cuando crecen demasiado; las altas masivas (extend) se
+    registran en la primera consulta. Es seguro usarla desde varios hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._products: dict[int, Product] = {}
+        self._values: dict[int, tuple[float, int]] = {}  # id -> (price, quantity)
+        self._total = 0.0
+        self._maxPrice: list[tuple[float, int]] = []
+        self._minPrice: list[tuple[float, int]] = []
+        self._maxStock: list[tuple[int, int]] = []
+        self._minStock: list[tuple[int, int]] = []
+        # Listas de productos de extend aún sin registrar
+        self._pending: list[list[Product]] = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._resolve()
+            return len(self._values)
+
+    @property
+    def totalValue(self) -> float:
+        with self._lock:
+            self._resolve()
+            return self._total
+
+    def _resolve(self) -> None:
+        # Con el lock tomado: registra los extend pendientes con sus valores actuales
+        if not self._pending:
+            return
+        for products in self._pending:
+            for product in products:
+                pid = product.productID
+                self._products[pid] = product
+                self._values[pid] = (product.price, product.quantity)
+        self._pending.clear()
+        self._rebuild()
+
+    def _push(self, pid: int, price: float, quantity: int) -> None:
+        heapq.heappush(self._maxPrice, (-price, pid))
+        heapq.heappush(self._minPrice, (price, pid))
+        heapq.heappush(self._maxStock, (-quantity, pid))
+        heapq.heappush(self._minStock, (quantity, pid))
+        if len(self._maxPrice) > 2 * len(self._values) + 16:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        items = self._values.items()
+        self._maxPrice = [(-p, pid) for pid, (p, q) in items]
+        self._minPrice = [(p, pid) for pid, (p, q) in items]
+        self._maxStock = [(-q, pid) for pid, (p, q) in items]
+        self._minStock = [(q, pid) for pid, (p, q) in items]
+        for heap in (self._maxPrice, self._minPrice, self._maxStock, self._minStock):
+            heapq.heapify(heap)
+        # Corrige la deriva acumulada de las sumas en coma flotante
+        self._total = math.fsum(p * q for p, q in self._values.values())
+
+    def update(self, product: Product) -> None:
+        """Registra un producto nuevo o los valores actuales de uno existente."""
+        pid = product.productID
+        with self._lock:
+            self._resolve()
+            price, quantity = product.price, product.quantity
+            old = self._values.get(pid)
+            if old == (price, quantity):
+                return
+            if old is not None:
+                self._total -= old[0] * old[1]
+            self._products[pid] = product
+            self._values[pid] = (price, quantity)
+            self._total += price * quantity
+            self._push(pid, price, quantity)
+
+    add = update
+
+    def extend(self, products: Iterable[Product]) -> None:
+        """
+        Registra muchos productos (p. ej. al cargar) en la primera consulta,
+        con una sola reconstrucción de los heaps.
+        """
+        with self._lock:
+            self._pending.append(list(products))
+
+    def remove(self, product_id: int) -> None:
+        with self._lock:
+            self._resolve()
+            old = self._values.pop(product_id, None)
+            if old is not None:
+                self._total -= old[0] * old[1]
+                del self._products[product_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._products.clear()
+            self._values.clear()
+            self._total = 0.0
+            for heap in (self._maxPrice, self._minPrice, self._maxStock, self._minStock):
+                heap.clear()
+
+    def _peek(self, name: str, field: int, sign: int) -> Product | None:
+        with self._lock:
+            self._resolve()
+            # Se busca el heap por nombre porque _rebuild puede reemplazarlo
+            heap = getattr(self, name)
+            while heap:
+                key, pid = heap[0]
+                current = self._values.get(pid)
+                if current is not None and current[field] * sign == key:
+                    return self._products[pid]
+                heapq.heappop(heap)
+            return None
+
+    def mostExpensive(self) -> Product | None:
+        return self._peek("_maxPrice", 0, -1)
+
+    def leastExpensive(self) -> Product | None:
+        return self._peek("_minPrice", 0, 1)
+
+    def mostStock(self) -> Product | None:
+        return self._peek("_maxStock", 1, -1)
+
+    def leastStock(self) -> Product | None:
+        return self._peek("_minStock", 1, 1)
@@ -0,0 +1,184 @@
+from Models.Product import Product
+from Services.Inventory import PRODUCT_CSV_SPEC, Inventory, _parseProduct
+from Utils.CsvStream import LoadReport
+from Utils.Events import EventSink
+from Utils.SearchIndex import fold
+import csv
+import mmap
+from pathlib import Path
+
+
+class LazyInventory(Inventory):
+    """
+    Inventario para catálogos grandes: mapea Inventario.csv con mmap y al
+    cargar solo guarda la posición (offset) de cada fila por ID y por nombre.
+    Los Product se crean al accederlos (findProductByName / findProductByID /
+    searchProduct), así la memoria crece con lo que se usa y no con el catálogo.
+    Las operaciones que recorren todo (listado, estadísticas, guardado
+    completo) materializan el resto antes de delegar en Inventory.
+    """
+
+    def __init__(self, events: EventSink | None = None):
+        super().__init__(events)
+        self._mm: mmap.mmap | None = None
+        self._rowsByID: dict[int, int] = {}
+        self._rowsByName: dict[str, int] = {}
+
+    def _closeMap(self) -> None:
+        self._rowsByID.clear()
+        self._rowsByName.clear()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _readRow(self, offset: int) -> list[str]:
+        end = self._mm.find(b"\n", offset)
+        if end == -1:
+            end = len(self._mm)
+        return next(csv.reader([self._mm[offset:end].decode("utf-8").rstrip("\r")]))
+
+    def _materialize(self, offset: int) -> Product:
+        product = _parseProduct(self._readRow(offset))
+        del self._rowsByID[product.productID]
+        self._rowsByName.pop(self._key(product.name), None)
+        self._names.discard(product.name)  # contado al indexar la fila; _index lo vuelve a añadir
+        self._products.append(product)
+        self._index(product)
+        return product
+
+    def _materializeAll(self) -> None:
+        for offset in sorted(self._rowsByID.values()):
+            self._materialize(offset)
+
+    def pendingCount(self) -> int:
+        """Número de filas del archivo que aún no se han materializado."""
+        return len(self._rowsByID)
+
+    def productCount(self) -> int:
+        return super().productCount() + self.pendingCount()
+
+    def findProductByName(self, name: str) -> Product | None:
+        product = super().findProductByName(name)
+        if product is None:
+            offset = self._rowsByName.get(self._key(name))
+            if offset is not None:
+                product = self._materialize(offset)
+        return product
+
+    def findProductByID(self, product_id: int) -> Product | None:
+        product = super().findProductByID(product_id)
+        if product is None:
+            offset = self._rowsByID.get(product_id)
+            if offset is not None:
+                product = self._materialize(offset)
+        return product
+
+    def searchProduct(self, query: str, limit: int | None = None) -> list[Product]:
+        # Recorre solo las filas pendientes y materializa las que coinciden;
+        # después el índice de búsqueda de Inventory ya las contiene todas
+        q = fold(query.strip())
+        if q:
+            for offset in list(self._rowsByID.values()):
+                row = self._readRow(offset)
+                if any(q in fold(field) for field in row[1:4]):
+                    self._materialize(offset)
+        return super().searchProduct(query, limit)
+
+    def listProducts(self, sort: str = "id", offset: int = 0, limit: int = 20,
+                     reverse: bool = False, after: int | None = None) -> list[Product]:
+        # El orden necesita las claves de todas las filas
+        self._materializeAll()
+        return super().listProducts(sort, offset, limit, reverse, after)
+
+    def displayInventory(self, page: int = 1, pageSize: int = 20, sort: str = "id",
+                         reverse: bool = False, out=None) -> int:
+        self._materializeAll()
+        return super().displayInventory(page, pageSize, sort, reverse, out)
+
+    def displayStatistics(self) -> None:
+        self._materializeAll()
+        super().displayStatistics()
+
+    def saveSnapshot(self, filePath: str) -> None:
+        self._materializeAll()
+        super().saveSnapshot(filePath)
+
+    def saveCSV(self, filePath: str, append: bool = False, compact: bool = False) -> None:
+        path = self._resolvePath(filePath)
+        if append or compact or not path.exists() or not self._isJournalTarget(path):
+            # Guardado completo: hace falta todo en memoria y soltar el mmap
+            # antes de reemplazar el archivo
+            self._materializeAll()
+            self._closeMap()
+        super().saveCSV(filePath, append=append, compact=compact)
+
+    def loadCSV(self, filePath: str, useSnapshot: bool = False) -> LoadReport | None:
+        """
+        Indexa las filas de filePath sin crear los productos y aplica el diario.
+        useSnapshot se ignora: este backend siempre trabaja sobre el CSV.
+        """
+        path = Path(filePath)
+        if not path.is_file():
+            self._events.emit(f"No inventory file found at '{filePath}'. Starting fresh.", "yellow")
+            return None
+
+        report = LoadReport(filePath)
+        try:
+            with path.open("rb") as f:
+                if path.stat().st_size == 0:
+                    report.empty = True
+                    self._events.emit(f"Inventory file '{filePath}' is empty.", "yellow")
+                    return report
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            self._clear()
+            self._closeMap()
+            self._mm = mm
+            size = len(mm)
+            pos = mm.find(b"\n") + 1 or size  # Omitir la cabecera
+            row_no = 2
+            while pos < size:
+                end = mm.find(b"\n", pos)
+                if end == -1:
+                    end = size
+                line = mm[pos:end].decode("utf-8").strip()
+                if line:
+                    row = next(csv.reader([line]))
+                    if len(row) != 7:
+                        report.error(row_no, "wrong number of columns")
+                    else:
+                        # Solo se valida; el Product se crea al acceder
+                        try:
+                            values = PRODUCT_CSV_SPEC.parse_csv(row)
+                        except ValueError as e:
+                            report.error(row_no, f"could not parse row: {e}")
+                            values = None
+                        if values is not None and values[0] in self._rowsByID:
+                            report.error(row_no, f"duplicate ID '{values[0]}'", duplicate=True)
+                        elif values is not None:
+                            self._rowsByID[values[0]] = pos
+                            self._rowsByName.setdefault(self._key(values[1]), pos)
+                            self._names.add(values[1])
+                            self._ids.observe(values[0])
+                            report.loaded += 1
+                pos = end + 1
+                row_no += 1
+
+            journal = path.with_suffix(".journal")
+            if journal.is_file():
+                applied = self._replayJournal(journal)
+                self._journalCount = applied
+                if applied:
+                    self._events.emit(f"Applied {applied} changes from journal '{journal}'.", "cyan")
+            with self._dirtyLock:
+                self._dirty.clear()
+            if report.skipped:
+                self._events.emit(f"Warning: {report.summary()}.", "yellow")
+
+            if not self._rowsByID and not self._products:
+                self._events.emit(f"Inventory file '{filePath}' has no valid products to load.", "yellow")
+            else:
+                self._events.emit(f"Inventory indexed from '{filePath}' ({report.loaded} rows).", "green")
+        except Exception as e:
+            self._events.emit(f"Error loading inventory from '{filePath}': {e}", "red")
+        return report
@@ -0,0 +1,106 @@
+from Models.Sale import Sale
+from Models.User import User
+from Services.Checkout import CheckoutService
+from Services.Inventory import Inventory
+from Services.SaleService import SaleService
+from Services.UserService import UserService
+from pathlib import Path
+
+
+class Repository:
+    """
+    Interfaz de almacenamiento detrás de Inventory, SaleService y UserService.
+    El menú (y cualquier otro front end) carga, guarda y compra a través de
+    ella, de modo que los CSV o SQLite son intercambiables.
+    """
+
+    # True si purchase(defer=True) no toca disco y la escritura queda para flush
+    deferredWrites = False
+
+    def loadInventory(self, inventory: Inventory) -> None:
+        raise NotImplementedError
+
+    def saveInventory(self, inventory: Inventory) -> None:
+        raise NotImplementedError
+
+    def loadSales(self, sales: SaleService) -> None:
+        raise NotImplementedError
+
+    def saveSales(self, sales: SaleService) -> None:
+        raise NotImplementedError
+
+    def loadUsers(self, users: UserService) -> None:
+        raise NotImplementedError
+
+    def saveUsers(self, users: UserService) -> None:
+        raise NotImplementedError
+
+    def purchase(self, inventory: Inventory, sales: SaleService, user: User,
+                 name: str, qty: int, defer: bool = False) -> Sale | None:
+        """
+        Descuenta stock y registra la venta como una sola operación.
+        Con defer=True la implementación puede aplazar la escritura hasta flush.
+        """
+        raise NotImplementedError
+
+    def flush(self, inventory: Inventory, sales: SaleService) -> None:
+        """Persiste los cambios pendientes (p. ej. compras hechas con defer=True)."""
+        self.saveInventory(inventory)
+        self.saveSales(sales)
+
+    def salesStatistics(self, sales: SaleService, top: int = 3) -> dict:
+        """Mismo formato que SaleService.statistics."""
+        return sales.statistics(top=top)
+
+    def close(self) -> None:
+        pass
+
+
+class CsvRepository(Repository):
+    """Implementación sobre los CSV de Archivos/ (con sus diarios y snapshots)."""
+
+    deferredWrites = True
+
+    def __init__(self, directory: str = "../Archivos", compactEvery: int = 1000):
+        base = Path(directory)
+        # Filas de diario tras las que se compacta, siempre desde load/save/flush
+        self.compactEvery = compactEvery
+        self.inventoryPath = str(base / "Inventario.csv")
+        self.salesPath = str(base / "Sales.csv")
+        self.usersPath = str(base / "Users.csv")
+
+    def loadInventory(self, inventory: Inventory) -> None:
+        inventory.loadCSV(self.inventoryPath)
+        inventory.openJournal(self.inventoryPath, compactEvery=self.compactEvery)
+        inventory.compactIfDue()
+
+    def saveInventory(self, inventory: Inventory) -> None:
+        inventory.saveCSV(self.inventoryPath)
+        inventory.compactIfDue()
+
+    def loadSales(self, sales: SaleService) -> None:
+        sales.loadCSV(self.salesPath)
+        sales.openJournal(self.salesPath, compactEvery=self.compactEvery)
+        sales.compactIfDue()
+
+    def saveSales(self, sales: SaleService) -> None:
+        sales.flushJournal()
+        sales.compactIfDue()
+
+    def loadUsers(self, users: UserService) -> None:
+        users.loadCSV(self.usersPath)
+
+    def saveUsers(self, users: UserService) -> None:
+        users.saveCSV(self.usersPath)
+
+    def purchase(self, inventory: Inventory, sales: SaleService, user: User,
+                 name: str, qty: int, defer: bool = False) -> Sale | None:
+        return CheckoutService(inventory, sales).checkout(user, name, qty, defer=defer)
+
+    def flush(self, inventory: Inventory, sales: SaleService) -> None:
+        # Solo los diarios: las filas modificadas y las ventas aplazadas, un fsync cada uno.
+        # La compactación, si toca, ocurre aquí y no dentro de una compra
+        inventory.saveCSV(self.inventoryPath)
+        inventory.compactIfDue()
+        sales.flushJournal()
+        sales.compactIfDue()
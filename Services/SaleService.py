@@ -1,42 +1,352 @@
 # python
+from Models.Product import Product
 from Models.Sale import Sale
+from Services.SalesAnalytics import SalesAnalytics
+from Services.SaleStore import SaleStore
+from Utils.BulkResult import BulkResult
 from Utils.Decorator import *
+from Utils.Events import EventSink, console
+from Utils.IdAllocator import IdAllocator
+from Utils.CsvStream import LoadReport, iter_csv
+from Utils.Snapshot import SnapshotSchema, is_fresh, read_snapshot, snapshot_path, write_snapshot
+from Utils.Validator import INT64_MAX, INT64_MIN, SALE_SPEC, Field, RecordSpec
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from operator import attrgetter, itemgetter
 import csv
+import io
+import itertools
+import math
+import os
+import sys
+import threading
+import time
 from pathlib import Path
-from collections import Counter
+from typing import Callable, Iterable, Iterator, TextIO
+
+SALES_HEADER = ["saleID", "username", "product", "quantity", "price", "role", "total", "timestamp", "productID"]
+# saleID, username, product, quantity, price, role, timestamp, productID
+# (versión 2: se añadió timestamp; versión 3: productID; versión 4: role de 64 bits)
+SALE_SNAPSHOT = SnapshotSchema(2, "qIIqdqdq", (1, 2), version=4)
+
+
+def format_timestamp(timestamp: float | None) -> str:
+    """Fecha ISO 8601 en UTC para Sales.csv ("" si la venta no tiene fecha)."""
+    if not timestamp:
+        return ""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+
+# Filas de Sales.csv (total, timestamp y productID son opcionales: los archivos antiguos no los tienen).
+# Los enteros se limitan a lo que cabe en las columnas int64 de SaleStore
+SALE_CSV_SPEC = RecordSpec(
+    Field("saleID", "int", min_value=0, max_value=INT64_MAX),
+    Field("username", "text", max_len=10_000),
+    Field("product", "text", max_len=10_000),
+    Field("quantity", "int", min_value=INT64_MIN, max_value=INT64_MAX),
+    Field("price", "decimal"),
+    Field("role", "int", min_value=INT64_MIN, max_value=INT64_MAX),
+    Field("total", "decimal", optional=True),
+    Field("timestamp", "timestamp", optional=True),
+    Field("productID", "int", min_value=0, max_value=INT64_MAX, optional=True),
+)
+
+
+# (argumentos posicionales de Sale: username, product, quantity, price, role, sale_id, timestamp, product_id)
+_buildSale = SALE_CSV_SPEC.csv_parser(Sale, "username", "product", "quantity", "price", "role",
+                                      "saleID", "timestamp", "productID")
+
+
+def _parseSale(row: list[str]) -> Sale:
+    # Las columnas de más al final se ignoran
+    return _buildSale(row if len(row) <= 9 else row[:9])
+
+
+# Fila de Sales.csv -> tupla de SaleStore.extend, sin crear el Sale
+# (todas las columnas de SALE_CSV_SPEC menos total, que se recalcula)
+_saleRow = itemgetter(0, 1, 2, 3, 4, 5, 7, 8)
+_parseSaleCsv = SALE_CSV_SPEC.parse_csv
+# Filas por llamada a SaleStore.extend al cargar
+_LOAD_CHUNK = 10_000
+
+
+def _parseSaleRow(row: list[str]) -> tuple:
+    return _saleRow(_parseSaleCsv(row if len(row) <= 9 else row[:9]))
+
+
+def iter_sales(path, report: LoadReport | None = None, seen: set | None = None,
+               header: bool = True, unique: bool = True) -> Iterator[Sale]:
+    """
+    Genera las ventas de path una a una sin cargar el archivo entero.
+    Las filas inválidas (o con saleID repetido si unique) se anotan en report.
+    Con unique=False no se guarda ningún ID, así que la memoria no crece con
+    el archivo (para recorridos que no necesitan descartar repetidos).
+    """
+    if report is None:
+        report = LoadReport(path)
+    key = attrgetter("saleID") if unique else None
+    return iter_csv(path, _parseSale, report, min_columns=6, record_key=key,
+                    seen=seen, header=header)
+
+
+def _splitRanges(path: Path, parts: int) -> list[tuple[int, int]]:
+    """Divide el archivo (sin cabecera) en rangos de bytes alineados a inicio de línea."""
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        f.readline()
+        bounds = [f.tell()]
+        for k in range(1, parts):
+            f.seek(bounds[0] + (size - bounds[0]) * k // parts)
+            f.readline()
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def _parseChunk(path: str, start: int, end: int) -> tuple:
+    """
+    Tarea del pool: parsea las filas de [start, end) a columnas.
+    Devuelve (filas, ids, usernames, products, quantities, prices, roles, timestamps,
+    productIDs, errores, líneas).
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    rows, ids, quantities, prices, roles = array('q'), array('q'), array('q'), array('d'), array('q')
+    timestamps, product_ids = array('d'), array('q')
+    usernames, products = [], []
+    errors = []
+    # Las mismas reglas que el cargador secuencial (SALE_CSV_SPEC vía _buildSale)
+    parse = SALE_CSV_SPEC.parse_csv
+    for i, row in enumerate(csv.reader(io.StringIO(text, newline=""))):
+        if not row:
+            continue
+        if len(row) < 6:
+            errors.append((i, "too few columns"))
+            continue
+        try:
+            sale_id, username, product, quantity, price, role, _, timestamp, product_id = \
+                parse(row if len(row) <= 9 else row[:9])
+        except ValueError as conversion_error:
+            errors.append((i, f"could not parse row: {conversion_error}"))
+            continue
+        ids.append(sale_id)
+        quantities.append(quantity)
+        prices.append(price)
+        roles.append(role)
+        timestamps.append(timestamp or 0.0)
+        product_ids.append(product_id if product_id is not None else -1)
+        rows.append(i)
+        usernames.append(username)
+        products.append(product)
+    return (rows, ids, usernames, products, quantities, prices, roles, timestamps, product_ids,
+            errors, text.count("\n"))
+
 
 class SaleService:
-    def __init__(self):
-        self._sales: list[Sale] = []
+    def __init__(self, events: EventSink | None = None,
+                 categoryOf: Callable[[int], str | None] | None = None,
+                 productIdOf: Callable[[str], int | None] | None = None):
+        self._events = events if events is not None else console
+        # ID de producto -> categoría, para los acumulados por categoría (p. ej. Inventory.categoryOf)
+        self._categoryOf = categoryOf
+        # Nombre de producto -> ID (p. ej. Inventory.productIdOf), solo para ventas que llegan sin ID
+        self._sales = SaleStore(productIdOf)
+        self._ids = IdAllocator()
+        # Diario append-only (desactivado hasta openJournal)
+        self._csvPath: Path | None = None
+        self._journalPath: Path | None = None
+        self._journalCount = 0
+        self._compactEvery = 0
+        # Ventas aceptadas con defer=True que aún no están en el diario
+        self._pending: list[Sale] = []
+        self._pendingLock = threading.Lock()
+        # Serializa escrituras al diario y compactaciones entre hilos
+        self._journalLock = threading.RLock()
 
     def _next_id(self) -> int:
-        return max((s.saleID for s in self._sales), default=0) + 1
+        return self._ids.next()
+
+    def loadSales(self, rows: Iterable[tuple]) -> int:
+        """
+        Reemplaza las ventas por rows (saleID, username, product, quantity, price, role,
+        timestamp, productID), p. ej. leídas de otro repositorio.
+        """
+        self._sales.clear()
+        self._ids.reset()
+        self._sales.extend(rows)
+        ids = self._sales.saleIDs()
+        if ids:
+            self._ids.observe(max(ids))
+        return len(self._sales)
 
-    def addSale(self, username: str, product: str, quantity: int, price: float, role: int) -> Sale:
-        sale = Sale(username=username, product=product, quantity=int(quantity), price=float(price), role=int(role), sale_id=self._next_id())
-        self._sales.append(sale)
-        print(color(f"Sale #{sale.saleID} registered for {username}: {quantity} x {product} (${price:.2f} c/u) -> Total ${sale.total:.2f}", "green"))
+    def addSale(self, username: str, product: str, quantity: int, price: float, role: int,
+                sale_id: int | None = None, defer: bool = False, timestamp: float | None = None,
+                product_id: int | None = None) -> Sale:
+        """
+        Registra una venta; sale_id permite usar un ID ya asignado por el almacenamiento
+        y timestamp (segundos epoch, por defecto ahora) la fecha con la que se guardó.
+        product_id enlaza la venta con el producto del inventario (si falta se busca por nombre).
+        Con defer=True la venta no se escribe en el diario hasta flushJournal.
+        """
+        if sale_id is None:
+            sale_id = self._next_id()
+        else:
+            self._ids.observe(sale_id)
+        if timestamp is None:
+            timestamp = time.time()
+        sale = Sale(username=username, product=product, quantity=int(quantity), price=float(price), role=int(role),
+                    sale_id=sale_id, timestamp=timestamp, product_id=product_id)
+        if self._journalPath is None:
+            self._sales.append(sale)
+        elif defer:
+            # Bajo el mismo lock que toma saveCSV: toda venta pendiente está en las
+            # filas que esa reescritura alcanza a ver, o llega después de ella
+            with self._pendingLock:
+                self._sales.append(sale)
+                self._pending.append(sale)
+        else:
+            self._sales.append(sale)
+            self._appendJournal([sale])
+        if self._events.enabled:
+            self._events.emit(f"Sale #{sale.saleID} registered for {username}: {quantity} x {product} (${price:.2f} c/u) -> Total ${sale.total:.2f}", "green")
         return sale
 
-    def displaySales(self):
-        if not self._sales:
-            print(color("There are no sales yet.", "yellow"))
-            return
-        print(color("Current Sales:", "blue"))
-        for s in self._sales:
-            print(f"ID: {s.saleID} | User: {s.username} | Product: {s.product} | Qty: {s.quantity} | Price: {s.price} | Total: {s.total}")
-        print(color(f"Total sales count: {len(self._sales)}", "magenta"))
+    def addSales(self, rows: Iterable) -> BulkResult:
+        """
+        Alta en bloque sin imprimir por fila. Cada fila es una secuencia
+        (username, product, quantity, price, role[, saleID[, timestamp[, productID]]])
+        o un dict con esas claves. Las filas sin saleID reciben un rango de IDs
+        reservado de una vez y las sin timestamp la hora de la importación;
+        los saleID repetidos (ya existentes o en el lote) se rechazan.
+        Todas las ventas aceptadas se escriben al diario con un solo fsync.
+        """
+        result = BulkResult()
+        checked: list[tuple | str] = []
+        existing: set[int] | None = None
+        batch_ids: set[int] = set()
+        needed = 0
+        now = time.time()
+        for _, values, errors in SALE_SPEC.batch(rows):
+            if errors:
+                checked.append("; ".join(errors))
+                continue
+            *fields, sale_id, timestamp, product_id = values
+            if sale_id is None:
+                needed += 1
+            else:
+                if existing is None:
+                    # Solo se construye el índice de IDs si alguna fila trae el suyo
+                    existing = set(self._sales.saleIDs())
+                if sale_id in existing or sale_id in batch_ids:
+                    checked.append(f"duplicate ID '{sale_id}'")
+                    continue
+                batch_ids.add(sale_id)
+            checked.append((sale_id, *fields, timestamp or now, product_id))
+
+        # Los IDs explícitos del lote se registran antes de reservar: el rango
+        # reservado empieza después de todos ellos y no puede repetir ninguno
+        if batch_ids:
+            self._ids.observe(max(batch_ids))
+        next_id = self._ids.reserve(needed)
+        accepted: list[tuple] = []
+        for index, fields in enumerate(checked):
+            if isinstance(fields, str):
+                result.reject(index, fields)
+                continue
+            sale_id = fields[0]
+            if sale_id is None:
+                sale_id, next_id = next_id, next_id + 1
+            accepted.append((sale_id, *fields[1:]))
+            result.accept(index, sale_id)
+
+        start = len(self._sales)
+        self._sales.extend(accepted)
+        if self._journalPath is not None and accepted:
+            self._appendJournal([self._sales[i] for i in range(start, start + len(accepted))])
+        return result
+
+    def listSales(self, sort: str | None = None, offset: int = 0, limit: int = 20,
+                  reverse: bool = False) -> list[Sale]:
+        """Una página de ventas; sort: None (orden de registro), id, name, price o quantity."""
+        return self._sales.page(sort, offset, limit, reverse)
 
-    def displayStatistics(self):
-        if not self._sales:
+    def displaySales(self, page: int = 1, pageSize: int = 20, sort: str | None = None,
+                     reverse: bool = False, out: TextIO | None = None) -> int:
+        """
+        Muestra la página page (desde 1) de las ventas con un solo write y
+        devuelve el número total de páginas.
+        """
+        count = len(self._sales)
+        if not count:
+            print(color("There are no sales yet.", "yellow"), file=out)
+            return 0
+        pages = math.ceil(count / pageSize)
+        page = min(max(page, 1), pages)
+        order = f"by {sort} {'desc' if reverse else 'asc'}" if sort else ("newest first" if reverse else "oldest first")
+        lines = [color(f"Current Sales (page {page}/{pages}, {order}):", "blue")]
+        for s in self.listSales(sort, (page - 1) * pageSize, pageSize, reverse):
+            lines.append(f"ID: {s.saleID} | User: {s.username} | Product: {s.product} | Qty: {s.quantity} | Price: {s.price} | Total: {s.total}")
+        lines.append(color(f"Total sales count: {count}", "magenta"))
+        (out or sys.stdout).write("\n".join(lines) + "\n")
+        return pages
+
+    def productSales(self, product: Product) -> dict:
+        """
+        Ventas de product desde el índice por ID (O(1), sin recorrer el historial
+        y válido aunque el producto se haya renombrado):
+        units, revenue, count, last_sale (epoch o None),
+        sell_through = vendidas / (vendidas + stock) y turnover = vendidas / stock
+        (None sin stock).
+        """
+        units, revenue, count, last_sale = self._sales.productTotals(product.productID)
+        stock = product.quantity
+        return {
+            "units": units,
+            "revenue": revenue,
+            "count": count,
+            "last_sale": last_sale,
+            "sell_through": units / (units + stock) if units + stock else 0.0,
+            "turnover": units / stock if stock else None,
+        }
+
+    def analytics(self) -> SalesAnalytics:
+        """Acumulados incrementales por producto, usuario, categoría, hora y día."""
+        return self._sales.analytics(self._categoryOf)
+
+    def statistics(self, top: int = 3) -> dict:
+        """
+        Agregados de ventas: count, revenue, items, top_products, top_users (por
+        número de ventas) y top_categories (por ingresos). Salen de los
+        acumulados de analytics(), sin recorrer el historial en cada llamada.
+        """
+        analytics = self.analytics()
+        return {
+            "count": analytics.count,
+            "revenue": analytics.revenue,
+            "items": analytics.items,
+            "top_products": analytics.top("product", top, "count"),
+            "top_users": analytics.top("user", top, "count"),
+            "top_categories": analytics.top("category", top, "revenue"),
+        }
+
+    def displayStatistics(self, stats: dict | None = None):
+        """Muestra las estadísticas; stats permite pasar las ya calculadas (p. ej. por SQL)."""
+        if stats is None:
+            if not self._sales:
+                print(color("There are no sales. No statistics to show.", "yellow"))
+                return
+            stats = self.statistics(top=3)
+        elif not stats["count"]:
             print(color("There are no sales. No statistics to show.", "yellow"))
             return
-        total_revenue = sum(s.total for s in self._sales)
-        total_items = sum(s.quantity for s in self._sales)
-        by_product = Counter(s.product for s in self._sales)
-        by_user = Counter(s.username for s in self._sales)
-        top_products= by_product.most_common(3)
-        top_users = by_user.most_common(3)
+        total_revenue = stats["revenue"]
+        total_items = stats["items"]
+        top_products = stats["top_products"]
+        top_users = stats["top_users"]
         print(top_products, top_users)
 
         print(color("--- Sales Statistics ---", "blue"))
@@ -50,68 +360,246 @@ class SaleService:
         print(color("-" * 30, "magenta"))
         for client in top_users:
             print(f"Top client: {top_users.index(client)+1}. {client[0]}, with {client[1]} buys.")
+        top_categories = stats.get("top_categories")
+        if top_categories:
+            print(color("-" * 30, "magenta"))
+            for rank, (category, revenue) in enumerate(top_categories, 1):
+                print(f"Top category: {rank}. {category}: ${revenue:.2f}")
         print(color("-----------------------", "blue"))
 
-    def saveCSV(self, filePath: str, append: bool = False) -> None:
+    @staticmethod
+    def _resolvePath(filePath: str) -> Path:
         path = Path(filePath)
         if path.suffix.lower() != ".csv":
             path.mkdir(parents=True, exist_ok=True)
             path = path / "Sales.csv"
         else:
             path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @staticmethod
+    def _row(s: Sale) -> list:
+        return [s.saleID, s.username, s.product, s.quantity, s.price, s.role, s.total,
+                format_timestamp(s.timestamp), "" if s.productID is None else s.productID]
+
+    def openJournal(self, filePath: str, compactEvery: int = 0) -> None:
+        """
+        Activa el modo diario (append-only): cada venta nueva se añade como una
+        fila a `<Sales>.journal` y se sincroniza a disco, sin reescribir el CSV.
+        Con `compactEvery` ventas en el diario (0 = nunca) compactIfDue lo
+        compacta en el CSV; una venta nunca lo hace.
+        """
+        self._csvPath = self._resolvePath(filePath)
+        self._journalPath = self._csvPath.with_suffix(".journal")
+        self._compactEvery = compactEvery
 
+    def _appendJournal(self, sales: list[Sale]) -> None:
+        with self._journalLock:
+            with self._journalPath.open("a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                for sale in sales:
+                    writer.writerow(self._row(sale))
+                f.flush()
+                os.fsync(f.fileno())
+            self._journalCount += len(sales)
+
+    def flushJournal(self) -> int:
+        """
+        Escribe en el diario, con un solo fsync, las ventas registradas con
+        defer=True. Si falla, siguen pendientes para el siguiente intento (una
+        fila que sí llegó a escribirse se descarta al reaplicar, por su saleID).
+        """
+        if self._journalPath is None:
+            return 0
+        with self._journalLock:
+            with self._pendingLock:
+                batch, self._pending = self._pending, []
+            if batch:
+                try:
+                    self._appendJournal(batch)
+                except Exception:
+                    with self._pendingLock:
+                        self._pending[:0] = batch
+                    raise
+        return len(batch)
+
+    def compact(self) -> None:
+        """Reescribe el CSV completo con todas las ventas y vacía el diario."""
+        if self._csvPath is None:
+            self._events.emit("Sales journal is not enabled.", "yellow")
+            return
+        self.saveCSV(str(self._csvPath))
+
+    def compactIfDue(self) -> bool:
+        """
+        Compacta si el diario ya tiene compactEvery ventas. Pensado para el
+        guardado por lotes o de fondo (repositorio), fuera de las compras.
+        """
+        if not self._compactEvery or self._journalCount < self._compactEvery:
+            return False
+        self.compact()
+        return True
+
+    def saveCSV(self, filePath: str, append: bool = False) -> None:
+        path = self._resolvePath(filePath)
         new_file = not path.exists()
-        mode = "a" if append else "w"
-        with path.open(mode, newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            if new_file or not append:
-                writer.writerow(["saleID", "username", "product", "quantity", "price", "role", "total"])
-            for s in self._sales:
-                writer.writerow([s.saleID, s.username, s.product, s.quantity, s.price, s.role, s.total])
-        print(color(f"Sales saved to {str(path)}", "green"))
-
-    def loadCSV(self, filePath: str) -> None:
-        path = Path(filePath)
-        if not path.is_file():
-            print(color(f"No sales file found at '{filePath}'. Starting fresh.", "yellow"))
+        if append:
+            with path.open("a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(SALES_HEADER)
+                for s in self._sales:
+                    writer.writerow(self._row(s))
+        else:
+            # Escribir en un temporal y reemplazar para no dejar el CSV a medias.
+            # Con el diario bloqueado ninguna venta nueva escribe en él mientras tanto
+            with self._journalLock:
+                target = self._csvPath is not None and path.resolve() == self._csvPath.resolve()
+                # Solo se escriben las n ventas que hay ahora. Las pendientes de este
+                # momento están todas entre ellas (addSale las añade bajo _pendingLock);
+                # las que lleguen durante la escritura quedan en _pending para el diario
+                with self._pendingLock:
+                    n = len(self._sales)
+                    if target:
+                        self._pending = []
+                tmp = path.with_suffix(".tmp")
+                with tmp.open("w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(SALES_HEADER)
+                    for s in itertools.islice(self._sales, n):
+                        writer.writerow(self._row(s))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, path)
+                self._refreshSnapshot(str(path), n)
+                if target:
+                    # El CSV ya contiene todo lo que había en el diario
+                    self._journalPath.unlink(missing_ok=True)
+                    self._journalCount = 0
+        self._events.emit(f"Sales saved to {str(path)}", "green")
+
+    def saveSnapshot(self, filePath: str, count: int | None = None) -> None:
+        """
+        Escribe el snapshot binario (`.snap`) junto al CSV filePath; con count,
+        solo las primeras count ventas (las que están en el CSV, sin las del diario).
+        Los timestamps se guardan en segundos enteros, como en el CSV.
+        """
+        rows = (row[:6] + (float(int(row[6])), row[7]) for row in self._sales.rows())
+        write_snapshot(snapshot_path(filePath), SALE_SNAPSHOT,
+                       rows if count is None else itertools.islice(rows, count))
+
+    def _refreshSnapshot(self, filePath: str, count: int | None = None) -> None:
+        # El snapshot es solo una caché del CSV: si no se puede escribir se avisa y se sigue
+        try:
+            self.saveSnapshot(filePath, count)
+        except Exception as e:
+            self._events.emit(f"Warning: could not write snapshot for '{filePath}': {e}", "yellow")
+
+    def _loadSnapshot(self, path: Path, report: LoadReport, seen: set) -> bool:
+        snap = snapshot_path(path)
+        records = read_snapshot(snap, SALE_SNAPSHOT) if is_fresh(snap, path) else None
+        if records is None:
+            return False
+        start = len(self._sales)
+        report.loaded += self._sales.extend(records)
+        ids = self._sales.saleIDs(start)
+        seen.update(ids)
+        if ids:
+            self._ids.observe(max(ids))
+        return True
+
+    def _loadParallel(self, path: Path, report: LoadReport, seen: set, workers: int) -> None:
+        # Supone que ningún campo contiene saltos de línea (como escribe saveCSV)
+        if path.stat().st_size == 0:
+            report.empty = True
             return
+        ranges = _splitRanges(path, workers * 4)
+        row_base = 2
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = pool.map(_parseChunk, [str(path)] * len(ranges),
+                              [a for a, _ in ranges], [b for _, b in ranges])
+            # Se fusiona en orden de archivo para que el primer saleID repetido gane.
+            # Cada bloque entra con un solo SaleStore.extend (un lock por bloque)
+            for (rows, ids, usernames, products, quantities, prices, roles, timestamps, product_ids,
+                 errors, lines) in chunks:
+                for i, message in errors:
+                    report.error(row_base + i, message)
+                columns = zip(ids, usernames, products, quantities, prices, roles, timestamps, product_ids)
+                chunk_ids = set(ids)
+                if len(chunk_ids) == len(ids) and seen.isdisjoint(chunk_ids):
+                    # Caso habitual: ningún ID repetido, las columnas pasan tal cual
+                    seen |= chunk_ids
+                else:
+                    columns = self._dropDuplicates(columns, rows, row_base, seen, report)
+                report.loaded += self._sales.extend(columns)
+                if ids:
+                    self._ids.observe(max(ids))
+                row_base += lines
+
+    @staticmethod
+    def _dropDuplicates(columns: Iterator[tuple], rows: array, row_base: int, seen: set,
+                        report: LoadReport) -> Iterator[tuple]:
+        for j, row in enumerate(columns):
+            sale_id = row[0]
+            if sale_id in seen:
+                report.error(row_base + rows[j], f"duplicate ID '{sale_id}'", duplicate=True)
+                continue
+            seen.add(sale_id)
+            yield row
 
-        loaded_ids = set()
+    def _loadRows(self, path: Path, report: LoadReport, seen: set, header: bool = True) -> None:
+        # Tuplas directas a las columnas, por bloques (como _loadParallel): sin un Sale por fila
+        rows = iter_csv(path, _parseSaleRow, report, min_columns=6, record_key=itemgetter(0),
+                        seen=seen, header=header)
+        while chunk := list(itertools.islice(rows, _LOAD_CHUNK)):
+            self._sales.extend(chunk)
+            self._ids.observe(max(row[0] for row in chunk))
+
+    def loadCSV(self, filePath: str, workers: int = 1, useSnapshot: bool = True) -> LoadReport | None:
+        """
+        Carga las ventas de filePath y reaplica el diario. Si hay un snapshot
+        `.snap` al día se lee ese; si no, se parsea el CSV (en paralelo con
+        workers > 1, por rangos de bytes en un pool de procesos) y se regenera.
+        """
+        path = Path(filePath)
+        journal = path.with_suffix(".journal")
+        if not path.is_file() and not journal.is_file():
+            self._events.emit(f"No sales file found at '{filePath}'. Starting fresh.", "yellow")
+            return None
+
+        report = LoadReport(filePath)
+        seen = set()
         try:
-            with path.open(mode='r', newline='', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                try:
-                    header = next(reader)
-                except StopIteration:
-                    print(color(f"Sales file '{filePath}' is empty.", "yellow"))
-                    return
-
-                self._sales.clear()
-                for i, row in enumerate(reader, start=2):
-                    if not row:
-                        continue
-                    if len(row) < 6:
-                        print(color(f"Warning: Skipping malformed row {i} in '{filePath}'.", "yellow"))
-                        continue
-                    try:
-                        sale_id = int(row[0])
-                        if sale_id in loaded_ids:
-                            print(color(f"Warning: Duplicate sale ID '{sale_id}' found in row {i}. Skipping.", "yellow"))
-                            continue
-                        username = str(row[1])
-                        product = str(row[2])
-                        quantity = int(row[3])
-                        price = float(row[4])
-                        role = int(row[5])
-                        sale = Sale(username=username, product=product, quantity=quantity, price=price, role=role, sale_id=sale_id)
-                        self._sales.append(sale)
-                        loaded_ids.add(sale_id)
-                    except (ValueError, IndexError) as conversion_error:
-                        print(color(f"Warning: Could not parse row {i} in '{filePath}': {conversion_error}", "yellow"))
-
-            if not self._sales and not loaded_ids:
-                print(color(f"Sales file '{filePath}' has no valid sales to load.", "yellow"))
+            self._sales.clear()
+            self._ids.reset()
+            snapshot = None
+            if path.is_file() and not (useSnapshot and self._loadSnapshot(path, report, seen)):
+                if workers > 1:
+                    self._loadParallel(path, report, seen, workers)
+                else:
+                    self._loadRows(path, report, seen)
+                if report.empty:
+                    self._events.emit(f"Sales file '{filePath}' is empty.", "yellow")
+                elif useSnapshot:
+                    # Se escribe tras el diario, con solo las ventas del CSV
+                    snapshot = len(self._sales)
+            if journal.is_file():
+                # El diario no lleva cabecera; las ventas ya presentes en el CSV
+                # y una última fila cortada por una caída se ignoran
+                replay = LoadReport(journal)
+                self._loadRows(journal, replay, seen, header=False)
+                self._journalCount = replay.loaded
+                if replay.loaded:
+                    self._events.emit(f"Replayed {replay.loaded} sales from journal '{journal}'.", "cyan")
+            if snapshot is not None:
+                self._refreshSnapshot(filePath, snapshot)
+            if report.skipped:
+                self._events.emit(f"Warning: {report.summary()}.", "yellow")
+
+            if not self._sales:
+                self._events.emit(f"Sales file '{filePath}' has no valid sales to load.", "yellow")
             else:
-                print(color(f"Sales loaded successfully from '{filePath}'.", "green"))
+                self._events.emit(f"Sales loaded successfully from '{filePath}'.", "green")
         except Exception as e:
-            print(color(f"Error loading sales from '{filePath}': {e}", "red"))
+            self._events.emit(f"Error loading sales from '{filePath}': {e}", "red")
+        return report
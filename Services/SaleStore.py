@@ -0,0 +1,271 @@
+from Models.Sale import Sale
+from Services.SalesAnalytics import SalesAnalytics
+from Utils.SortedIndex import SortedIndex
+from array import array
+from typing import Callable
+import threading
+
+
+class SaleStore:
+    """
+    Almacén columnar de ventas: cada campo vive en su propio array y
+    username/product se guardan como códigos enteros (diccionario).
+    Se comporta como una lista de Sale (len, iteración, índice); los acumulados
+    (analytics) se mantienen con cada venta en lugar de recorrer las columnas.
+    Además mantiene, con cada venta, los totales por ID de producto (índice de
+    unión con Inventory): consultarlos es O(1) y no depende del nombre.
+    """
+
+    def __init__(self, productIdOf=None):
+        self._lock = threading.Lock()
+        # Nombre -> ID de producto para ventas que llegan sin él (archivos antiguos)
+        self._productIdOf = productIdOf
+        self._saleIDs = array('q')
+        self._quantities = array('q')
+        self._prices = array('d')
+        self._roles = array('q')
+        self._userCodes = array('q')
+        self._productCodes = array('q')
+        # Segundos epoch de cada venta; 0.0 = sin fecha (ventas de archivos antiguos)
+        self._timestamps = array('d')
+        # ID de producto de cada venta; -1 = desconocido
+        self._productIDs = array('q')
+        # ID de producto -> [unidades, ingresos, nº de ventas, última fecha]
+        self._byProductID: dict[int, list] = {}
+        self._userNames: list[str] = []
+        self._productNames: list[str] = []
+        self._userIndex: dict[str, int] = {}
+        self._productIndex: dict[str, int] = {}
+        # Órdenes (sort -> SortedIndex de posiciones) creados al pedirlos por primera vez
+        self._orders: dict[str, SortedIndex] = {}
+        # Acumulados de analytics(), creados al pedirlos y mantenidos con cada venta
+        self._analytics: SalesAnalytics | None = None
+
+    SORTS = ("id", "name", "price", "quantity")
+
+    def _sortKey(self, sort: str, i: int):
+        if sort == "id":
+            return self._saleIDs[i]
+        if sort == "name":
+            return self._productNames[self._productCodes[i]].casefold()
+        if sort == "price":
+            return self._prices[i]
+        return self._quantities[i]
+
+    def _addToOrders(self, start: int, bulk: bool) -> None:
+        for sort, order in self._orders.items():
+            for i in range(start, len(self._saleIDs)):
+                order.add(i, self._sortKey(sort, i), bulk=bulk)
+
+    @staticmethod
+    def _encode(value: str, index: dict[str, int], names: list[str]) -> int:
+        code = index.get(value)
+        if code is None:
+            code = len(names)
+            index[value] = code
+            names.append(value)
+        return code
+
+    def _resolve(self, product: str, product_id: int | None) -> int:
+        if product_id is None or product_id < 0:
+            found = self._productIdOf(product) if self._productIdOf is not None else None
+            product_id = found if found is not None else -1
+        return product_id
+
+    def _link(self, product_id: int, quantity: int, price: float, timestamp: float | None) -> None:
+        if product_id >= 0:
+            totals = self._byProductID.get(product_id)
+            if totals is None:
+                totals = self._byProductID[product_id] = [0, 0.0, 0, 0.0]
+            totals[0] += quantity
+            totals[1] += quantity * price
+            totals[2] += 1
+            if timestamp and timestamp > totals[3]:
+                totals[3] = timestamp
+
+    def _appendColumns(self, sale_id: int, user_code: int, product_code: int, quantity: int,
+                       price: float, role: int, timestamp: float | None, product_id: int) -> None:
+        # Todas las columnas o ninguna: un valor que no cabe (TypeError/OverflowError)
+        # deshace las ya añadidas para que sigan teniendo la misma longitud
+        n = len(self._saleIDs)
+        try:
+            self._saleIDs.append(sale_id)
+            self._quantities.append(quantity)
+            self._prices.append(price)
+            self._roles.append(role)
+            self._timestamps.append(timestamp or 0.0)
+            self._productIDs.append(product_id)
+            self._userCodes.append(user_code)
+            self._productCodes.append(product_code)
+        except Exception:
+            for column in self._columns():
+                del column[n:]
+            raise
+
+    def _columns(self) -> tuple[array, ...]:
+        return (self._saleIDs, self._quantities, self._prices, self._roles,
+                self._userCodes, self._productCodes, self._timestamps, self._productIDs)
+
+    def appendRow(self, sale_id: int, username: str, product: str, quantity: int, price: float, role: int,
+                  timestamp: float | None = None, product_id: int | None = None) -> None:
+        with self._lock:
+            product_id = self._resolve(product, product_id)
+            self._appendColumns(sale_id, self._encode(username, self._userIndex, self._userNames),
+                                self._encode(product, self._productIndex, self._productNames),
+                                quantity, price, role, timestamp, product_id)
+            # Solo con la fila ya guardada se tocan los totales, órdenes y acumulados
+            self._link(product_id, quantity, price, timestamp)
+            if self._orders:
+                self._addToOrders(len(self._saleIDs) - 1, bulk=False)
+            if self._analytics is not None:
+                self._analytics.add(username, product, quantity, price, timestamp, product_id)
+
+    def extend(self, rows) -> int:
+        """
+        Añade tuplas (saleID, username, product, quantity, price, role, timestamp,
+        productID) en bloque; timestamp y productID pueden ser None (desconocidos).
+        Si una fila no cabe en las columnas se lanza la excepción; las anteriores
+        quedan añadidas y ninguna columna queda a medias.
+        """
+        count = 0
+        with self._lock:
+            start = len(self._saleIDs)
+            users, products = self._userIndex, self._productIndex
+            resolve, link = self._resolve, self._link
+            saleIDs, quantities, prices, roles = self._saleIDs, self._quantities, self._prices, self._roles
+            timestamps, productIDs = self._timestamps, self._productIDs
+            userCodes, productCodes = self._userCodes, self._productCodes
+            try:
+                for sale_id, username, product, quantity, price, role, timestamp, product_id in rows:
+                    if product_id is None or product_id < 0:
+                        product_id = resolve(product, product_id)
+                    user_code = users.get(username)
+                    if user_code is None:
+                        user_code = self._encode(username, users, self._userNames)
+                    product_code = products.get(product)
+                    if product_code is None:
+                        product_code = self._encode(product, products, self._productNames)
+                    saleIDs.append(sale_id)
+                    quantities.append(quantity)
+                    prices.append(price)
+                    roles.append(role)
+                    timestamps.append(timestamp or 0.0)
+                    productIDs.append(product_id)
+                    userCodes.append(user_code)
+                    productCodes.append(product_code)
+                    link(product_id, quantity, price, timestamp)
+                    count += 1
+            except Exception:
+                # Se descarta la fila que no cabía: ninguna columna queda más larga que otra
+                for column in self._columns():
+                    del column[start + count:]
+                raise
+            finally:
+                if self._orders:
+                    self._addToOrders(start, bulk=True)
+                if self._analytics is not None:
+                    self._analytics.extend(self._rows(start))
+        return count
+
+    def append(self, sale: Sale) -> None:
+        self.appendRow(sale.saleID, sale.username, sale.product, sale.quantity, sale.price, sale.role,
+                       sale.timestamp, sale.productID)
+
+    def analytics(self, categoryOf: Callable[[int], str | None] | None = None) -> SalesAnalytics:
+        """
+        Acumulados por producto, usuario, categoría, hora y día. La primera
+        llamada recorre las ventas una vez; después se mantienen con cada alta.
+        """
+        with self._lock:
+            if self._analytics is None:
+                self._analytics = SalesAnalytics(categoryOf)
+                self._analytics.extend(self._rows())
+            return self._analytics
+
+    def clear(self) -> None:
+        with self._lock:
+            for column in self._columns():
+                del column[:]
+            self._byProductID.clear()
+            self._userNames.clear()
+            self._productNames.clear()
+            self._userIndex.clear()
+            self._productIndex.clear()
+            self._orders.clear()
+            if self._analytics is not None:
+                # Se vacía en lugar de descartarse: quien lo tenga sigue viendo los datos nuevos
+                self._analytics.clear()
+
+    def __len__(self) -> int:
+        return len(self._saleIDs)
+
+    def _view(self, i: int) -> Sale:
+        return Sale(
+            username=self._userNames[self._userCodes[i]],
+            product=self._productNames[self._productCodes[i]],
+            quantity=self._quantities[i],
+            price=self._prices[i],
+            role=self._roles[i],
+            sale_id=self._saleIDs[i],
+            timestamp=self._timestamps[i],
+            product_id=self._productIDs[i],
+        )
+
+    def __getitem__(self, i: int) -> Sale:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("sale index out of range")
+        return self._view(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._view(i)
+
+    def page(self, sort: str | None = None, offset: int = 0, limit: int = 20,
+             reverse: bool = False) -> list[Sale]:
+        """
+        Una página de ventas. sort=None usa el orden de registro sin índices;
+        id / name (producto) / price / quantity usan un orden mantenido que se
+        construye la primera vez que se pide.
+        """
+        if sort is None:
+            n = len(self)
+            rows = range(n - 1 - offset, max(n - 1 - offset - limit, -1), -1) if reverse \
+                else range(offset, min(offset + limit, n))
+        else:
+            if sort not in self.SORTS:
+                raise ValueError(f"Unknown sort key '{sort}'. Use one of: {', '.join(self.SORTS)}")
+            with self._lock:
+                order = self._orders.get(sort)
+                if order is None:
+                    order = self._orders[sort] = SortedIndex()
+                    for i in range(len(self._saleIDs)):
+                        order.add(i, self._sortKey(sort, i), bulk=True)
+            rows = order.page(offset, limit, reverse)
+        return [self._view(i) for i in rows]
+
+    def productTotals(self, product_id: int) -> tuple[int, float, int, float | None]:
+        """(unidades, ingresos, nº de ventas, última fecha) del producto product_id, en O(1)."""
+        with self._lock:
+            totals = self._byProductID.get(product_id)
+            if totals is None:
+                return 0, 0.0, 0, None
+            return totals[0], totals[1], totals[2], totals[3] or None
+
+    def saleIDs(self, start: int = 0) -> array:
+        """Copia de la columna de IDs desde la posición start."""
+        return self._saleIDs[start:]
+
+    def rows(self):
+        """
+        Genera tuplas (saleID, username, product, quantity, price, role, timestamp,
+        productID) sin crear Sale; timestamp es 0.0 y productID -1 si se desconocen.
+        """
+        return self._rows()
+
+    def _rows(self, start: int = 0):
+        for i in range(start, len(self)):
+            yield (self._saleIDs[i], self._userNames[self._userCodes[i]],
+                   self._productNames[self._productCodes[i]], self._quantities[i],
+                   self._prices[i], self._roles[i], self._timestamps[i], self._productIDs[i])
@@ -0,0 +1,180 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Callable, Hashable, Iterable
+import heapq
+import threading
+
+# Posiciones de cada acumulado dentro de la lista de un grupo
+_REVENUE, _UNITS, _COUNT, _ORDER = 0, 1, 2, 3
+# Grupos internos por ID de producto, de los que sale la dimensión category
+_PRODUCT_ID = "productID"
+
+
+@lru_cache(maxsize=65536)
+def _buckets(hour: int) -> tuple[datetime, date]:
+    # Inicio de la hora (hora local) y su día; se calcula una vez por hora distinta.
+    # Las horas se cuentan desde epoch, así que vale para zonas con desfase de horas enteras
+    start = datetime.fromtimestamp(hour * 3600)
+    return start, start.date()
+
+
+class SalesAnalytics:
+    """
+    Acumulados de ventas que se actualizan con cada venta, sin recorrer el historial:
+    - ingresos, unidades y nº de ventas por producto, usuario, categoría, hora y día
+    - top(dimensión, k, métrica) sobre montículos mantenidos: cada actualización
+      añade una entrada y las que quedan viejas se descartan al consultar
+    Las ventas sin fecha (archivos antiguos) no cuentan en hour/day, y las de
+    productos sin categoría conocida no cuentan en category. La categoría es la
+    actual del producto (por su ID), como en el JOIN de SqliteRepository:
+    renombrarlo o cambiarlo de categoría lleva todas sus ventas consigo. Por eso
+    category se agrega al consultar, recorriendo los productos vendidos.
+    """
+
+    DIMENSIONS = ("product", "user", "category", "hour", "day")
+    METRICS = {"revenue": _REVENUE, "units": _UNITS, "count": _COUNT}
+
+    def __init__(self, categoryOf: Callable[[int], str | None] | None = None):
+        self._categoryOf = categoryOf
+        self._lock = threading.Lock()
+        self._groups: dict[str, dict[Hashable, list]] = {d: {} for d in (*self.DIMENSIONS, _PRODUCT_ID)}
+        # (dimensión, métrica) -> montículo de (-valor, orden de aparición, clave),
+        # creado la primera vez que se consulta ese top
+        self._heaps: dict[tuple[str, str], list[tuple]] = {}
+        self.count = 0
+        self.revenue = 0.0
+        self.items = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            for groups in self._groups.values():
+                groups.clear()
+            self._heaps.clear()
+            self.count = 0
+            self.revenue = 0.0
+            self.items = 0
+
+    def _bump(self, dimension: str, key: Hashable, revenue: float, units: int) -> None:
+        groups = self._groups[dimension]
+        acc = groups.get(key)
+        if acc is None:
+            # El orden de aparición desempata como Counter.most_common
+            acc = groups[key] = [0.0, 0, 0, len(groups)]
+        acc[_REVENUE] += revenue
+        acc[_UNITS] += units
+        acc[_COUNT] += 1
+        if self._heaps:
+            for metric, i in self.METRICS.items():
+                heap = self._heaps.get((dimension, metric))
+                if heap is not None:
+                    heapq.heappush(heap, (-acc[i], acc[_ORDER], key))
+                    if len(heap) > 2 * len(groups) + 64:
+                        # Demasiadas entradas viejas: se rehace con los valores actuales
+                        self._heaps[(dimension, metric)] = self._heapify(groups, i)
+
+    def _add(self, username: str, product: str, quantity: int, price: float,
+             timestamp: float | None, product_id: int | None) -> None:
+        revenue = quantity * price
+        self.count += 1
+        self.revenue += revenue
+        self.items += quantity
+        self._bump("product", product, revenue, quantity)
+        self._bump("user", username, revenue, quantity)
+        if product_id is not None and product_id >= 0:
+            self._bump(_PRODUCT_ID, product_id, revenue, quantity)
+        if timestamp:
+            hour, day = _buckets(int(timestamp // 3600))
+            self._bump("hour", hour, revenue, quantity)
+            self._bump("day", day, revenue, quantity)
+
+    def add(self, username: str, product: str, quantity: int, price: float,
+            timestamp: float | None = None, product_id: int | None = None) -> None:
+        with self._lock:
+            self._add(username, product, quantity, price, timestamp, product_id)
+
+    def extend(self, rows: Iterable[tuple]) -> None:
+        """Acumula tuplas (saleID, username, product, quantity, price, role, timestamp, productID)."""
+        with self._lock:
+            for _, username, product, quantity, price, _, timestamp, product_id in rows:
+                self._add(username, product, quantity, price, timestamp, product_id)
+
+    @staticmethod
+    def _heapify(groups: dict[Hashable, list], i: int) -> list[tuple]:
+        heap = [(-acc[i], acc[_ORDER], key) for key, acc in groups.items()]
+        heapq.heapify(heap)
+        return heap
+
+    def _categoryGroups(self) -> dict[Hashable, list]:
+        # Suma los grupos por ID de producto en su categoría actual; el orden de
+        # aparición de la categoría es el de su primer producto vendido
+        groups: dict[Hashable, list] = {}
+        if self._categoryOf is None:
+            return groups
+        for product_id, acc in self._groups[_PRODUCT_ID].items():
+            category = self._categoryOf(product_id)
+            if category is None:
+                continue
+            total = groups.get(category)
+            if total is None:
+                groups[category] = acc[:]
+            else:
+                total[_REVENUE] += acc[_REVENUE]
+                total[_UNITS] += acc[_UNITS]
+                total[_COUNT] += acc[_COUNT]
+                total[_ORDER] = min(total[_ORDER], acc[_ORDER])
+        return groups
+
+    def _check(self, dimension: str, metric: str) -> int:
+        if dimension not in self.DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dimension}'. Use one of: {', '.join(self.DIMENSIONS)}")
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Use one of: {', '.join(self.METRICS)}")
+        return self.METRICS[metric]
+
+    def top(self, dimension: str, k: int = 3, metric: str = "revenue") -> list[tuple[Hashable, float]]:
+        """Los k grupos de dimension con mayor metric (revenue, units o count)."""
+        i = self._check(dimension, metric)
+        with self._lock:
+            if dimension == "category":
+                best = heapq.nsmallest(k, self._heapify(self._categoryGroups(), i))
+                return [(key, -neg) for neg, _, key in best]
+            groups = self._groups[dimension]
+            heap = self._heaps.get((dimension, metric))
+            if heap is None:
+                heap = self._heaps[(dimension, metric)] = self._heapify(groups, i)
+            best: list[tuple] = []
+            seen: set = set()
+            while heap and len(best) < k:
+                entry = heapq.heappop(heap)
+                neg, _, key = entry
+                if key in seen or -neg != groups[key][i]:
+                    continue  # entrada vieja: el grupo ya tiene otro valor
+                seen.add(key)
+                best.append(entry)
+            for entry in best:
+                heapq.heappush(heap, entry)
+        return [(key, -neg) for neg, _, key in best]
+
+    def get(self, dimension: str, key: Hashable) -> dict | None:
+        """Acumulados de un grupo: {"revenue", "units", "count"} o None."""
+        self._check(dimension, "revenue")
+        with self._lock:
+            groups = self._categoryGroups() if dimension == "category" else self._groups[dimension]
+            acc = groups.get(key)
+            if acc is None:
+                return None
+            return {"revenue": acc[_REVENUE], "units": acc[_UNITS], "count": acc[_COUNT]}
+
+    def series(self, dimension: str = "day", start=None, end=None) -> list[tuple]:
+        """
+        (inicio del intervalo, revenue, units, count) por hora o día en orden
+        cronológico, opcionalmente entre start y end (incluidos).
+        """
+        if dimension not in ("hour", "day"):
+            raise ValueError("series() only supports the 'hour' and 'day' dimensions.")
+        with self._lock:
+            rows = [(bucket, acc[_REVENUE], acc[_UNITS], acc[_COUNT])
+                    for bucket, acc in self._groups[dimension].items()
+                    if (start is None or bucket >= start) and (end is None or bucket <= end)]
+        rows.sort()
+        return rows
@@ -0,0 +1,339 @@
+from Models.Product import Product
+from Models.Sale import Sale
+from Models.User import User
+from Services.Inventory import Inventory
+from Services.Repository import Repository
+from Services.SaleService import SaleService
+from Services.UserService import UserService
+from Utils.Decorator import *
+from Utils.Events import EventSink, console
+import argparse
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    productID INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL,
+    name_key  TEXT NOT NULL UNIQUE,
+    author    TEXT NOT NULL,
+    category  TEXT NOT NULL,
+    quantity  INTEGER NOT NULL CHECK (quantity >= 0),
+    price     REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sales (
+    saleID   INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    product  TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    price    REAL NOT NULL,
+    role     INTEGER NOT NULL,
+    soldAt   REAL,
+    productID INTEGER
+);
+CREATE INDEX IF NOT EXISTS sales_username ON sales (username);
+CREATE INDEX IF NOT EXISTS sales_product ON sales (product);
+CREATE TABLE IF NOT EXISTS users (
+    userID   INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    role     INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_username ON users (username);
+"""
+
+# Sentencias parametrizadas: sqlite3 las prepara una vez y las reutiliza
+_UPSERT_PRODUCT = """
+INSERT INTO products (productID, name, name_key, author, category, quantity, price)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (productID) DO UPDATE SET
+    name = excluded.name, name_key = excluded.name_key, author = excluded.author,
+    category = excluded.category, quantity = excluded.quantity, price = excluded.price
+"""
+# Guardado de productos modificados: el stock lo lleva la base de datos (las compras lo
+# descuentan en SQL), así que una fila ya existente no se pisa con el valor en memoria;
+# los cambios de stock hechos fuera de purchase se aplican como diferencia (_ADJUST_STOCK)
+_SAVE_PRODUCT = """
+INSERT INTO products (productID, name, name_key, author, category, quantity, price)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (productID) DO UPDATE SET
+    name = excluded.name, name_key = excluded.name_key, author = excluded.author,
+    category = excluded.category, price = excluded.price
+"""
+_ADJUST_STOCK = "UPDATE products SET quantity = MAX(quantity + ?, 0) WHERE productID = ?"
+_SELECT_PRODUCTS = "SELECT productID, name, author, category, quantity, price FROM products ORDER BY productID"
+_DECREMENT_STOCK = "UPDATE products SET quantity = quantity - ? WHERE productID = ? AND quantity >= ?"
+_SELECT_STOCK = "SELECT quantity FROM products WHERE productID = ?"
+_INSERT_SALE = ("INSERT INTO sales (username, product, quantity, price, role, soldAt, productID) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)")
+# soldAt 0.0 y productID -1 (desconocidos en memoria) se guardan como NULL
+_INSERT_SALE_ROW = ("INSERT OR IGNORE INTO sales (saleID, username, product, quantity, price, role, soldAt, productID) "
+                    "VALUES (?, ?, ?, ?, ?, ?, NULLIF(?, 0), NULLIF(?, -1))")
+_SELECT_SALES = ("SELECT saleID, username, product, quantity, price, role, soldAt, productID "
+                 "FROM sales ORDER BY saleID")
+_SALES_TOTALS = "SELECT COUNT(*), COALESCE(SUM(quantity * price), 0), COALESCE(SUM(quantity), 0) FROM sales"
+_TOP_PRODUCTS = ("SELECT product, COUNT(*) AS n FROM sales GROUP BY product "
+                 "ORDER BY n DESC, MIN(saleID) LIMIT ?")
+_TOP_USERS = ("SELECT username, COUNT(*) AS n FROM sales GROUP BY username "
+              "ORDER BY n DESC, MIN(saleID) LIMIT ?")
+# Por ID de producto: un producto renombrado conserva sus ventas
+_TOP_CATEGORIES = ("SELECT p.category, SUM(s.quantity * s.price) AS revenue FROM sales s "
+                   "JOIN products p ON p.productID = s.productID GROUP BY p.category "
+                   "ORDER BY revenue DESC, MIN(s.saleID) LIMIT ?")
+_UPSERT_USER = """
+INSERT INTO users (userID, name, username, password, role) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (userID) DO UPDATE SET
+    name = excluded.name, username = excluded.username,
+    password = excluded.password, role = excluded.role
+"""
+_SELECT_USERS = "SELECT userID, name, username, password, role FROM users ORDER BY userID"
+
+
+class SqliteRepository(Repository):
+    """
+    Implementación sobre SQLite en modo WAL. Cada compra es una transacción
+    (stock + venta) y las estadísticas de ventas se calculan con SQL.
+    """
+
+    def __init__(self, dbPath: str, events: EventSink | None = None):
+        self._events = events if events is not None else console
+        self._lock = threading.Lock()
+        # productID -> último stock conocido de la base de datos; lo que difiera en
+        # memoria es un cambio del administrador (updateProduct) aún sin guardar
+        self._stock: dict[int, int] = {}
+        # isolation_level=None: las transacciones se abren explícitamente con BEGIN
+        self._db = sqlite3.connect(dbPath, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        # Bases creadas antes de guardar la fecha o el producto de cada venta: las columnas se añaden vacías
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(sales)")}
+        for column, kind in (("soldAt", "REAL"), ("productID", "INTEGER")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE sales ADD COLUMN {column} {kind}")
+        if "productID" not in columns:
+            # Única vez que se enlaza por nombre: las ventas antiguas toman el ID del
+            # producto que se llamaba así al migrar; después todo va por productID
+            # (un UPDATE por producto, por el índice sales_product)
+            self._transaction("UPDATE sales SET productID = ? WHERE product = ?",
+                              list(self._db.execute("SELECT productID, name FROM products")))
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _transaction(self, sql: str, rows) -> None:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(sql, rows)
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    @staticmethod
+    def _productRow(p: Product) -> tuple:
+        return (p.productID, p.name, Inventory._key(p.name), p.author, p.category, p.quantity, p.price)
+
+    def loadInventory(self, inventory: Inventory) -> None:
+        with self._lock:
+            rows = self._db.execute(_SELECT_PRODUCTS).fetchall()
+            self._stock = {row[0]: row[4] for row in rows}
+        count = inventory.loadProducts(
+            Product(name, author, category, quantity, price, product_id=pid)
+            for pid, name, author, category, quantity, price in rows)
+        self._events.emit(f"Inventory loaded from database ({count} products).", "green")
+
+    def saveInventory(self, inventory: Inventory) -> None:
+        changed = inventory.takeDirty()
+        try:
+            self._saveProducts(changed)
+        except Exception:
+            inventory._restoreDirty(changed)
+            raise
+        self._events.emit(f"Inventory saved to database ({len(changed)} changed rows).", "green")
+
+    def _saveProducts(self, products: list[Product]) -> None:
+        # Dentro del lock de las compras: el stock en memoria y self._stock cambian juntos
+        with self._lock:
+            rows = [(p, self._productRow(p)) for p in products]
+            new = [row for p, row in rows if p.productID not in self._stock]
+            known = [row for p, row in rows if p.productID in self._stock]
+            # row[5] es la cantidad en memoria al tomar la fila
+            adjusted = [(p, row[5]) for p, row in rows
+                        if p.productID in self._stock and row[5] != self._stock[p.productID]]
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(_UPSERT_PRODUCT, new)
+                self._db.executemany(_SAVE_PRODUCT, known)
+                self._db.executemany(_ADJUST_STOCK, [(quantity - self._stock[p.productID], p.productID)
+                                                     for p, quantity in adjusted])
+                stocks = [self._db.execute(_SELECT_STOCK, (p.productID,)).fetchone()[0] for p, _ in adjusted]
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            for row in new:
+                self._stock[row[0]] = row[5]
+            for (p, quantity), stock in zip(adjusted, stocks):
+                self._stock[p.productID] = stock
+                if stock != quantity and p.quantity == quantity:
+                    # Otro proceso cambió el stock y la diferencia lo dejaba bajo cero
+                    p.quantity = stock
+
+    def loadSales(self, sales: SaleService) -> None:
+        with self._lock:
+            cursor = self._db.execute(_SELECT_SALES)
+            count = sales.loadSales(cursor)
+        self._events.emit(f"Sales loaded from database ({count} sales).", "green")
+
+    def saveSales(self, sales: SaleService) -> None:
+        # Las compras ya se guardan al registrarse; aquí solo se añaden las que falten
+        self._transaction(_INSERT_SALE_ROW, sales._sales.rows())
+        self._events.emit("Sales saved to database.", "green")
+
+    def loadUsers(self, users: UserService) -> None:
+        with self._lock:
+            rows = self._db.execute(_SELECT_USERS).fetchall()
+        count = users.loadUsers(User(name, username, password, role, user_id=uid)
+                                for uid, name, username, password, role in rows)
+        self._events.emit(f"Users loaded from database ({count} users).", "green")
+        if users.migratePasswords():
+            # Contraseñas antiguas en texto plano: se guardan ya con hash
+            self.saveUsers(users)
+
+    def saveUsers(self, users: UserService) -> None:
+        users.migratePasswords()
+        self._transaction(_UPSERT_USER, ((u.userID, u.name, u.username, u.password, u.role)
+                                         for u in users._users))
+        self._events.emit("Users saved to database.", "green")
+
+    def purchase(self, inventory: Inventory, sales: SaleService, user: User,
+                 name: str, qty: int, defer: bool = False) -> Sale | None:
+        # defer no aplica: cada compra es su propia transacción (barata en WAL)
+        if qty <= 0:
+            self._events.emit("Quantity must be positive.", "red")
+            return None
+        product = inventory.findProductByName(name)
+        if not product:
+            self._events.emit("Product not found.", "red")
+            return None
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                if self._db.execute(_DECREMENT_STOCK, (qty, product.productID, qty)).rowcount == 0:
+                    self._db.execute("ROLLBACK")
+                    self._events.emit("Insufficient stock.", "red")
+                    return None
+                stock = self._db.execute(_SELECT_STOCK, (product.productID,)).fetchone()[0]
+                sold_at = time.time()
+                sale_id = self._db.execute(_INSERT_SALE, (user.username, product.name, qty, product.price,
+                                                          int(user.role), sold_at, product.productID)).lastrowid
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            # La base de datos es la referencia: se copia su stock a memoria dentro del
+            # lock, así ninguna otra compra deja en memoria un valor más antiguo; un
+            # cambio del administrador aún sin guardar se conserva encima
+            unsaved = product.quantity - self._stock.get(product.productID, product.quantity)
+            self._stock[product.productID] = stock
+            product.quantity = max(stock + unsaved, 0)
+        return sales.addSale(username=user.username, product=product.name, quantity=qty,
+                             price=product.price, role=int(user.role), sale_id=sale_id, timestamp=sold_at,
+                             product_id=product.productID)
+
+    def flush(self, inventory: Inventory, sales: SaleService) -> None:
+        # Las ventas ya están en la base de datos; solo faltan los productos modificados
+        self.saveInventory(inventory)
+
+    def salesStatistics(self, sales: SaleService, top: int = 3) -> dict:
+        with self._lock:
+            count, revenue, items = self._db.execute(_SALES_TOTALS).fetchone()
+            top_products = [tuple(r) for r in self._db.execute(_TOP_PRODUCTS, (top,))]
+            top_users = [tuple(r) for r in self._db.execute(_TOP_USERS, (top,))]
+            top_categories = [tuple(r) for r in self._db.execute(_TOP_CATEGORIES, (top,))]
+        return {
+            "count": count,
+            "revenue": float(revenue),
+            "items": int(items),
+            "top_products": top_products,
+            "top_users": top_users,
+            "top_categories": top_categories,
+        }
+
+    def importAll(self, inventory: Inventory, sales: SaleService, users: UserService) -> None:
+        """Vuelca en la base de datos todo lo que tienen los servicios en memoria."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(_UPSERT_PRODUCT, [self._productRow(p) for p in inventory._products])
+                self._db.executemany(_UPSERT_USER, ((u.userID, u.name, u.username, u.password, u.role)
+                                                    for u in users._users))
+                self._db.executemany(_INSERT_SALE_ROW, sales._sales.rows())
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            self._stock.update((p.productID, p.quantity) for p in inventory._products)
+        inventory.takeDirty()
+
+
+def importCSV(directory: str, dbPath: str) -> None:
+    """Importa Inventario.csv, Sales.csv y Users.csv de directory a dbPath."""
+    base = Path(directory)
+    inv, users = Inventory(), UserService()
+    # Las ventas sin productID (archivos antiguos) se enlazan con el inventario ya cargado
+    sales = SaleService(categoryOf=inv.categoryOf, productIdOf=inv.productIdOf)
+    inv.loadCSV(str(base / "Inventario.csv"), useSnapshot=False)
+    sales.loadCSV(str(base / "Sales.csv"), useSnapshot=False)
+    users.loadCSV(str(base / "Users.csv"), useSnapshot=False)
+    repo = SqliteRepository(dbPath)
+    try:
+        repo.importAll(inv, sales, users)
+    finally:
+        repo.close()
+    print(color(f"Imported CSV files from '{directory}' into '{dbPath}'.", "green"))
+
+
+def exportCSV(dbPath: str, directory: str) -> None:
+    """Exporta las tablas de dbPath a CSV en directory."""
+    base = Path(directory)
+    inv, users = Inventory(), UserService()
+    sales = SaleService(categoryOf=inv.categoryOf, productIdOf=inv.productIdOf)
+    repo = SqliteRepository(dbPath)
+    try:
+        repo.loadInventory(inv)
+        repo.loadSales(sales)
+        repo.loadUsers(users)
+    finally:
+        repo.close()
+    inv.saveCSV(str(base / "Inventario.csv"))
+    sales.saveCSV(str(base / "Sales.csv"))
+    users.saveCSV(str(base / "Users.csv"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import/export the store between CSV files and SQLite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="CSV directory -> SQLite database")
+    imp.add_argument("directory")
+    imp.add_argument("database")
+    exp = sub.add_parser("export", help="SQLite database -> CSV directory")
+    exp.add_argument("database")
+    exp.add_argument("directory")
+    args = parser.parse_args()
+    if args.command == "import":
+        importCSV(args.directory, args.database)
+    else:
+        exportCSV(args.database, args.directory)
+
+
+if __name__ == "__main__":
+    main()
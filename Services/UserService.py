@@ -1,38 +1,187 @@
 # Services/UserService.py
 from Models.User import User
+from Utils.BulkResult import BulkResult
 from Utils.Decorator import *
+from Utils.Events import EventSink, console
+from Utils.IdAllocator import IdAllocator
+from Utils.Passwords import hash_password, hash_passwords, is_hashed
+from Utils.Validator import USER_SPEC, Field, NameSet, RecordSpec, normalize_name
+from Utils.CsvStream import LoadReport, iter_csv
+from Utils.Snapshot import SnapshotSchema, is_fresh, read_snapshot, snapshot_path, write_snapshot
 import csv
+from operator import attrgetter
 from pathlib import Path
+from typing import Iterable, Iterator
+
+
+# userID, name, username, password, role (versión 2: role de 64 bits)
+USER_SNAPSHOT = SnapshotSchema(3, "qIIIq", (1, 2, 3), version=2)
+
+
+USER_CSV_SPEC = RecordSpec(
+    Field("userID", "int", min_value=0),
+    Field("name", "text", max_len=10_000),
+    Field("username", "text", max_len=10_000),
+    Field("password", "text", max_len=10_000),
+    Field("role", "int"),
+)
+
+
+# (argumentos posicionales de User: name, username, password, role, user_id)
+_parseUser = USER_CSV_SPEC.csv_parser(User, "name", "username", "password", "role", "userID")
+
+
+def iter_users(path, report: LoadReport | None = None) -> Iterator[User]:
+    """
+    Genera los usuarios de path uno a uno sin cargar el archivo entero.
+    Las filas inválidas o con userID repetido se anotan en report.
+    """
+    if report is None:
+        report = LoadReport(path)
+    return iter_csv(path, _parseUser, report, columns=5, record_key=attrgetter("userID"))
 
 class UserService:
-    def __init__(self):
+    def __init__(self, events: EventSink | None = None):
+        self._events = events if events is not None else console
         # Roles como enteros y IDs fijos para ejemplo
         self._users = [
             User("Daniela García", "Danieloide", "Danieloide", 1, 1),
             User("Andrés David", "Andres", "Andres", 2, 2),
         ]
+        # Índices en memoria: nombre sin mayúsculas -> User, username -> User e ID -> User
+        self._by_name: dict[str, User] = {}
+        # Nombres sin mayúsculas ni acentos: solo para rechazar nombres nuevos equivalentes
+        self._names = NameSet()
+        self._by_username: dict[str, User] = {}
+        self._by_id: dict[int, User] = {}
+        self._ids = IdAllocator()
+        # Algoritmo y coste de los hashes nuevos (los de hash_password por defecto);
+        # AuthService los fija con setPasswordHashing
+        self._hashOptions: dict = {}
+        for user in self._users:
+            self._index(user)
+
+    @staticmethod
+    def _key(name: str) -> str:
+        # Búsqueda sin distinguir mayúsculas, igual que los productos
+        return name.casefold()
+
+    def _index(self, user: User) -> None:
+        self._by_name[self._key(user.name)] = user
+        self._names.add(user.name)
+        # Como el login recorría la lista, ante usernames repetidos gana el primero
+        self._by_username.setdefault(user.username, user)
+        self._by_id[user.userID] = user
+        self._ids.observe(user.userID)
+
+    def _clear(self) -> None:
+        self._users.clear()
+        self._by_name.clear()
+        self._names = NameSet()
+        self._by_username.clear()
+        self._by_id.clear()
+        self._ids.reset()
+
+    def loadUsers(self, users: Iterable[User]) -> int:
+        """Reemplaza los usuarios por users (p. ej. leídos de otro repositorio)."""
+        self._clear()
+        for user in users:
+            self._users.append(user)
+            self._index(user)
+        return len(self._users)
+
+    def setPasswordHashing(self, **options) -> None:
+        """Algoritmo y coste (algorithm, iterations, n) de hashPassword y de las altas."""
+        self._hashOptions = options
+
+    def hashPassword(self, password: str) -> str:
+        return hash_password(password, **self._hashOptions)
+
+    def migratePasswords(self) -> int:
+        """
+        Guarda con hash las contraseñas que aún están en texto plano (Users.csv
+        antiguos); devuelve cuántas había. Los hashes se calculan en paralelo.
+        """
+        plain = [u for u in self._users if not is_hashed(u.password)]
+        if plain:
+            hashes = hash_passwords([u.password for u in plain], **self._hashOptions)
+            for user, hashed in zip(plain, hashes):
+                user.password = hashed
+        return len(plain)
 
     def userExists(self, name: str) -> bool:
-        return self.findUserByName(name) is not None
+        """True si ya hay un usuario con un nombre equivalente (sin mayúsculas ni acentos)."""
+        return name in self._names
 
     def _next_id(self) -> int:
-        return max((u.userID for u in self._users), default=0) + 1
+        return self._ids.next()
 
-    def addUser(self, name: str, username: str, password: str, role: int) -> bool:
+    def addUser(self, name: str, username: str, password: str, role: int, hashed: bool = False) -> bool:
+        """hashed: password ya viene de hash_password (p. ej. calculado fuera del hilo que llama)."""
         if self.userExists(name):
-            print(color("User already exists.", "red"))
+            self._events.emit("User already exists.", "red")
+            return False
+        if self.findUserByUsername(username) is not None:
+            self._events.emit("Username already taken.", "red")
             return False
         uid = self._next_id()
-        user = User(name, username, password, role, user_id=uid)
+        # Nunca se guarda la contraseña en claro
+        user = User(name, username, password if hashed else self.hashPassword(password), role, user_id=uid)
         self._users.append(user)
-        print(color(f"User {user.name} added successfully.", "green"))
+        self._index(user)
+        self._events.emit(f"User {user.name} added successfully.", "green")
         return True
 
+    def addUsers(self, rows: Iterable) -> BulkResult:
+        """
+        Alta en bloque sin imprimir por fila. Cada fila es una secuencia
+        (name, username, password, role) o un dict con esas claves. Los nombres
+        y usernames ya existentes o repetidos en el lote se rechazan con una
+        comprobación O(1) por fila; los IDs se reservan de una vez.
+        """
+        result = BulkResult()
+        checked: list[tuple | str] = []
+        batch_names = NameSet()
+        batch_usernames: set[str] = set()
+        for _, fields, errors in USER_SPEC.batch(rows):
+            if errors:
+                checked.append("; ".join(errors))
+                continue
+            name, username = fields[0], fields[1]
+            if self.userExists(name) or not batch_names.is_unique(name):
+                checked.append(f"duplicate name '{name}'")
+                continue
+            if username in self._by_username or username in batch_usernames:
+                checked.append(f"duplicate username '{username}'")
+                continue
+            batch_names.add(name)
+            batch_usernames.add(username)
+            checked.append(fields)
+
+        next_id = self._ids.reserve(len(batch_names))
+        # Los hashes (lentos a propósito) se calculan todos a la vez en paralelo
+        hashes = iter(hash_passwords([fields[2] for fields in checked if not isinstance(fields, str)],
+                                     **self._hashOptions))
+        for index, fields in enumerate(checked):
+            if isinstance(fields, str):
+                result.reject(index, fields)
+                continue
+            name, username, _, role = fields
+            user = User(name, username, next(hashes), role, user_id=next_id)
+            self._users.append(user)
+            self._index(user)
+            result.accept(index, next_id)
+            next_id += 1
+        return result
+
     def findUserByName(self, name: str) -> User | None:
-        for user in self._users:
-            if user.name.lower() == name.lower():
-                return user
-        return None
+        return self._by_name.get(self._key(name))
+
+    def findUserByUsername(self, username: str) -> User | None:
+        return self._by_username.get(username)
+
+    def findUserByID(self, user_id: int) -> User | None:
+        return self._by_id.get(user_id)
 
     def searchUser(self, query: str) -> User | None:
         parcial = []
@@ -40,11 +189,12 @@ class UserService:
             if query.lower() in user.name.lower() or str(user.userID) == query or query.lower() in user.username.lower():
                 parcial.append(user)
         if parcial:
-            print(color("Search Results:", "blue"))
-            for user in parcial:
-                print(f"ID: {user.userID} | Name: {user.name} | Username: {user.username} | Role: {user.role} ")
+            if self._events.enabled:
+                self._events.emit("Search Results:", "blue")
+                for user in parcial:
+                    self._events.emit(f"ID: {user.userID} | Name: {user.name} | Username: {user.username} | Role: {user.role} ")
             return
-        print(color("User not found.", "red"))
+        self._events.emit("User not found.", "red")
         return None
 
 
@@ -62,21 +212,39 @@ class UserService:
                    new_name: str | None = None,
                    new_username: str | None = None,
                    new_password: str | None = None,
-                   role: int | None = None):
+                   role: int | None = None,
+                   hashed: bool = False):
         user = self.findUserByName(name)
         if not user:
-            print(color("User not found.", "red"))
+            self._events.emit("User not found.", "red")
             return False
+        if new_username is not None and new_username.strip() != "":
+            other = self._by_username.get(new_username)
+            if other is not None and other is not user:
+                self._events.emit("Username already taken.", "red")
+                return False
         if new_name is not None and new_name.strip() != "":
+            new_key = self._key(new_name)
+            other = self._by_name.get(new_key)
+            equivalent = normalize_name(new_name) == normalize_name(user.name)
+            if (other is not None and other is not user) or (not equivalent and self.userExists(new_name)):
+                self._events.emit("User already exists.", "red")
+                return False
+            del self._by_name[self._key(user.name)]
+            self._names.rename(user.name, new_name)
             user.name = new_name
-        if new_username is not None and new_username.strip() != "":
+            self._by_name[new_key] = user
+        if new_username is not None and new_username.strip() != "" and new_username != user.username:
+            if self._by_username.get(user.username) is user:
+                del self._by_username[user.username]
             user.username = new_username
+            self._by_username[new_username] = user
         if new_password is not None and new_password.strip() != "":
-            user.password = new_password
+            user.password = new_password if hashed else self.hashPassword(new_password)
         if role is not None:
             user.role = role
 
-        print(color(f"User {user.name} updated successfully.", "green"))
+        self._events.emit(f"User {user.name} updated successfully.", "green")
         return True
 
     def saveCSV(self, filePath: str, append: bool = False) -> None:
@@ -88,6 +256,8 @@ class UserService:
         else:
             path.parent.mkdir(parents=True, exist_ok=True)
         new_file = not path.exists()
+        # Nunca se escribe una contraseña en claro (p. ej. los usuarios de ejemplo)
+        self.migratePasswords()
         mode = "a" if append else "w"
         with path.open(mode, newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
@@ -95,53 +265,75 @@ class UserService:
                 writer.writerow(["userID", "name", "username", "password", "role"])
             for u in self._users:
                 writer.writerow([u.userID, u.name, u.username, u.password, u.role])
-        print(color(f"Users saved to {str(path)}", "green"))
+        if not append:
+            self._refreshSnapshot(str(path))
+        self._events.emit(f"Users saved to {str(path)}", "green")
+
+    def saveSnapshot(self, filePath: str) -> None:
+        """Escribe el snapshot binario (`.snap`) junto al CSV filePath."""
+        write_snapshot(snapshot_path(filePath), USER_SNAPSHOT,
+                       ((u.userID, u.name, u.username, u.password, u.role) for u in self._users))
 
-    def loadCSV(self, filePath: str) -> None:
+    def _refreshSnapshot(self, filePath: str) -> None:
+        # El snapshot es solo una caché del CSV: si no se puede escribir se avisa y se sigue
+        try:
+            self.saveSnapshot(filePath)
+        except Exception as e:
+            self._events.emit(f"Warning: could not write snapshot for '{filePath}': {e}", "yellow")
+
+    def _loadSnapshot(self, path: Path, report: LoadReport) -> bool:
+        snap = snapshot_path(path)
+        records = read_snapshot(snap, USER_SNAPSHOT) if is_fresh(snap, path) else None
+        if records is None:
+            return False
+        self._clear()
+        for user_id, name, username, password, role in records:
+            user = User(name, username, password, role, user_id=user_id)
+            self._users.append(user)
+            self._index(user)
+            report.loaded += 1
+        return True
+
+    def loadCSV(self, filePath: str, useSnapshot: bool = True) -> LoadReport | None:
+        """
+        Carga los usuarios. Si hay un snapshot `.snap` al día se lee ese en
+        lugar del CSV; si no, se parsea el CSV y se regenera el snapshot.
+        Si quedan contraseñas en texto plano se guardan con hash y se reescribe el CSV.
+        """
         path = Path(filePath)
         if not path.is_file():
-            print(color(f"No users file found at '{filePath}'. Starting fresh.", "yellow"))
-            return
+            self._events.emit(f"No users file found at '{filePath}'. Starting fresh.", "yellow")
+            return None
 
-        loaded_ids = set()
+        report = LoadReport(filePath)
         try:
-            with path.open(mode='r', newline='', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                try:
-                    header = next(reader)
-                except StopIteration:
-                    print(color(f"Users file '{filePath}' is empty.", "yellow"))
-                    return
-
-                self._users.clear()
-                for i, row in enumerate(reader, start=2):
-                    if not row:
-                        continue
-                    if len(row) != 5:
-                        print(color(f"Warning: Skipping malformed row {i} (wrong number of columns) in '{filePath}'.", "yellow"))
-                        continue
-                    try:
-                        user_id = int(row[0])
-                        if user_id in loaded_ids:
-                            print(color(f"Warning: Duplicate product ID '{user_id}' found in row {i}. Skipping.", "yellow"))
-                            continue
-                        user = User(
-                            user_id=user_id,
-                            name=str(row[1]),
-                            username=str(row[2]),
-                            password=str(row[3]),
-                            role=int(row[4])
-                        )
-                        self._users.append(user)
-                        loaded_ids.add(user_id)
-                    except (ValueError, IndexError) as conversion_error:
-                        print(color(f"Warning: Could not parse row {i} in '{filePath}': {conversion_error}", "yellow"))
-
-            if not self._users and not loaded_ids:
-                print(color(f"User file '{filePath}' has no valid products to load.", "yellow"))
-            else:
-                print(color(f"User loaded successfully from '{filePath}'.", "green"))
-        except Exception as e:
-            print(color(f"Error loading inventory from '{filePath}': {e}", "red"))
+            if not (useSnapshot and self._loadSnapshot(path, report)):
+                users = iter_users(path, report)
+                first = next(users, None)  # Lee la cabecera antes de limpiar
+                if report.empty:
+                    self._events.emit(f"Users file '{filePath}' is empty.", "yellow")
+                    return report
 
+                self._clear()
+                if first is not None:
+                    self._users.append(first)
+                    self._index(first)
+                for user in users:
+                    self._users.append(user)
+                    self._index(user)
+                if useSnapshot:
+                    self._refreshSnapshot(filePath)
+            migrated = self.migratePasswords()
+            if migrated:
+                self.saveCSV(filePath)
+                self._events.emit(f"Hashed {migrated} plain-text passwords in '{filePath}'.", "cyan")
+            if report.skipped:
+                self._events.emit(f"Warning: {report.summary()}.", "yellow")
 
+            if not self._users:
+                self._events.emit(f"User file '{filePath}' has no valid products to load.", "yellow")
+            else:
+                self._events.emit(f"User loaded successfully from '{filePath}'.", "green")
+        except Exception as e:
+            self._events.emit(f"Error loading inventory from '{filePath}': {e}", "red")
+        return report
@@ -1,13 +1,93 @@
 # python
+import sys
 from Utils.Validator import *
-from Services.Inventory import Inventory
+from Services.AuthService import AuthService
+from Services.Inventory import Inventory, PRODUCT_SORTS
 from Services.UserService import UserService
 from Services.SaleService import SaleService
+from Services.SaleStore import SaleStore
+from Services.Repository import Repository, CsvRepository
 from Utils.Decorator import *
 from Models.User import User
 
 
-def manageUsers(user_service: UserService) -> None:
+# Campos de los formularios: cada entrada se valida y convierte en una sola pasada
+NAME = Field("name", "name")
+QUANTITY = Field("quantity", "int", min_value=1)
+PRICE = PRODUCT_SPEC["price"]
+PASSWORD = Field("password", "text", max_len=10_000)
+ROLE = Field("role", "choice", choices=(1, 2))
+# Variantes de actualización: vacío = mantener el valor actual (None)
+NEW_NAME = Field("name", "name", optional=True)
+NEW_QUANTITY = Field("quantity", "int", min_value=1, optional=True)
+NEW_PRICE = Field("price", "decimal", optional=True)
+NEW_PASSWORD = Field("password", "text", max_len=10_000, optional=True)
+NEW_ROLE = Field("role", "choice", choices=(1, 2), optional=True)
+
+
+def ask(prompt: str, field: Field, error: str, error_color: str | None = None):
+    """Pide un valor hasta que field lo acepte y lo devuelve ya convertido."""
+    while True:
+        try:
+            return field.parse(input(prompt).strip())
+        except ValueError:
+            print(color(error, error_color) if error_color else error)
+
+
+def askOrSkip(prompt: str, field: Field, warning: str):
+    """Una sola pregunta: devuelve el valor convertido, o None si está vacío o no es válido."""
+    try:
+        return field.parse(input(prompt).strip())
+    except ValueError:
+        print(color(warning, "yellow"))
+        return None
+
+
+def browsePages(display, sorts: tuple[str, ...], sort: str | None = None) -> None:
+    """
+    Recorre un listado página a página. display(page=, sort=, reverse=) muestra
+    una página y devuelve el total de páginas (displayInventory / displaySales).
+    """
+    page, reverse = 1, False
+    while True:
+        pages = display(page=page, sort=sort, reverse=reverse)
+        if pages <= 1:
+            return
+        opt = input("[n]ext, [p]revious, page number, [s]ort, [r]everse, [q]uit: ").strip().lower()
+        if opt in ("", "n"):
+            if page >= pages:
+                return
+            page += 1
+        elif opt == "p":
+            page = max(page - 1, 1)
+        elif opt.isdigit():
+            page = min(max(int(opt), 1), pages)
+        elif opt == "s":
+            choice = input(f"Sort by ({'/'.join(sorts)}): ").strip().lower()
+            if choice in sorts:
+                sort, page = choice, 1
+            else:
+                print("You have entered an invalid option")
+        elif opt == "r":
+            reverse, page = not reverse, 1
+        elif opt == "q":
+            return
+        else:
+            print("You have entered an invalid option")
+
+
+def askProductChanges(inv: Inventory, product) -> None:
+    """Pide los nuevos datos de product (vacío = mantener) y lo actualiza."""
+    new_name = ask(f"New product name [{product.name}]: ", NEW_NAME, "You have entered an invalid name")
+    new_author = ask(f"New product author [{product.author}]: ", NEW_NAME, "You have entered an invalid author")
+    new_category = ask(f"New product category [{product.category}]: ", NEW_NAME,
+                       "You have entered an invalid category")
+    quantity = ask(f"New Quantity [{product.quantity}]: ", NEW_QUANTITY, "You have entered an invalid quantity")
+    price = ask(f"New Price [{product.price}]: ", NEW_PRICE, "You have entered an invalid price", "red")
+    inv.updateProduct(product.name, new_name, new_author, new_category, quantity, price)
+
+
+def manageUsers(user_service: UserService, repo: Repository) -> None:
     while True:
         try:
             print("\n--- Users Menu ---")
@@ -27,48 +107,22 @@ def manageUsers(user_service: UserService) -> None:
                     user_service.searchUser(query)
                 case "3":
                     print("Add User")
-                    name = ""
-                    while not is_valid_name(name):
-                        name = input("Name: ").strip()
-                        if not is_valid_name(name):
-                            print("You have entered an invalid name")
-                    username = ""
-                    while not is_valid_name(username):
-                        username = input("Username: ").strip()
-                        if not is_valid_name(username):
-                            print("You have entered an invalid username")
-                    password = ""
-                    while not is_non_empty_string(password):
-                        password = input("Password: ").strip()
-                        if not is_non_empty_string(password):
-                            print("You have entered an invalid password")
-                    role_in = ""
-                    while role_in not in ("1", "2"):
-                        role_in = input("Role (1=Admin, 2=Client): ").strip()
-                        if role_in not in ("1", "2"):
-                            print("You have entered an invalid role")
-                    user_service.addUser(name, username, password, int(role_in))
+                    name = ask("Name: ", NAME, "You have entered an invalid name")
+                    username = ask("Username: ", NAME, "You have entered an invalid username")
+                    password = ask("Password: ", PASSWORD, "You have entered an invalid password")
+                    role = ask("Role (1=Admin, 2=Client): ", ROLE, "You have entered an invalid role")
+                    user_service.addUser(name, username, password, role)
                 case "4":
                     print("Update User")
                     current_name = input("Enter current user name to update: ").strip()
-                    new_name_in = input("New name [leave empty to keep]: ").strip()
-                    new_username_in = input("New username [leave empty to keep]: ").strip()
-                    new_password_in = input("New password [leave empty to keep]: ").strip()
-                    role_in = ""
-                    while role_in not in ("", "1", "2"):
-                        role_in = input("New role (1=Admin, 2=Client) [empty to keep]: ").strip()
-                        if role_in not in ("", "1", "2"):
-                            print("You have entered an invalid role")
-                    new_name_val = None if new_name_in == "" else new_name_in if is_valid_name(new_name_in) else None
-                    if new_name_in != "" and new_name_val is None:
-                        print(color("Invalid new name. Skipping name change.", "yellow"))
-                    new_username_val = None if new_username_in == "" else new_username_in if is_valid_name(new_username_in) else None
-                    if new_username_in != "" and new_username_val is None:
-                        print(color("Invalid new username. Skipping username change.", "yellow"))
-                    new_password_val = None if new_password_in == "" else new_password_in if is_non_empty_string(new_password_in) else None
-                    if new_password_in != "" and new_password_val is None:
-                        print(color("Invalid new password. Skipping password change.", "yellow"))
-                    role_val = None if role_in == "" else int(role_in)
+                    new_name_val = askOrSkip("New name [leave empty to keep]: ", NEW_NAME,
+                                             "Invalid new name. Skipping name change.")
+                    new_username_val = askOrSkip("New username [leave empty to keep]: ", NEW_NAME,
+                                                 "Invalid new username. Skipping username change.")
+                    new_password_val = askOrSkip("New password [leave empty to keep]: ", NEW_PASSWORD,
+                                                 "Invalid new password. Skipping password change.")
+                    role_val = ask("New role (1=Admin, 2=Client) [empty to keep]: ", NEW_ROLE,
+                                   "You have entered an invalid role")
                     user_service.updateUser(
                         current_name,
                         new_name=new_name_val,
@@ -77,7 +131,7 @@ def manageUsers(user_service: UserService) -> None:
                         role=role_val
                     )
                 case "5":
-                    user_service.saveCSV("../Archivos/Users.csv")
+                    repo.saveUsers(user_service)
                 case "6":
                     print("Returning to Admin menu...")
                     break
@@ -87,7 +141,7 @@ def manageUsers(user_service: UserService) -> None:
             print("You have entered an invalid number")
 
 
-def menuAdmin(inv: Inventory, user_service: UserService, sale_service: SaleService) -> None:
+def menuAdmin(inv: Inventory, user_service: UserService, sale_service: SaleService, repo: Repository) -> None:
     while True:
         try:
             print("\nMenú:")
@@ -108,73 +162,21 @@ def menuAdmin(inv: Inventory, user_service: UserService, sale_service: SaleServi
                     flag = True
                     while flag:
                         print("Add Product")
-                        name = ""
-                        while not is_valid_name(name):
-                            name = input("Product name: ").strip()
-                            if not is_valid_name(name):
-                                print("You have entered an invalid name")
-                        author = ""
-                        while not is_valid_name(author):
-                            author = input("Product author: ").strip()
-                            if not is_valid_name(author):
-                                print("You have entered an invalid author")
-                        category = ""
-                        while not is_valid_name(category):
-                            category = input("Product category: ").strip()
-                            if not is_valid_name(category):
-                                print("You have entered an invalid category")
-                        quantity = ""
-                        while not is_positive_int_str(quantity):
-                            quantity = input("Quantity: ").strip()
-                            if not is_positive_int_str(quantity):
-                                print("You have entered an invalid quantity")
-                        price = ""
-                        while not is_positive_decimal(price):
-                            price = input("Price: ").strip()
-                            if not is_positive_decimal(price):
-                                print(color("You have entered an invalid price", "red"))
-                        added = inv.addProduct(
-                            name, author, category, int(quantity), float(price.replace(",", "."))
-                        )
+                        name = ask("Product name: ", NAME, "You have entered an invalid name")
+                        author = ask("Product author: ", NAME, "You have entered an invalid author")
+                        category = ask("Product category: ", NAME, "You have entered an invalid category")
+                        quantity = ask("Quantity: ", QUANTITY, "You have entered an invalid quantity")
+                        price = ask("Price: ", PRICE, "You have entered an invalid price", "red")
+                        added = inv.addProduct(name, author, category, quantity, price)
                         if not added:
                             upd = input("Do you want to update the existing item? (y/n): ").strip().lower()
                             if parse_bool(upd) is True:
-                                product = inv.findProductByName(name)
+                                # También si el existente solo cambia en acentos ("Canción" / "Cancion")
+                                product = inv.findEquivalentProduct(name)
                                 if product:
-                                    while True:
-                                        new_name_in = input(f"New product name [{product.name}]: ").strip()
-                                        if new_name_in == "" or is_valid_name(new_name_in):
-                                            break
-                                        print("You have entered an invalid name")
-                                    while True:
-                                        new_author_in = input(f"New product author [{product.author}]: ").strip()
-                                        if new_author_in == "" or is_valid_name(new_author_in):
-                                            break
-                                        print("You have entered an invalid author")
-                                    while True:
-                                        new_category_in = input(f"New product category [{product.category}]: ").strip()
-                                        if new_category_in == "" or is_valid_name(new_category_in):
-                                            break
-                                        print("You have entered an invalid category")
-                                    while True:
-                                        quantity_in = input(f"New Quantity [{product.quantity}]: ").strip()
-                                        if quantity_in == "" or is_positive_int_str(quantity_in):
-                                            break
-                                        print("You have entered an invalid quantity")
-                                    while True:
-                                        price_in = input(f"New Price [{product.price}]: ").strip()
-                                        if price_in == "" or is_valid_decimal(price_in):
-                                            break
-                                        print(color("You have entered an invalid price", "red"))
-                                    new_name_val = None if new_name_in == "" else new_name_in
-                                    new_author_val = None if new_author_in == "" else new_author_in
-                                    new_category_val = None if new_category_in == "" else new_category_in
-                                    quantity_val = None if quantity_in == "" else int(quantity_in)
-                                    price_val = None if price_in == "" else float(price_in.replace(",", "."))
-                                    inv.updateProduct(
-                                        name, new_name_val, new_author_val, new_category_val, quantity_val, price_val
-                                    )
-                        inv.displayInventory()
+                                    askProductChanges(inv, product)
+                        # Página con los últimos productos añadidos
+                        inv.displayInventory(sort="id", reverse=True)
                         cont = ""
                         while parse_bool(cont) not in (True, False):
                             cont = input("Do you want to add another product? (y/n): ").strip().lower()
@@ -189,57 +191,29 @@ def menuAdmin(inv: Inventory, user_service: UserService, sale_service: SaleServi
                     inv.searchProduct(query)
                 case "3":
                     print("Display Inventory")
-                    inv.displayInventory()
+                    browsePages(inv.displayInventory, tuple(PRODUCT_SORTS), sort="id")
                 case "4":
                     print("Update Product")
                     name = input("Enter product name to update: ").strip()
                     product = inv.findProductByName(name)
                     if product:
-                        while True:
-                            new_name_in = input(f"New product name [{product.name}]: ").strip()
-                            if new_name_in == "" or is_valid_name(new_name_in):
-                                break
-                            print("You have entered an invalid name")
-                        while True:
-                            new_author_in = input(f"New product author [{product.author}]: ").strip()
-                            if new_author_in == "" or is_valid_name(new_author_in):
-                                break
-                            print("You have entered an invalid author")
-                        while True:
-                            new_category_in = input(f"New product category [{product.category}]: ").strip()
-                            if new_category_in == "" or is_valid_name(new_category_in):
-                                break
-                            print("You have entered an invalid category")
-                        quantity_in = input(f"New Quantity [{product.quantity}]: ").strip()
-                        while not (quantity_in == "" or is_positive_int_str(quantity_in)):
-                            print("You have entered an invalid quantity")
-                            quantity_in = input(f"New Quantity [{product.quantity}]: ").strip()
-                        price_in = input(f"New Price [{product.price}]: ").strip()
-                        while not (price_in == "" or is_valid_decimal(price_in)):
-                            print(color("You have entered an invalid price", "red"))
-                            price_in = input(f"New Price [{product.price}]: ").strip()
-                        new_name_val = None if new_name_in == "" else new_name_in
-                        new_author_val = None if new_author_in == "" else new_author_in
-                        new_category_val = None if new_category_in == "" else new_category_in
-                        quantity_val = None if quantity_in == "" else int(quantity_in)
-                        price_val = None if price_in == "" else float(price_in.replace(",", "."))
-                        inv.updateProduct(name, new_name_val, new_author_val, new_category_val, quantity_val, price_val)
+                        askProductChanges(inv, product)
                     else:
                         print(color("Product not found.", "red"))
                 case "5":
                     print("Save Inventory CSV")
-                    inv.saveCSV("../Archivos/Inventario.csv")
+                    repo.saveInventory(inv)
                 case "6":
                     inv.displayStatistics()
                 case "7":
-                    manageUsers(user_service)
+                    manageUsers(user_service, repo)
                 case "8":
                     print("Display Sales")
-                    sale_service.displaySales()
-                    sale_service.displayStatistics()
+                    browsePages(sale_service.displaySales, SaleStore.SORTS)
+                    sale_service.displayStatistics(repo.salesStatistics(sale_service))
                 case "9":
                     print("Save Sales CSV")
-                    sale_service.saveCSV("../Archivos/Sales.csv")
+                    repo.saveSales(sale_service)
                 case "10":
                     print("Exiting...")
                     break
@@ -249,7 +223,7 @@ def menuAdmin(inv: Inventory, user_service: UserService, sale_service: SaleServi
             print("You have entered an invalid number")
 
 
-def menuClient(inv: Inventory, sale_service: SaleService, current_user: User) -> None:
+def menuClient(inv: Inventory, sale_service: SaleService, current_user: User, repo: Repository) -> None:
     while True:
         try:
             print("\nMenú:")
@@ -266,26 +240,10 @@ def menuClient(inv: Inventory, sale_service: SaleService, current_user: User) ->
                     if not product:
                         print(color("Product not found.", "red"))
                         continue
-                    qty = ""
-                    while not is_positive_int_str(qty):
-                        qty = input(f"Quantity (available {product.quantity}): ").strip()
-                        if not is_positive_int_str(qty):
-                            print("You have entered an invalid quantity")
-                    qty_i = int(qty)
-                    if qty_i > product.quantity:
-                        print(color("Insufficient stock.", "red"))
+                    qty_i = ask(f"Quantity (available {product.quantity}): ", QUANTITY,
+                                "You have entered an invalid quantity")
+                    if repo.purchase(inv, sale_service, current_user, product.name, qty_i) is None:
                         continue
-                    product.quantity = product.quantity - qty_i
-                    sale_service.addSale(
-                        username=current_user.username,
-                        product=product.name,
-                        quantity=qty_i,
-                        price=product.price,
-                        role=int(current_user.role)
-                    )
-                    sale_service.saveCSV("../Archivos/Sales.csv", append=False)
-                    inv.saveCSV("../Archivos/Inventario.csv")
-                    inv.loadCSV("../Archivos/Inventario.csv")
                     print(color(f"Purchase successful. Total: ${product.price * qty_i:.2f}", "green"))
                 case "2":
                     print("Search Product")
@@ -300,34 +258,35 @@ def menuClient(inv: Inventory, sale_service: SaleService, current_user: User) ->
             print("You have entered an invalid number")
 
 
-def login(user_service: UserService):
+def login(auth: AuthService):
     max_tries = 3
     for attempt in range(1, max_tries + 1):
         username = input("Username: ").strip()
         password = input("Password: ").strip()
-        for u in user_service._users:
-            if u.username == username and u.password == password:
-                print(color("Login Successful", "green"))
-                return u
+        session = auth.login(username, password)
+        if session is not None:
+            print(color("Login Successful", "green"))
+            return session[0]
         print(color(f"Invalid credentials. Attempt {attempt}/{max_tries}", "red"))
     print(color("Too many attempts. Bye.", "red"))
     return None
 
 
-def main() -> None:
+def main(repo: Repository | None = None) -> None:
     inv = Inventory()
     user_service = UserService()
-    sale_service = SaleService()
+    sale_service = SaleService(categoryOf=inv.categoryOf, productIdOf=inv.productIdOf)
 
-    filePathInventory = "../Archivos/Inventario.csv"
-    filePathUser = "../Archivos/Users.csv"
-    filePathSales = "../Archivos/Sales.csv"
+    # Por defecto los CSV de Archivos/; se puede pasar otro repositorio (p. ej. SQLite)
+    if repo is None:
+        repo = CsvRepository("../Archivos")
+    repo.loadInventory(inv)
+    repo.loadUsers(user_service)
+    repo.loadSales(sale_service)
 
-    inv.loadCSV(filePathInventory)
-    user_service.loadCSV(filePathUser)
-    sale_service.loadCSV(filePathSales)
-
-    u = login(user_service)
+    # Los hashes con otro coste que el de AuthService se rehacen al iniciar sesión
+    auth = AuthService(user_service, onUpgrade=lambda user: repo.saveUsers(user_service))
+    u = login(auth)
     if not u:
         return
 
@@ -337,12 +296,16 @@ def main() -> None:
         role = 0
 
     if role == 1:
-        menuAdmin(inv, user_service, sale_service)
+        menuAdmin(inv, user_service, sale_service, repo)
     elif role == 2:
-        menuClient(inv, sale_service, u)
+        menuClient(inv, sale_service, u, repo)
     else:
         print(color("User role not recognized.", "red"))
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        from Services.SqliteRepository import SqliteRepository
+        main(SqliteRepository(sys.argv[1]))
+    else:
+        main()
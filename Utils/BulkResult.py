@@ -0,0 +1,49 @@
+"""
+Archivo: `BulkResult.py`
+
+Resultado estructurado de las altas en bloque (Inventory.addProducts,
+SaleService.addSales): una entrada por fila en lugar de un print por fila.
+"""
+
+from typing import NamedTuple, Optional
+
+
+class RowResult(NamedTuple):
+    index: int            # posición de la fila en la entrada (desde 0)
+    id: Optional[int]     # ID asignado, o None si la fila se rechazó
+    error: Optional[str]  # motivo del rechazo
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BulkResult:
+    def __init__(self):
+        self.rows: list[RowResult] = []
+        self.added = 0
+        self.failed = 0
+
+    def accept(self, index: int, new_id: int) -> None:
+        self.rows.append(RowResult(index, new_id, None))
+        self.added += 1
+
+    def reject(self, index: int, message: str) -> None:
+        self.rows.append(RowResult(index, None, message))
+        self.failed += 1
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0
+
+    @property
+    def ids(self) -> list[int]:
+        """IDs asignados, en el orden de la entrada."""
+        return [r.id for r in self.rows if r.error is None]
+
+    @property
+    def errors(self) -> list[RowResult]:
+        return [r for r in self.rows if r.error is not None]
+
+    def summary(self) -> str:
+        return f"{self.added} rows added, {self.failed} rejected"
@@ -0,0 +1,101 @@
+"""
+Archivo: `CsvStream.py`
+
+Lectura de CSV en streaming (memoria acotada):
+- LoadReport: resumen estructurado de filas cargadas, omitidas y errores
+- iter_csv: genera registros ya parseados fila a fila, sin materializar la lista
+"""
+
+import csv
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LoadReport:
+    """Acumula el resultado de una carga en lugar de imprimir por fila."""
+
+    def __init__(self, path, max_errors: int = 100):
+        self.path = str(path)
+        self.loaded = 0
+        self.skipped = 0
+        self.duplicates = 0
+        self.empty = False
+        self.max_errors = max_errors
+        self.errors: list[tuple[int, str]] = []  # (número de fila, mensaje)
+
+    def error(self, row: int, message: str, duplicate: bool = False) -> None:
+        self.skipped += 1
+        if duplicate:
+            self.duplicates += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((row, message))
+
+    @property
+    def ok(self) -> bool:
+        return self.skipped == 0
+
+    def summary(self) -> str:
+        text = f"{self.loaded} rows loaded, {self.skipped} skipped"
+        if self.duplicates:
+            text += f" ({self.duplicates} duplicate IDs)"
+        return f"{text} from '{self.path}'"
+
+
+def iter_csv(path: Path,
+             parse: Callable[[list[str]], T],
+             report: LoadReport,
+             columns: Optional[int] = None,
+             min_columns: Optional[int] = None,
+             key: Optional[Callable[[list[str]], int]] = None,
+             seen: Optional[set] = None,
+             header: bool = True,
+             record_key: Optional[Callable[[T], int]] = None) -> Iterator[T]:
+    """
+    Recorre path y produce parse(row) para cada fila válida.
+    - columns / min_columns: número exacto / mínimo de columnas
+    - key(row) + seen: descarta IDs repetidos (seen puede compartirse entre archivos)
+    - record_key(registro): como key, pero toma el ID ya convertido por parse
+    - header: si la primera fila es cabecera
+    Los errores de conversión (ValueError/IndexError) se anotan en report.
+    """
+    if (key is not None or record_key is not None) and seen is None:
+        seen = set()
+    with Path(path).open(mode='r', newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        start = 1
+        if header:
+            try:
+                next(reader)
+            except StopIteration:
+                report.empty = True
+                return
+            start = 2
+        for i, row in enumerate(reader, start=start):
+            if not row:
+                continue
+            if columns is not None and len(row) != columns:
+                report.error(i, "wrong number of columns")
+                continue
+            if min_columns is not None and len(row) < min_columns:
+                report.error(i, "too few columns")
+                continue
+            try:
+                record_id = key(row) if key is not None else None
+                if record_id is not None and record_id in seen:
+                    report.error(i, f"duplicate ID '{record_id}'", duplicate=True)
+                    continue
+                record = parse(row)
+            except (ValueError, IndexError) as conversion_error:
+                report.error(i, f"could not parse row: {conversion_error}")
+                continue
+            if record_key is not None:
+                record_id = record_key(record)
+                if record_id in seen:
+                    report.error(i, f"duplicate ID '{record_id}'", duplicate=True)
+                    continue
+            if record_id is not None:
+                seen.add(record_id)
+            report.loaded += 1
+            yield record
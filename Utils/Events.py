@@ -0,0 +1,114 @@
+"""
+Archivo: `Events.py`
+
+Destinos (sinks) para los mensajes de los servicios, en lugar de print + color:
+- NullSink: descarta todo (modo headless / cargas en bloque, coste cero)
+- ConsoleSink: imprime con color como hasta ahora (menú de consola)
+- BufferedSink: encola los mensajes y un hilo los escribe por lotes
+
+Los servicios llaman a sink.emit(mensaje, color); si un mensaje es caro de
+construir se comprueba antes sink.enabled para no formatearlo en vano.
+"""
+
+import queue
+import sys
+import threading
+from typing import Optional, TextIO
+
+from Utils.Decorator import color as paint
+
+
+class EventSink:
+    # False si emit no hace nada: permite saltarse el formateo del mensaje
+    enabled = True
+
+    def emit(self, message: str, color: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class NullSink(EventSink):
+    enabled = False
+
+    def emit(self, message: str, color: Optional[str] = None) -> None:
+        pass
+
+
+class ConsoleSink(EventSink):
+    def __init__(self, stream: Optional[TextIO] = None, colored: bool = True):
+        self._stream = stream
+        self._colored = colored
+
+    def emit(self, message: str, color: Optional[str] = None) -> None:
+        if color is not None and self._colored:
+            message = paint(message, color)
+        # sys.stdout se resuelve en cada llamada por si se redirige
+        print(message, file=self._stream or sys.stdout)
+
+
+class BufferedSink(EventSink):
+    """
+    emit solo encola el mensaje; un hilo de fondo escribe todo lo acumulado
+    de una vez, así un terminal o archivo lento no frena al servicio.
+    Si la cola se llena (maxsize) los mensajes nuevos se descartan y se cuentan.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, colored: bool = False, maxsize: int = 100000):
+        self._stream = stream if stream is not None else sys.stderr
+        self._colored = colored
+        self._maxsize = maxsize
+        # SimpleQueue: put sin locks de Python, lo más barato para el hilo que emite
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="event-sink", daemon=True)
+        self._thread.start()
+
+    def emit(self, message: str, color: Optional[str] = None) -> None:
+        if self._queue.qsize() >= self._maxsize:
+            self.dropped += 1
+            return
+        self._queue.put((message, color))
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            lines = []
+            markers = []
+            for message, color in batch:
+                if isinstance(message, threading.Event):
+                    markers.append(message)
+                elif message is not None:
+                    lines.append(paint(message, color) if color is not None and self._colored else message)
+            if lines:
+                self._stream.write("\n".join(lines) + "\n")
+                self._stream.flush()
+            for marker in markers:
+                marker.set()
+            if any(message is None for message, _ in batch):
+                return
+
+    def flush(self) -> None:
+        """Espera a que todo lo encolado hasta ahora esté escrito."""
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put((done, None))
+            done.wait()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put((None, None))
+            self._thread.join()
+
+
+# Sink por defecto de los servicios: mismo comportamiento que el print + color original
+console = ConsoleSink()
@@ -0,0 +1,45 @@
+"""
+Archivo: `IdAllocator.py`
+
+Generador de IDs incrementales en O(1) y seguro entre hilos.
+Reemplaza los recorridos con max() sobre las colecciones.
+"""
+
+import threading
+
+
+class IdAllocator:
+    def __init__(self, start: int = 1):
+        self._next = start
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        """Devuelve el siguiente ID libre y avanza el contador."""
+        with self._lock:
+            value = self._next
+            self._next += 1
+            return value
+
+    def reserve(self, count: int) -> int:
+        """Reserva count IDs consecutivos de una vez y devuelve el primero."""
+        with self._lock:
+            value = self._next
+            self._next += count
+            return value
+
+    def observe(self, value: int) -> None:
+        """Registra un ID ya usado para no volver a entregarlo."""
+        if value < self._next:
+            return  # caso habitual al cargar: ya cubierto, sin tomar el lock
+        with self._lock:
+            if value >= self._next:
+                self._next = value + 1
+
+    def reset(self, start: int = 1) -> None:
+        """Reinicia el contador (por ejemplo antes de un loadCSV)."""
+        with self._lock:
+            self._next = start
+
+    def peek(self) -> int:
+        """Devuelve el próximo ID sin consumirlo."""
+        return self._next
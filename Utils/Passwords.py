@@ -0,0 +1,91 @@
+"""
+Archivo: `Passwords.py`
+
+Hash de contraseñas con sal para Users.csv / la tabla users:
+- hash_password: "pbkdf2_sha256$iteraciones$sal$hash" o "scrypt$n$r$p$sal$hash"
+- hash_passwords: varios hashes a la vez en hilos (hashlib suelta el GIL)
+- verify_password: comprobación en tiempo constante (también de contraseñas
+  antiguas en texto plano, que se reconocen por no tener prefijo; UserService
+  las migra a hash al cargar o guardar Users.csv)
+- needs_rehash: True si el valor guardado es texto plano o usa otro coste
+El coste es configurable: más iteraciones (o n mayor) = login más lento y
+ataques de fuerza bruta más caros.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+PBKDF2_ITERATIONS = 200_000
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1
+_SALT_BYTES = 16
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def hash_password(password: str, algorithm: str = "pbkdf2", iterations: int = PBKDF2_ITERATIONS,
+                  n: int = SCRYPT_N, r: int = SCRYPT_R, p: int = SCRYPT_P) -> str:
+    """Devuelve el hash con sal de password listo para guardar."""
+    salt = os.urandom(_SALT_BYTES)
+    if algorithm == "scrypt":
+        digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                                maxmem=128 * n * r * 2)
+        return f"scrypt${n}${r}${p}${_b64(salt)}${_b64(digest)}"
+    if algorithm == "pbkdf2":
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+        return f"pbkdf2_sha256${iterations}${_b64(salt)}${_b64(digest)}"
+    raise ValueError(f"Unknown password algorithm '{algorithm}'.")
+
+
+def hash_passwords(passwords: list[str], workers: int | None = None, **options) -> list[str]:
+    """
+    hash_password de cada contraseña, en paralelo; mismo orden que passwords.
+    options (algorithm, iterations, n...) se pasan a hash_password.
+    """
+    hasher = partial(hash_password, **options)
+    if len(passwords) < 2:
+        return [hasher(p) for p in passwords]
+    workers = min(workers or os.cpu_count() or 1, len(passwords))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(hasher, passwords))
+
+
+def is_hashed(stored: str) -> bool:
+    return stored.startswith(("pbkdf2_sha256$", "scrypt$"))
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """True si password corresponde al valor guardado (hash o texto plano antiguo)."""
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    parts = stored.split("$")
+    try:
+        if parts[0] == "scrypt":
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            salt, expected = base64.b64decode(parts[4]), base64.b64decode(parts[5])
+            digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                                    maxmem=128 * n * r * 2, dklen=len(expected))
+        else:
+            iterations = int(parts[1])
+            salt, expected = base64.b64decode(parts[2]), base64.b64decode(parts[3])
+            digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations,
+                                         dklen=len(expected))
+    except (IndexError, ValueError):
+        return False
+    return hmac.compare_digest(digest, expected)
+
+
+def needs_rehash(stored: str, algorithm: str = "pbkdf2", iterations: int = PBKDF2_ITERATIONS,
+                 n: int = SCRYPT_N) -> bool:
+    """True si stored es texto plano o no usa el algoritmo/coste actual."""
+    if not is_hashed(stored):
+        return True
+    parts = stored.split("$")
+    if algorithm == "scrypt":
+        return parts[0] != "scrypt" or parts[1] != str(n)
+    return parts[0] != "pbkdf2_sha256" or parts[1] != str(iterations)
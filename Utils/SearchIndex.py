@@ -0,0 +1,178 @@
+"""
+Archivo: `SearchIndex.py`
+
+Índice invertido de n-gramas para búsquedas por subcadena:
+- fold: normaliza texto (minúsculas + sin acentos)
+- SearchIndex: add / remove / search con ranking y límite; extend para
+  altas masivas, que se indexan en la primera consulta
+"""
+
+import heapq
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Iterable
+
+
+def fold(text: str) -> str:
+    """Devuelve text en minúsculas y sin acentos ("Años" -> "anos")."""
+    if text.isascii():
+        # Sin acentos que quitar: basta con casefold
+        return text.casefold()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+@lru_cache(maxsize=8192)
+def _ngrams(text: str, n: int) -> frozenset[str]:
+    # Autores y categorías se repiten mucho entre productos: se cachean sus n-gramas
+    return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+class SearchIndex:
+    """
+    Cada documento es un ID con varios campos de texto (p. ej. name, author, category).
+    Las consultas de n o más caracteres solo verifican los documentos que contienen
+    todos sus n-gramas; las más cortas recorren los textos ya normalizados.
+    """
+
+    def __init__(self, weights: tuple[int, ...] = (3, 2, 1), n: int = 3):
+        self._weights = weights
+        self._n = n
+        self._docs: dict[int, tuple[str, ...]] = {}
+        self._grams: dict[str, set[int]] = {}
+        # Documentos de extend aún sin indexar; _lock solo protege su construcción
+        self._pending: list[tuple] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        self._build()
+        return len(self._docs)
+
+    def _ngrams(self, text: str) -> frozenset[str]:
+        return _ngrams(text, self._n)
+
+    def extend(self, docs: Iterable[tuple]) -> None:
+        """
+        Alta masiva de tuplas (doc_id, *campos), p. ej. al cargar un catálogo:
+        se guardan tal cual y se indexan juntas en la primera consulta.
+        """
+        with self._lock:
+            self._pending.extend(docs)
+
+    def _build(self) -> None:
+        if not self._pending:
+            return
+        with self._lock:
+            if not self._pending:
+                return  # otro hilo acaba de construirlo
+            # Autores y categorías se repiten mucho: cada texto distinto se normaliza
+            # y se parte en n-gramas una sola vez para todos sus documentos
+            folded_of: dict[str, str] = {}
+            docs_of: dict[str, list[int]] = {}
+            for doc_id, *fields in self._pending:
+                if doc_id in self._docs:
+                    self._remove(doc_id)
+                folded = []
+                for field in fields:
+                    text = folded_of.get(field)
+                    if text is None:
+                        text = folded_of[field] = fold(field)
+                    folded.append(text)
+                    docs_of.setdefault(text, []).append(doc_id)
+                self._docs[doc_id] = tuple(folded)
+            n = self._n
+            grams = self._grams
+            for text, ids in docs_of.items():
+                # Sin la caché de _ngrams: casi todos los textos (nombres) aparecen una vez
+                for gram in {text[i:i + n] for i in range(len(text) - n + 1)}:
+                    postings = grams.get(gram)
+                    if postings is None:
+                        grams[gram] = set(ids)
+                    elif len(ids) == 1:
+                        postings.add(ids[0])
+                    else:
+                        postings.update(ids)
+            # Se vacía al final: mientras tanto las consultas esperan al lock
+            self._pending = []
+
+    def add(self, doc_id: int, *fields: str) -> None:
+        """Indexa (o reindexa) el documento doc_id con los campos dados."""
+        self._build()
+        if doc_id in self._docs:
+            self._remove(doc_id)
+        folded = tuple(fold(f) for f in fields)
+        self._docs[doc_id] = folded
+        for text in folded:
+            for gram in self._ngrams(text):
+                self._grams.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        self._build()
+        self._remove(doc_id)
+
+    def _remove(self, doc_id: int) -> None:
+        folded = self._docs.pop(doc_id, None)
+        if folded is None:
+            return
+        for text in folded:
+            for gram in self._ngrams(text):
+                postings = self._grams.get(gram)
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._grams[gram]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending = []
+        self._docs.clear()
+        self._grams.clear()
+
+    def _candidates(self, q: str):
+        if len(q) < self._n:
+            return self._docs.keys()
+        postings = []
+        for gram in self._ngrams(q):
+            p = self._grams.get(gram)
+            if not p:
+                return ()
+            postings.append(p)
+        postings.sort(key=len)
+        result = set(postings[0])
+        for p in postings[1:]:
+            result &= p
+            if not result:
+                break
+        return result
+
+    def _score(self, q: str, folded: tuple[str, ...]) -> int:
+        score = 0
+        for weight, text in zip(self._weights, folded):
+            if text == q:
+                score += weight * 4
+            elif text.startswith(q):
+                score += weight * 2
+            elif q in text:
+                score += weight
+        return score
+
+    def search(self, query: str, limit: int | None = None) -> list[int]:
+        """
+        Devuelve los IDs cuyos campos contienen query (sin distinguir mayúsculas
+        ni acentos), ordenados por relevancia y luego por ID.
+        """
+        q = fold(query.strip())
+        if not q:
+            return []
+        self._build()
+        scored = []
+        for doc_id in self._candidates(q):
+            score = self._score(q, self._docs[doc_id])
+            if score:
+                scored.append((-score, doc_id))
+        if limit is not None:
+            scored = heapq.nsmallest(limit, scored)
+        else:
+            scored.sort()
+        return [doc_id for _, doc_id in scored]
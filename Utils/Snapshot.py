@@ -0,0 +1,134 @@
+"""
+Archivo: `Snapshot.py`
+
+Formato binario versionado para arrancar sin parsear CSV:
+
+    cabecera   <4sHHQQ>  magic, versión, tipo, nº registros, nº strings
+    offsets    (nº strings + 1) x uint64 dentro del bloque de texto
+    texto      strings UTF-8 concatenados (tabla de strings sin repetidos)
+    registros  structs de ancho fijo; los campos str son índices en la tabla
+
+El archivo se lee con mmap y struct.iter_unpack, sin conversiones de texto
+a número. Un snapshot más viejo que su CSV, o escrito con otra versión del
+esquema (p. ej. antes de añadir una columna), se considera inválido.
+"""
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+SNAPSHOT_MAGIC = b"PPSN"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<4sHHQQ")
+
+
+class SnapshotSchema:
+    """
+    Describe un tipo de registro: struct de campos y cuáles son strings.
+    version se sube al cambiar los campos para que los snapshots viejos no se lean.
+    """
+
+    def __init__(self, kind: int, fmt: str, string_fields: tuple[int, ...], version: int = SNAPSHOT_VERSION):
+        self.kind = kind
+        self.version = version
+        self.record = struct.Struct("<" + fmt)
+        self.string_fields = string_fields
+
+
+def snapshot_path(csv_path) -> Path:
+    return Path(csv_path).with_suffix(".snap")
+
+
+def is_fresh(snap: Path, csv_path: Path) -> bool:
+    """True si snap existe y no es más antiguo que csv_path."""
+    try:
+        return snap.stat().st_mtime_ns >= Path(csv_path).stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def write_snapshot(path: Path, schema: SnapshotSchema, rows: Iterable[tuple]) -> int:
+    """Escribe rows (tuplas con los valores de cada campo) de forma atómica."""
+    strings: dict[str, int] = {}
+    packed = bytearray()
+    count = 0
+    for row in rows:
+        values = list(row)
+        for f in schema.string_fields:
+            values[f] = strings.setdefault(values[f], len(strings))
+        packed += schema.record.pack(*values)
+        count += 1
+    blob = bytearray()
+    offsets = [0]
+    for s in strings:  # los dict conservan el orden de inserción = índice
+        blob += s.encode("utf-8")
+        offsets.append(len(blob))
+
+    tmp = Path(path).with_suffix(".snaptmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, schema.version, schema.kind, count, len(strings)))
+            f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            f.write(blob)
+            f.write(packed)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return count
+
+
+def read_snapshot(path: Path, schema: SnapshotSchema) -> Optional[Iterator[tuple]]:
+    """
+    Devuelve un iterador de tuplas (con los strings ya resueltos) o None si el
+    archivo no existe, no se puede leer, está truncado o su versión/tipo no
+    coinciden. Todo se comprueba antes de devolver el iterador: quien lo recorra
+    no se encuentra un error a medias y puede volver al CSV sin más.
+    """
+    try:
+        f = Path(path).open("rb")
+    except OSError:
+        return None
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _HEADER.size:
+            return None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, version, kind, count, nstrings = _HEADER.unpack_from(mm, 0)
+        if magic != SNAPSHOT_MAGIC or version != schema.version or kind != schema.kind:
+            raise ValueError("other schema")
+        pos = _HEADER.size
+        offsets = struct.unpack_from(f"<{nstrings + 1}Q", mm, pos)
+        pos += 8 * (nstrings + 1)
+        if pos + offsets[-1] + count * schema.record.size != size:
+            raise ValueError("truncated")
+        text = mm[pos:pos + offsets[-1]]
+        strings = [text[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+    except (ValueError, struct.error):  # UnicodeDecodeError es un ValueError
+        mm.close()
+        return None
+    return _records(mm, schema, strings, pos + offsets[-1], count)
+
+
+def _records(mm: mmap.mmap, schema: SnapshotSchema, strings: list[str], pos: int, count: int) -> Iterator[tuple]:
+    try:
+        end = pos + count * schema.record.size
+        string_fields = schema.string_fields
+        view = memoryview(mm)[pos:end]
+        try:
+            for values in schema.record.iter_unpack(view):
+                if string_fields:
+                    values = list(values)
+                    for f in string_fields:
+                        values[f] = strings[values[f]]
+                    values = tuple(values)
+                yield values
+        finally:
+            view.release()
+    finally:
+        mm.close()
@@ -0,0 +1,128 @@
+"""
+Archivo: `SortedIndex.py`
+
+Orden mantenido (clave, id) para listar por páginas sin ordenar en cada consulta:
+- add / update / remove en O(log N) búsqueda + desplazamiento de la lista
+- page(offset, limit) y after(cursor, limit) devuelven solo los IDs de la página
+Las altas masivas (cargas) no se insertan una a una: se marcan como pendientes
+y la lista se ordena una sola vez en la siguiente consulta; con extend ni
+siquiera se calculan las claves hasta entonces.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Hashable, Iterable
+
+
+class SortedIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: dict[Hashable, Any] = {}
+        self._items: list[tuple[Any, Hashable]] = []
+        # True si _items no refleja _keys y hay que reordenar antes de consultar
+        self._stale = False
+        # Iterables de extend aún sin recorrer
+        self._pending: list[Iterable[tuple[Hashable, Any]]] = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._resolve()
+            return len(self._keys)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        with self._lock:
+            self._resolve()
+            return item_id in self._keys
+
+    def key(self, item_id: Hashable) -> Any:
+        with self._lock:
+            self._resolve()
+            return self._keys.get(item_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+            self._items.clear()
+            self._pending.clear()
+            self._stale = False
+
+    def _resolve(self) -> None:
+        # Con el lock tomado: recorre los extend pendientes
+        if self._pending:
+            for items in self._pending:
+                self._keys.update(items)
+            self._pending.clear()
+            self._stale = True
+
+    def add(self, item_id: Hashable, key: Any, bulk: bool = False) -> None:
+        """Añade o actualiza item_id; bulk=True aplaza la ordenación a la siguiente consulta."""
+        with self._lock:
+            self._resolve()
+            old = self._keys.get(item_id)
+            if old is not None:
+                if old == key:
+                    return
+                if not self._stale:
+                    self._discard(old, item_id)
+            self._keys[item_id] = key
+            if self._stale:
+                return
+            if bulk:
+                self._stale = True
+            elif not self._items or self._items[-1] <= (key, item_id):
+                self._items.append((key, item_id))  # caso habitual: IDs crecientes
+            else:
+                insort(self._items, (key, item_id))
+
+    update = add
+
+    def extend(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        """
+        Añade o actualiza pares (id, clave) de una vez. items no se recorre
+        hasta la siguiente operación (un generador calcula las claves entonces).
+        """
+        with self._lock:
+            self._pending.append(items)
+
+    def remove(self, item_id: Hashable) -> None:
+        with self._lock:
+            self._resolve()
+            old = self._keys.pop(item_id, None)
+            if old is not None and not self._stale:
+                self._discard(old, item_id)
+
+    def _discard(self, key: Any, item_id: Hashable) -> None:
+        i = bisect_left(self._items, (key, item_id))
+        if i < len(self._items) and self._items[i] == (key, item_id):
+            del self._items[i]
+
+    def _sorted(self) -> list[tuple[Any, Hashable]]:
+        self._resolve()
+        if self._stale:
+            self._items = sorted((k, i) for i, k in self._keys.items())
+            self._stale = False
+        return self._items
+
+    def page(self, offset: int = 0, limit: int = 20, reverse: bool = False) -> list[Hashable]:
+        """IDs de las posiciones [offset, offset + limit) en orden ascendente (o descendente)."""
+        with self._lock:
+            items = self._sorted()
+            n = len(items)
+            if reverse:
+                stop = max(n - offset, 0)
+                start = max(stop - limit, 0)
+                return [i for _, i in reversed(items[start:stop])]
+            return [i for _, i in items[offset:offset + limit]]
+
+    def after(self, cursor: Hashable, limit: int = 20, reverse: bool = False) -> list[Hashable]:
+        """IDs que siguen a cursor (un ID ya listado) en el orden; paginación por cursor."""
+        with self._lock:
+            items = self._sorted()
+            key = self._keys.get(cursor)
+            if key is None:
+                return []
+            if reverse:
+                stop = bisect_left(items, (key, cursor))
+                return [i for _, i in reversed(items[max(stop - limit, 0):stop])]
+            start = bisect_right(items, (key, cursor))
+            return [i for _, i in items[start:start + limit]]
@@ -6,13 +6,24 @@ Funciones de validación y parseo para usar en el proyecto:
 - is_valid_name
 - is_positive_int_str / parse_positive_int
 - is_positive_decimal_str / parse_positive_decimal
+- normalize_name / NameSet: nombres normalizados (casefold + sin acentos)
+  para comprobar unicidad y deduplicar lotes en O(1) por nombre
 - is_unique_name
 - format_decimal
 - parse_bool
+- Field / RecordSpec: esquema compilado que valida y parsea filas enteras
+  (una a una o en lote); PRODUCT_SPEC, SALE_SPEC y USER_SPEC para altas y CSV
 """
 
+import math
 import re
-from typing import Iterable, Optional
+import threading
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from Utils.SearchIndex import fold
+
 
 def is_non_empty_string(value: Optional[str]) -> bool:
     """True si value es un string no vacío después de strip()."""
@@ -127,15 +138,126 @@ def parse_positive_decimal(value: str) -> float:
     return f
 
 
-def is_unique_name(name: str, container: Iterable[str]) -> bool:
+def normalize_name(name: Optional[str]) -> str:
+    """Clave de comparación de un nombre: sin espacios extremos, casefold y sin acentos."""
+    return fold(clean_string(name))
+
+
+class NameSet:
     """
-    Comprueba si name no está en container (case-insensitive).
-    container puede ser keys de un dict o lista de nombres.
+    Conjunto de nombres normalizados (normalize_name): "Canción" y " cancion"
+    cuentan como el mismo nombre. Se construye una vez a partir de un
+    contenedor y se mantiene con add / discard / rename; cada comprobación es O(1).
+    Guarda los nombres tal como se añadieron (find devuelve uno equivalente),
+    así quitar uno de dos nombres equivalentes no libera la clave.
     """
-    if not is_non_empty_string(name):
+
+    def __init__(self, names: Iterable[str] = ()):
+        # Clave -> nombre original, o lista de nombres si hay varios equivalentes
+        self._names: dict[str, str | list[str]] = {}
+        # Nombres de update(lazy=True) aún sin normalizar; _lock solo protege su resolución
+        self._pending: list[str] = []
+        self._lock = threading.Lock()
+        self.update(names)
+
+    def __len__(self) -> int:
+        self._resolve()
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        self._resolve()
+        return normalize_name(name) in self._names
+
+    def _resolve(self) -> None:
+        if not self._pending:
+            return
+        with self._lock:
+            if self._pending:
+                for name in self._pending:
+                    self._add(name)
+                self._pending = []
+
+    def add(self, name: str) -> bool:
+        """Añade name; True si su clave no estaba."""
+        self._resolve()
+        return self._add(name)
+
+    def _add(self, name: str) -> bool:
+        key = normalize_name(name)
+        stored = self._names.get(key)
+        if stored is None:
+            self._names[key] = name
+            return True
+        if isinstance(stored, list):
+            stored.append(name)
+        else:
+            self._names[key] = [stored, name]
         return False
-    name_norm = clean_string(name).lower()
-    return all(name_norm != clean_string(c).lower() for c in container)
+
+    def update(self, names: Iterable[str], lazy: bool = False) -> None:
+        """Añade names; con lazy=True (cargas) se normalizan en la primera consulta."""
+        if lazy:
+            with self._lock:
+                self._pending.extend(names)
+            return
+        for name in names:
+            self.add(name)
+
+    def discard(self, name: str) -> None:
+        self._resolve()
+        key = normalize_name(name)
+        stored = self._names.get(key)
+        if stored is None:
+            return
+        if not isinstance(stored, list):
+            del self._names[key]
+            return
+        if name in stored:
+            stored.remove(name)
+        else:
+            stored.pop()
+        if len(stored) == 1:
+            self._names[key] = stored[0]
+
+    def rename(self, old: str, new: str) -> None:
+        self.discard(old)
+        self.add(new)
+
+    def find(self, name: str) -> Optional[str]:
+        """Un nombre ya añadido equivalente a name (p. ej. "Canción" para "cancion"), o None."""
+        self._resolve()
+        stored = self._names.get(normalize_name(name))
+        return stored[0] if isinstance(stored, list) else stored
+
+    def is_unique(self, name: str) -> bool:
+        """True si name no está vacío y no hay ningún nombre equivalente."""
+        self._resolve()
+        return is_non_empty_string(name) and normalize_name(name) not in self._names
+
+    def claim(self, name: str) -> bool:
+        """Añade name solo si es único; False si está vacío o ya había uno equivalente."""
+        if not self.is_unique(name):
+            return False
+        self._names[normalize_name(name)] = name
+        return True
+
+    def dedup(self, names: Iterable[str]) -> tuple[list[str], list[str]]:
+        """Separa names en (nuevos, repetidos) frente al conjunto y al propio lote; añade los nuevos."""
+        fresh: list[str] = []
+        repeated: list[str] = []
+        for name in names:
+            (fresh if self.claim(name) else repeated).append(name)
+        return fresh, repeated
+
+
+def is_unique_name(name: str, container: Iterable[str]) -> bool:
+    """
+    Comprueba si name no está en container (sin distinguir mayúsculas ni acentos).
+    container puede ser un NameSet (O(1)), keys de un dict o lista de nombres;
+    para comprobar muchos nombres conviene construir el NameSet una sola vez.
+    """
+    names = container if isinstance(container, NameSet) else NameSet(container)
+    return names.is_unique(name)
 
 
 def format_decimal(value: float, decimals: int = 2, decimal_sep: str = ",") -> str:
@@ -167,3 +289,336 @@ def parse_bool(value: str) -> Optional[bool]:
     return None
 
 
+
+
+
+_INT_RE = re.compile(r"^[+-]?\d+$")
+
+
+class Field:
+    """
+    Campo de un RecordSpec. kind:
+    - "name": como is_valid_name (min_len / max_len)
+    - "text": cualquier texto no vacío tras strip()
+    - "int" / "decimal": números o strings (el decimal acepta ',' o '.'),
+      con min_value (inclusivo, o exclusivo si min_exclusive) y max_value (inclusivo)
+    - "choice": entero que debe estar en choices
+    - "timestamp": segundos epoch (número) o fecha ISO 8601; devuelve float epoch
+    optional=True acepta vacío/None y devuelve None.
+    """
+
+    def __init__(self, name: str, kind: str = "text", min_value: Optional[float] = None,
+                 min_exclusive: bool = False, choices: Optional[Iterable[int]] = None,
+                 min_len: int = 1, max_len: int = 100, optional: bool = False,
+                 max_value: Optional[float] = None):
+        if kind not in ("name", "text", "int", "decimal", "choice", "timestamp"):
+            raise ValueError(f"Unknown field kind '{kind}'.")
+        self.name = name
+        self.kind = kind
+        self.min_value = min_value
+        self.min_exclusive = min_exclusive
+        self.max_value = max_value
+        self.choices = frozenset(choices) if choices is not None else None
+        self.min_len = min_len
+        self.max_len = max_len
+        self.optional = optional
+        self.parse = self._compile()
+
+    def _compile(self) -> Callable[[Any], Any]:
+        """Genera la función de parseo una sola vez, con todo resuelto de antemano."""
+        name, kind, optional = self.name, self.kind, self.optional
+        min_len, max_len, choices = self.min_len, self.max_len, self.choices
+        low, exclusive, high = self.min_value, self.min_exclusive, self.max_value
+        name_match, int_match, decimal_match = _NAME_RE.match, _INT_RE.match, _DECIMAL_RE.match
+
+        def fail(message: str):
+            raise ValueError(f"{name}: {message}")
+
+        def check_range(value):
+            if low is not None and (value <= low if exclusive else value < low):
+                fail(f"debe ser mayor {'que' if exclusive else 'o igual que'} {low:g}.")
+            if high is not None and value > high:
+                fail(f"debe ser menor o igual que {high:g}." if isinstance(high, float)
+                     else f"debe ser menor o igual que {high}.")
+            return value
+
+        if low is None and high is None:
+            check_range = None
+
+        def parse_name(value):
+            s = value.strip() if isinstance(value, str) else ""
+            if not (min_len <= len(s) <= max_len) or not name_match(s):
+                fail("nombre inválido.")
+            return s
+
+        def parse_text(value):
+            s = value.strip() if isinstance(value, str) else ""
+            if not (min_len <= len(s) <= max_len):
+                fail("no puede estar vacío." if not s else "longitud inválida.")
+            return s
+
+        def parse_int(value):
+            # Mismas conversiones que la ruta rápida de RecordSpec.parse_csv (int() sobre el texto)
+            if type(value) is int:
+                number = value
+            elif isinstance(value, str) and value.strip():
+                try:
+                    number = int(value)
+                except ValueError:
+                    fail("no es un entero válido.")
+            else:
+                fail("no es un entero válido.")
+            return number if check_range is None else check_range(number)
+
+        def parse_decimal(value):
+            number = None
+            if type(value) in (int, float):
+                number = float(value)
+            elif isinstance(value, str):
+                try:
+                    number = float(value)
+                except ValueError:
+                    # Formato de los formularios: "12,5" o "1 250.5"
+                    s = value.strip().replace(" ", "")
+                    if decimal_match(s):
+                        number = float(s.replace(",", "."))
+            if number is None or not math.isfinite(number):
+                fail("formato decimal inválido.")
+            return number if check_range is None else check_range(number)
+
+        def parse_choice(value):
+            if type(value) is int or (isinstance(value, str) and int_match(value.strip())):
+                number = int(value)
+                if number in choices:
+                    return number
+            fail(f"debe ser uno de {', '.join(str(c) for c in sorted(choices))}.")
+
+        def parse_timestamp(value):
+            if type(value) in (int, float):
+                return float(value)
+            if isinstance(value, str):
+                s = value.strip()
+                try:
+                    return float(s) if decimal_match(s) else datetime.fromisoformat(s).timestamp()
+                except ValueError:
+                    pass
+            fail("fecha inválida (ISO 8601 o segundos epoch).")
+
+        parse = {"name": parse_name, "text": parse_text, "int": parse_int,
+                 "decimal": parse_decimal, "choice": parse_choice,
+                 "timestamp": parse_timestamp}[kind]
+        if not optional:
+            return parse
+
+        def parse_optional(value):
+            if value is None or (isinstance(value, str) and not value.strip()):
+                return None
+            return parse(value)
+        return parse_optional
+
+    def check(self, value) -> bool:
+        try:
+            self.parse(value)
+            return True
+        except ValueError:
+            return False
+
+
+def _csvConverter(field: Field) -> Callable[[str], Any]:
+    """
+    Conversor de un campo para la ruta rápida de RecordSpec.parse_csv: sin
+    mensajes (cualquier error hace que la fila se repita con Field.parse) y
+    con solo las comprobaciones que el campo necesita. En los opcionales el
+    vacío es None; un valor de solo espacios lo resuelve parse_or_raise.
+    """
+    kind, optional, low, high = field.kind, field.optional, field.min_value, field.max_value
+    if field.min_exclusive and low is not None:
+        # Límite exclusivo: se comprueba aparte para dejar el rango inclusivo en una comparación
+        exclusive_low, low = low, None
+    else:
+        exclusive_low = None
+    low = -math.inf if low is None else low
+    high = math.inf if high is None else high
+    ranged = exclusive_low is not None or low != -math.inf or high != math.inf
+
+    if kind in ("text", "name"):
+        min_len, max_len = field.min_len, field.max_len
+        name_match = _NAME_RE.match if kind == "name" else None
+
+        def convert(value):
+            if optional and not value:
+                return None
+            s = value.strip()
+            if not min_len <= len(s) <= max_len or (name_match is not None and not name_match(s)):
+                raise ValueError
+            return s
+    elif kind == "choice":
+        choices = field.choices
+
+        def convert(value):
+            if optional and not value:
+                return None
+            number = int(value)
+            if number not in choices:
+                raise ValueError
+            return number
+    elif kind == "int" and not ranged and not optional:
+        convert = int
+    elif kind == "int":
+        def convert(value):
+            if optional and not value:
+                return None
+            number = int(value)
+            if not low <= number <= high or (exclusive_low is not None and number <= exclusive_low):
+                raise ValueError
+            return number
+    elif kind == "decimal":
+        def convert(value):
+            if optional and not value:
+                return None
+            number = float(value)
+            # x - x solo es 0 si x es finito (inf - inf y nan dan nan)
+            if number - number != 0 or (ranged and (not low <= number <= high or (
+                    exclusive_low is not None and number <= exclusive_low))):
+                raise ValueError
+            return number
+    else:
+        # timestamp: Field.parse ya trata el vacío de los opcionales
+        convert = field.parse
+    return convert
+
+
+class RecordSpec:
+    """
+    Esquema de un registro (p. ej. un producto): se compila una vez y valida
+    y convierte filas enteras en una pasada, devolviendo valores tipados y
+    todos los errores de la fila. Las filas pueden ser secuencias (en el orden
+    de los campos; los opcionales del final pueden faltar) o dicts por nombre.
+    """
+
+    def __init__(self, *fields: Field):
+        self.fields = fields
+        self.names = tuple(f.name for f in fields)
+        self._parsers = tuple(f.parse for f in fields)
+        self._required = sum(1 for f in fields if not f.optional)
+        self._byName = {f.name: f for f in fields}
+        # parse_or_raise para filas de strings (csv.reader), con la ruta rápida ya montada
+        self.parse_csv: Callable[[list[str]], tuple] = self._compileCsv()
+
+    def csv_parser(self, build: Callable[..., Any], *positional: str,
+                   **arguments: str) -> Callable[[list[str]], Any]:
+        """
+        Como parse_csv, pero devuelve build(valores de los campos) sin pasar por la
+        tupla: csv_parser(User, "userID", "name", ...) o csv_parser(Sale, sale_id="saleID", ...).
+        """
+        unknown = (set(positional) | set(arguments.values())) - set(self.names)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return self._compileCsv(build, positional, arguments)
+
+    def _compileCsv(self, build: Callable[..., Any] | None = None, positional: tuple[str, ...] = (),
+                    arguments: dict[str, str] | None = None) -> Callable[[list[str]], Any]:
+        """
+        Devuelve una función que convierte una fila de strings con un conversor
+        rápido por campo (int(), float(), strip() y los límites ya resueltos).
+        Si algo falla repite la fila con parse_or_raise, que acepta lo mismo
+        (p. ej. "12,5") y redacta los errores de cada campo.
+        """
+        converters = tuple(_csvConverter(f) for f in self.fields)
+        required, total = self._required, len(self.fields)
+        missing = (None,) * total
+        fallback = self.parse_or_raise
+
+        def parse_csv(row):
+            n = len(row)
+            try:
+                if not required <= n <= total:
+                    raise ValueError
+                values = tuple([convert(value) for convert, value in zip(converters, row)])
+            except Exception:
+                return fallback(row)
+            # Opcionales ausentes al final de la fila
+            return values if n == total else values + missing[n:]
+
+        if build is None:
+            return parse_csv
+        index = {name: i for i, name in enumerate(self.names)}
+        positions = tuple(index[field] for field in positional)
+        keywords = tuple((arg, index[field]) for arg, field in (arguments or {}).items())
+
+        # build queda fuera del try de parse_csv: sus errores no repiten la fila
+        pick = itemgetter(*positions) if len(positions) > 1 else lambda values: tuple(values[i] for i in positions)
+        if not keywords:
+            def parse_build(row):
+                return build(*pick(parse_csv(row)))
+        else:
+            def parse_build(row):
+                values = parse_csv(row)
+                return build(*pick(values), **{arg: values[i] for arg, i in keywords})
+        return parse_build
+
+    def __getitem__(self, name: str) -> Field:
+        return self._byName[name]
+
+    def parse(self, row) -> tuple[Optional[tuple], list[str]]:
+        """Devuelve (valores, []) si la fila es válida o (None, errores) si no."""
+        if isinstance(row, dict):
+            row = [row.get(name) for name in self.names]
+        elif len(row) < self._required or len(row) > len(self._parsers):
+            return None, [f"expected {self._required}-{len(self._parsers)} fields, got {len(row)}"]
+        try:
+            # Caso habitual (fila válida): una sola pasada sin capturar por campo
+            values = [parse(value) for parse, value in zip(self._parsers, row)]
+        except ValueError:
+            errors = []
+            for parse, value in zip(self._parsers, row):
+                try:
+                    parse(value)
+                except ValueError as e:
+                    errors.append(str(e))
+            return None, errors
+        # Opcionales ausentes al final de la fila
+        values.extend([None] * (len(self._parsers) - len(values)))
+        return tuple(values), []
+
+    def parse_or_raise(self, row) -> tuple:
+        """Como parse, pero lanza ValueError con todos los errores de la fila."""
+        values, errors = self.parse(row)
+        if errors:
+            raise ValueError("; ".join(errors))
+        return values
+
+    def batch(self, rows: Iterable) -> Iterator[tuple[int, Optional[tuple], list[str]]]:
+        """Valida rows una a una en streaming: (índice, valores o None, errores)."""
+        parse = self.parse
+        for index, row in enumerate(rows):
+            values, errors = parse(row)
+            yield index, values, errors
+
+
+# Altas desde el menú o en bloque: mismas reglas que los formularios
+PRODUCT_SPEC = RecordSpec(
+    Field("name", "name"),
+    Field("author", "name"),
+    Field("category", "name"),
+    Field("quantity", "int", min_value=0),
+    Field("price", "decimal", min_value=0, min_exclusive=True),
+)
+# Límites de las columnas int64 de SaleStore
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+SALE_SPEC = RecordSpec(
+    Field("username", "text"),
+    Field("product", "text"),
+    Field("quantity", "int", min_value=1, max_value=INT64_MAX),
+    Field("price", "decimal", min_value=0),
+    Field("role", "choice", choices=(1, 2)),
+    Field("saleID", "int", min_value=1, max_value=INT64_MAX, optional=True),
+    Field("timestamp", "timestamp", optional=True),
+    Field("productID", "int", min_value=0, max_value=INT64_MAX, optional=True),
+)
+USER_SPEC = RecordSpec(
+    Field("name", "name"),
+    Field("username", "name"),
+    Field("password", "text", max_len=10_000),
+    Field("role", "choice", choices=(1, 2)),
+)
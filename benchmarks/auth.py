@@ -0,0 +1,100 @@
+"""
+Archivo: `auth.py`
+
+Benchmark de login con muchos usuarios: el login antiguo (recorrer la lista y
+comparar en claro) contra AuthService (índice por username y hash con sal):
+login en frío (hash completo), login repetido (caché de credenciales),
+authenticate(token) y logins en frío desde varios hilos.
+
+    python -m benchmarks.auth                       # 100k usuarios, pbkdf2 200k iteraciones
+    python -m benchmarks.auth --users 1000000 --threads 8 --algorithm scrypt
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Models.User import User
+from Services.AuthService import AuthService
+from Services.UserService import UserService
+from Utils.Events import NullSink
+from Utils.Passwords import PBKDF2_ITERATIONS, hash_password
+
+PASSWORD = "correct horse battery staple"
+
+
+def populate(count: int, stored: str) -> UserService:
+    """count usuarios con la misma contraseña guardada (un solo hash: calcular uno por usuario llevaría horas)."""
+    users = UserService(NullSink())
+    users.loadUsers(User(f"User {i}", f"user{i}", stored, i % 2 + 1, user_id=i) for i in range(1, count + 1))
+    return users
+
+
+def rate(label: str, calls: int, seconds: float) -> None:
+    print(f"{label:<34} {calls / seconds:>12,.0f} logins/s  ({seconds / calls * 1e6:>10.1f} us each)")
+
+
+def legacy_login(users: list[User], username: str, password: str) -> User | None:
+    # El login de menu.py antes de AuthService: recorrido lineal y comparación en claro
+    for user in users:
+        if user.username == username and user.password == password:
+            return user
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Login throughput with many users.")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--algorithm", choices=("pbkdf2", "scrypt"), default="pbkdf2")
+    parser.add_argument("--iterations", type=int, default=PBKDF2_ITERATIONS)
+    parser.add_argument("--cold", type=int, default=20, help="cold logins to time (each pays the full hash)")
+    parser.add_argument("--warm", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = [f"user{rng.randint(1, args.users)}" for _ in range(args.warm)]
+
+    plain = populate(args.users, PASSWORD)
+    legacy = min(args.warm, 200)
+    began = time.perf_counter()
+    for username in names[:legacy]:
+        assert legacy_login(plain._users, username, PASSWORD) is not None
+    rate(f"legacy scan ({args.users:,} users)", legacy, time.perf_counter() - began)
+
+    stored = hash_password(PASSWORD, args.algorithm, iterations=args.iterations)
+    users = populate(args.users, stored)
+    auth = AuthService(users, algorithm=args.algorithm, iterations=args.iterations, maxSessions=args.warm)
+
+    began = time.perf_counter()
+    for username in names[:args.cold]:
+        assert auth.login(username, PASSWORD) is not None
+    rate(f"cold login ({args.algorithm})", args.cold, time.perf_counter() - began)
+
+    # Credenciales ya verificadas: los mismos usuarios vuelven a entrar
+    warm = [names[i % args.cold] for i in range(args.warm)]
+    tokens = []
+    began = time.perf_counter()
+    for username in warm:
+        tokens.append(auth.login(username, PASSWORD)[1])
+    rate("repeat login (verified cache)", args.warm, time.perf_counter() - began)
+
+    began = time.perf_counter()
+    for token in tokens:
+        assert auth.authenticate(token) is not None
+    rate("authenticate(token)", len(tokens), time.perf_counter() - began)
+
+    # Logins en frío concurrentes: hashlib suelta el GIL, así que escalan con los núcleos
+    auth = AuthService(users, algorithm=args.algorithm, iterations=args.iterations)
+    cold = names[args.cold:args.cold + args.cold * args.threads]
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        began = time.perf_counter()
+        assert all(pool.map(lambda username: auth.login(username, PASSWORD), cold))
+        rate(f"cold login, {args.threads} thread(s)", len(cold), time.perf_counter() - began)
+    print(f"({os.cpu_count()} CPU(s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Archivo: `models.py`
+
+Benchmark de los modelos con __slots__ (Product, Sale, User) contra las mismas
+clases con __dict__ por instancia: memoria por objeto, tiempo de carga desde
+filas CSV (el parser de cada servicio) y lectura de atributos.
+
+    python -m benchmarks.models                 # 200k filas por modelo
+    python -m benchmarks.models --rows 1000000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from Models.Product import Product
+from Models.Sale import Sale
+from Models.User import User
+from Services.Inventory import PRODUCT_CSV_SPEC
+from Services.SaleService import SALE_CSV_SPEC
+from Services.UserService import USER_CSV_SPEC
+
+# Modelo, spec de su CSV, columnas que recibe el constructor (en orden) y atributos que se leen
+MODELS = (
+    (Product, PRODUCT_CSV_SPEC, ("name", "author", "category", "quantity", "price", "productID"),
+     ("productID", "name", "quantity", "price")),
+    (Sale, SALE_CSV_SPEC, ("username", "product", "quantity", "price", "role", "saleID", "timestamp", "productID"),
+     ("saleID", "product", "quantity", "price")),
+    (User, USER_CSV_SPEC, ("name", "username", "password", "role", "userID"),
+     ("userID", "username", "password", "role")),
+)
+
+
+def unslotted(cls: type) -> type:
+    """La misma clase (constructor y propiedades) pero con __dict__ por instancia, como antes de __slots__."""
+    slots = set(cls.__slots__)
+    namespace = {k: v for k, v in vars(cls).items() if k != "__slots__" and k not in slots}
+    return type(cls.__name__, (), namespace)
+
+
+def rows_for(cls: type, count: int) -> list[list[str]]:
+    if cls is Product:
+        return [[str(i), f"Book {i}", f"Author {i % 500}", f"Cat {i % 20}", str(i % 90 + 1), "12.5",
+                 str((i % 90 + 1) * 12.5)] for i in range(1, count + 1)]
+    if cls is Sale:
+        return [[str(i), f"user{i % 50}", f"Book {i % 300}", str(i % 5 + 1), "12.5", str(i % 2 + 1),
+                 str((i % 5 + 1) * 12.5), "2026-01-01T00:00:00Z", str(i % 300 + 1)] for i in range(1, count + 1)]
+    return [[str(i), f"User {i}", f"user{i}", "x" * 40, str(i % 2 + 1)] for i in range(1, count + 1)]
+
+
+def load(parse, rows: list[list[str]]) -> tuple[list, float]:
+    """Construye un objeto por fila: (objetos, segundos)."""
+    gc.collect()
+    began = time.perf_counter()
+    objects = [parse(row) for row in rows]
+    return objects, time.perf_counter() - began
+
+
+def allocated(parse, rows: list[list[str]]) -> int:
+    """Bytes que siguen reservados tras cargar rows (medido aparte: tracemalloc ralentiza la carga)."""
+    gc.collect()
+    tracemalloc.start()
+    objects = [parse(row) for row in rows]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def read(objects: list, attributes: tuple[str, ...]) -> float:
+    getters = [getattr(type(objects[0]), name).fget for name in attributes]
+    began = time.perf_counter()
+    for obj in objects:
+        for get in getters:
+            get(obj)
+    return time.perf_counter() - began
+
+
+def shallow(obj) -> int:
+    """Tamaño del objeto más su __dict__ (si lo tiene), sin los valores compartidos."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory and load time of slotted vs __dict__ models.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'model':<8} {'variant':<8} {'object':>8} {'load mem':>10} {'load':>9} {'read':>9}")
+    for cls, spec, columns, attributes in MODELS:
+        rows = rows_for(cls, args.rows)
+        results = {}
+        for variant, build in (("__dict__", unslotted(cls)), ("slots", cls)):
+            parse = spec.csv_parser(build, *columns)
+            best_load = best_read = float("inf")
+            for _ in range(args.repeat):
+                objects, elapsed = load(parse, rows)
+                best_load = min(best_load, elapsed)
+                best_read = min(best_read, read(objects, attributes))
+                size = shallow(objects[0])
+                del objects
+            memory = allocated(parse, rows) / args.rows
+            results[variant] = (size, memory, best_load, best_read)
+            print(f"{cls.__name__:<8} {variant:<8} {size:>7}B {memory:>9.0f}B "
+                  f"{best_load:>8.3f}s {best_read:>8.3f}s")
+        (size_d, mem_d, load_d, read_d), (size_s, mem_s, load_s, read_s) = results["__dict__"], results["slots"]
+        print(f"{cls.__name__:<8} {'saving':<8} {1 - size_s / size_d:>8.0%} {1 - mem_s / mem_d:>10.0%} "
+              f"{1 - load_s / load_d:>9.0%} {1 - read_s / read_d:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
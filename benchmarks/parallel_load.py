@@ -0,0 +1,62 @@
+"""
+Archivo: `parallel_load.py`
+
+Benchmark de SaleService.loadCSV: cargador secuencial (workers=1) contra el
+cargador paralelo por rangos de bytes (workers=N) sobre un Sales.csv sintético.
+
+    python -m benchmarks.parallel_load                  # 10M filas, N = núcleos
+    python -m benchmarks.parallel_load --rows 1000000 --workers 4
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from Services.SaleService import SALES_HEADER, SaleService
+from Utils.Events import NullSink
+
+
+def write_sales(path: Path, rows: int) -> None:
+    """Sales.csv con rows ventas de 50 usuarios y 300 productos (formato actual, 9 columnas)."""
+    start = 1_700_000_000
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SALES_HEADER)
+        for i in range(1, rows + 1):
+            quantity = i % 5 + 1
+            writer.writerow([i, f"user{i % 50}", f"Book {i % 300}", quantity, 12.5, i % 2 + 1,
+                             quantity * 12.5, start + i, i % 300 + 1])
+
+
+def load(path: Path, workers: int) -> tuple[float, int]:
+    sales = SaleService(NullSink())
+    began = time.perf_counter()
+    report = sales.loadCSV(str(path), workers=workers, useSnapshot=False)
+    return time.perf_counter() - began, report.loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sequential vs parallel Sales.csv loading.")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Sales.csv"
+        began = time.perf_counter()
+        write_sales(path, args.rows)
+        print(f"wrote {args.rows:,} rows ({path.stat().st_size / 2 ** 20:.0f} MiB) "
+              f"in {time.perf_counter() - began:.1f} s")
+
+        sequential, loaded = load(path, 1)
+        print(f"workers=1: {sequential:.2f} s ({loaded / sequential:,.0f} rows/s)")
+        parallel, loaded = load(path, args.workers)
+        print(f"workers={args.workers}: {parallel:.2f} s ({loaded / parallel:,.0f} rows/s)")
+        print(f"speedup: {sequential / parallel:.2f}x on {os.cpu_count()} CPU(s)")
+
+
+if __name__ == "__main__":
+    main()
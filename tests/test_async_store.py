@@ -0,0 +1,89 @@
+"""
+Archivo: `test_async_store.py`
+
+AsyncStore: un lote que no llega a disco sigue pendiente, la tarea de fondo
+lo reintenta y close() termina de guardar y cerrar el repositorio.
+
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from Services.AsyncStore import AsyncStore
+from Services.Inventory import Inventory
+from Services.Repository import CsvRepository
+from Utils.Events import NullSink
+
+
+class FailingRepository(CsvRepository):
+    """CsvRepository cuyos primeros `failures` flush fallan."""
+
+    def __init__(self, directory: str, failures: int):
+        super().__init__(directory)
+        self.failures = failures
+        self.flushes = 0
+        self.closed = False
+
+    def flush(self, inventory, sales) -> None:
+        self.flushes += 1
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        super().flush(inventory, sales)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class AsyncStoreFlushTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def stored(self) -> Inventory:
+        inventory = Inventory(NullSink())
+        inventory.loadCSV(str(Path(self.dir) / "Inventario.csv"), useSnapshot=False)
+        return inventory
+
+    def test_failed_flush_is_retried_in_background(self):
+        repo = FailingRepository(self.dir, failures=1)
+
+        async def run():
+            store = AsyncStore(repo=repo, flushInterval=0.01, retryInterval=0.01)
+            await store.start()
+            await store.addProduct("Dune", "Herbert", "SciFi", 5, 10.0)
+            for _ in range(200):
+                if repo.flushes >= 2 and not store._pendingWrites:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(repo.flushes, 2)
+            await store.addProduct("Emma", "Austen", "Novel", 3, 8.0)
+            await store.close()
+
+        asyncio.run(run())
+        self.assertTrue(repo.closed)
+        inventory = self.stored()
+        self.assertEqual(inventory.findProductByName("Dune").quantity, 5)
+        self.assertEqual(inventory.findProductByName("Emma").quantity, 3)
+
+    def test_close_closes_the_repository_even_if_the_last_flush_fails(self):
+        repo = FailingRepository(self.dir, failures=10)
+
+        async def run():
+            store = AsyncStore(repo=repo, flushInterval=60)
+            await store.start()
+            await store.addProduct("Dune", "Herbert", "SciFi", 5, 10.0)
+            with self.assertRaises(OSError):
+                await store.close()
+            self.assertEqual(store._pendingWrites, 1)
+
+        asyncio.run(run())
+        self.assertTrue(repo.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Archivo: `test_bulk.py`
+
+Altas en bloque (addProducts, addSales): un resultado por fila, duplicados
+rechazados y los IDs reservados nunca repiten uno explícito del lote ni uno
+ya existente.
+
+    python -m unittest discover -s tests
+"""
+
+import unittest
+
+from Services.Inventory import Inventory
+from Services.SaleService import SaleService
+from Utils.Events import NullSink
+
+
+class AddProductsTest(unittest.TestCase):
+    def test_rows_get_consecutive_ids_after_existing_products(self):
+        inventory = Inventory(NullSink())
+        inventory.addProduct("Dune", "Herbert", "SciFi", 1, 10.0)
+        result = inventory.addProducts([("Emma", "Austen", "Novel", 2, 8.0),
+                                        ("Dune", "Other", "SciFi", 1, 1.0),  # ya existe
+                                        ("Ubik", "Dick", "SciFi", -1, 5.0),  # cantidad no válida
+                                        {"name": "Solaris", "author": "Lem", "category": "SciFi",
+                                         "quantity": 3, "price": 7.0},
+                                        ("Emma", "Copy", "Novel", 1, 1.0)])  # repetido en el lote
+        self.assertEqual((result.added, result.failed), (2, 3))
+        self.assertEqual(result.ids, [2, 3])
+        self.assertEqual([r.index for r in result.errors], [1, 2, 4])
+        self.assertEqual(inventory.findProductByName("Solaris").productID, 3)
+        self.assertTrue(inventory.addProduct("Ubik", "Dick", "SciFi", 1, 5.0))
+        self.assertEqual(inventory.findProductByName("Ubik").productID, 4)
+
+
+class AddSalesTest(unittest.TestCase):
+    def test_reserved_ids_skip_explicit_ids_of_the_batch(self):
+        sales = SaleService(NullSink())
+        # Regresión: la fila sin ID recibía el 1, igual que la explícita que va detrás
+        result = sales.addSales([("a", "p", 1, 1.0, 2), ("b", "p", 1, 1.0, 2, 1)])
+        self.assertTrue(result.ok)
+        self.assertEqual(sorted(result.ids), [1, 2])
+        self.assertEqual(sorted(sales._sales.saleIDs()), [1, 2])
+        self.assertEqual(sales.addSale("c", "p", 1, 1.0, 2).saleID, 3)
+
+    def test_duplicate_ids_are_rejected(self):
+        sales = SaleService(NullSink())
+        sales.addSale("a", "p", 1, 1.0, 2, sale_id=5)
+        result = sales.addSales([("b", "p", 1, 1.0, 2, 5),   # ya existe
+                                 ("c", "p", 1, 1.0, 2, 7),
+                                 ("d", "p", 1, 1.0, 2, 7),   # repetido en el lote
+                                 ("e", "p", 1, 1.0, 2)])
+        self.assertEqual((result.added, result.failed), (2, 2))
+        self.assertEqual([r.index for r in result.errors], [0, 2])
+        self.assertEqual(result.ids, [7, 8])
+        self.assertEqual(len(sales._sales), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
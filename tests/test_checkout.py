@@ -0,0 +1,126 @@
+"""
+Archivo: `test_checkout.py`
+
+Prueba de estrés de CheckoutService: muchos hilos comprando a la vez nunca
+venden más unidades de las que hay en stock.
+
+    python -m unittest discover -s tests
+"""
+
+import random
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from Models.Product import Product
+from Models.User import User
+from Services.Checkout import CheckoutService
+from Services.Inventory import Inventory
+from Services.SaleService import SaleService
+from Utils.Events import NullSink
+
+PRODUCTS = 4
+STOCK = 1000
+WORKERS = 16
+
+
+class CheckoutStressTest(unittest.TestCase):
+    def setUp(self):
+        # Cada lectura de stock cede el GIL: entre comprobar y descontar otro hilo
+        # puede comprar el mismo producto, así que sin locks la prueba falla
+        quantity = Product.quantity
+
+        def slow_quantity(product: Product) -> int:
+            time.sleep(0)
+            return quantity.fget(product)
+
+        patcher = mock.patch.object(Product, "quantity", property(slow_quantity, quantity.fset))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.inventory = Inventory(NullSink())
+        for i in range(PRODUCTS):
+            self.inventory.addProduct(f"Book {i}", "Author", f"Cat {i % 4}", STOCK, 10.0)
+        self.sales = SaleService(NullSink(), categoryOf=self.inventory.categoryOf,
+                                 productIdOf=self.inventory.productIdOf)
+        self.checkout = CheckoutService(self.inventory, self.sales, NullSink())
+        self.users = [User(f"User {i}", f"user{i}", "secret", 1) for i in range(WORKERS)]
+
+    def _hammer(self, attempts: int, defer: bool = False) -> list:
+        start = threading.Barrier(WORKERS)
+
+        def worker(n: int) -> list:
+            rng = random.Random(n)
+            user = self.users[n]
+            done = []
+            start.wait()  # todos los hilos empiezan a comprar a la vez
+            for _ in range(attempts):
+                name = f"Book {rng.randrange(PRODUCTS)}"
+                qty = rng.randint(1, 4)
+                if self.checkout.checkout(user, name, qty, defer=defer) is not None:
+                    done.append((name, qty))
+            return done
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            return [sale for batch in pool.map(worker, range(WORKERS)) for sale in batch]
+
+    def assertNoOverselling(self, done: list) -> None:
+        sold = Counter()
+        for name, qty in done:
+            sold[name] += qty
+        for i in range(PRODUCTS):
+            name = f"Book {i}"
+            product = self.inventory.findProductByName(name)
+            self.assertGreaterEqual(product.quantity, 0, name)
+            self.assertLessEqual(sold[name], STOCK, name)
+            self.assertEqual(product.quantity, STOCK - sold[name], name)
+        # Cada compra aceptada tiene exactamente una venta registrada
+        stats = self.sales.statistics()
+        self.assertEqual(stats["count"], len(done))
+        self.assertEqual(stats["items"], sum(sold.values()))
+
+    def test_concurrent_checkouts_never_oversell(self):
+        # Más demanda que stock: se agota todo y el resto de compras se rechazan
+        done = self._hammer(attempts=500)
+        self.assertNoOverselling(done)
+        self.assertTrue(all(self.inventory.findProductByName(f"Book {i}").quantity < 4
+                            for i in range(PRODUCTS)))
+
+    def test_non_positive_quantities_are_rejected(self):
+        user = self.users[0]
+        for qty in (0, -3):
+            self.assertFalse(self.inventory.purchase("Book 0", qty))
+            self.assertIsNone(self.checkout.checkout(user, "Book 0", qty))
+        self.assertEqual(self.inventory.findProductByName("Book 0").quantity, STOCK)
+        self.assertEqual(self.sales.statistics()["count"], 0)
+
+    def test_concurrent_checkouts_with_journals(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            inventory_csv = Path(tmp) / "Inventario.csv"
+            sales_csv = Path(tmp) / "Sales.csv"
+            self.inventory.saveCSV(str(inventory_csv))
+            self.inventory.openJournal(str(inventory_csv))
+            self.sales.saveCSV(str(sales_csv))
+            self.sales.openJournal(str(sales_csv), compactEvery=0)
+
+            done = self._hammer(attempts=200, defer=True)
+            self.inventory.saveCSV(str(inventory_csv))
+            self.sales.flushJournal()
+            self.assertNoOverselling(done)
+
+            # Lo persistido coincide con lo que quedó en memoria
+            inventory = Inventory(NullSink())
+            inventory.loadCSV(str(inventory_csv), useSnapshot=False)
+            for product in self.inventory._products:
+                self.assertEqual(inventory.findProductByID(product.productID).quantity, product.quantity)
+            sales = SaleService(NullSink())
+            sales.loadCSV(str(sales_csv), useSnapshot=False)
+            self.assertEqual(len(sales.listSales(limit=len(done) + 1)), len(done))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Archivo: `test_http_server.py`
+
+POST /purchase: una compra hecha en memoria cuyo lote no llega a disco
+responde 202 (no 500, que el cliente reintentaría comprando otra vez) y se
+guarda en el siguiente intento; qty debe ser un entero JSON. Las respuestas
+de error tempranas no dejan el cuerpo sin leer en una conexión keep-alive.
+
+    python -m unittest discover -s tests
+"""
+
+import http.client
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from Services.HttpServer import StoreServer
+from Services.Inventory import Inventory
+from Services.Repository import CsvRepository
+from Services.SaleService import SaleService, iter_sales
+from Services.UserService import UserService
+from Utils.Events import EventSink, NullSink
+
+
+class RecordingSink(EventSink):
+    def __init__(self):
+        self.messages: list[tuple[str, str | None]] = []
+
+    def emit(self, message: str, color: str | None = None) -> None:
+        self.messages.append((message, color))
+
+
+class PurchaseEndpointTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        repo = CsvRepository(tmp.name)
+        inventory = Inventory(NullSink())
+        inventory.addProduct("Dune", "Herbert", "SciFi", 10, 10.0)
+        inventory.saveCSV(repo.inventoryPath)
+        sales = SaleService(NullSink(), inventory.categoryOf, inventory.productIdOf)
+        repo.loadInventory(inventory)
+        repo.loadSales(sales)
+        self.inventory = inventory
+        self.events = RecordingSink()
+        self.server = StoreServer(("127.0.0.1", 0), repo=repo, inventory=inventory, sales=sales,
+                                  users=UserService(NullSink()), load=False, events=self.events)
+        self.server.committer._retry = 0.05
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def post(self, body: dict) -> tuple[int, dict]:
+        conn = http.client.HTTPConnection(*self.server.server_address)
+        try:
+            conn.request("POST", "/purchase", json.dumps(body), {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            conn.close()
+
+    def test_failed_flush_is_accepted_and_retried(self):
+        journal = self.dir / "Sales.journal"
+        journal.mkdir()  # el diario no se puede abrir: el lote falla
+        status, body = self.post({"user": 2, "product": "Dune", "qty": 2})
+        self.assertEqual(status, 202)
+        self.assertFalse(body["persisted"])
+        self.assertEqual(self.inventory.findProductByName("Dune").quantity, 8)
+
+        journal.rmdir()
+        deadline = time.monotonic() + 5
+        saved = []
+        while not saved and time.monotonic() < deadline:
+            time.sleep(0.02)
+            if journal.is_file():
+                saved = [s.saleID for s in iter_sales(journal, header=False)]
+        self.assertEqual(saved, [body["saleID"]])
+        self.assertIn("red", [color for message, color in self.events.messages if "Error persisting" in message])
+
+    def test_qty_must_be_an_integer(self):
+        for qty in (1.7, True, "1.5", None):
+            status, body = self.post({"user": 2, "product": "Dune", "qty": qty})
+            self.assertEqual((status, body["error"]), (400, "qty must be an integer"), qty)
+        self.assertEqual(self.inventory.findProductByName("Dune").quantity, 10)
+        status, body = self.post({"user": 2, "product": "Dune", "qty": 2.0})
+        self.assertEqual((status, body["quantity"]), (201, 2))
+
+    def test_unknown_post_path_keeps_the_connection_usable(self):
+        conn = http.client.HTTPConnection(*self.server.server_address)
+        self.addCleanup(conn.close)
+        body = json.dumps({"user": 2, "product": "Dune", "qty": 1})
+        conn.request("POST", "/nope", body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        self.assertEqual((response.status, json.loads(response.read())), (404, {"error": "not found"}))
+        # Misma conexión: la siguiente petición no se mezcla con el cuerpo anterior
+        conn.request("POST", "/purchase", body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        self.assertEqual((response.status, json.loads(response.read())["quantity"]), (201, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
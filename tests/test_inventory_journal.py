@@ -0,0 +1,107 @@
+"""
+Archivo: `test_inventory_journal.py`
+
+Diario del inventario: los cambios se reaplican al cargar (la última fila de
+cada producto gana), las compras aplazadas hechas mientras se reescribe el
+CSV llegan al disco, y lo que se relee coincide con lo que había en memoria.
+
+    python -m unittest discover -s tests
+"""
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from Services.Inventory import Inventory
+from Utils.Events import NullSink
+
+PRODUCTS = 2000
+
+
+class InventoryJournalTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv = Path(tmp.name) / "Inventario.csv"
+        self.inventory = Inventory(NullSink())
+        self.inventory.addProducts((f"Book {i}", "Author", "Cat", 1_000_000, 10.0) for i in range(PRODUCTS))
+        self.inventory.saveCSV(str(self.csv))
+        self.inventory.openJournal(str(self.csv))
+
+    def reload(self) -> Inventory:
+        inventory = Inventory(NullSink())
+        inventory.loadCSV(str(self.csv), useSnapshot=False)
+        return inventory
+
+    def assertPersisted(self) -> None:
+        inventory = self.reload()
+        for product in self.inventory._products:
+            self.assertEqual(inventory.findProductByID(product.productID).quantity, product.quantity,
+                             product.name)
+
+    def test_journal_replay_keeps_the_last_row(self):
+        csv_before = self.csv.read_bytes()
+        self.inventory.purchase("Book 1", 2)
+        self.inventory.purchase("Book 1", 3)
+        self.inventory.updateProduct("Book 2", new_name="Dune", price=20.0)
+        self.inventory.addProduct("Emma", "Austen", "Novel", 4, 8.0)
+        self.inventory.saveCSV(str(self.csv))
+        # Solo el diario cambia; el CSV se reescribe al compactar
+        self.assertEqual(self.csv.read_bytes(), csv_before)
+
+        inventory = self.reload()
+        self.assertEqual(inventory.findProductByName("Book 1").quantity, 999_995)
+        self.assertIsNone(inventory.findProductByName("Book 2"))
+        self.assertEqual(inventory.findProductByName("dune").price, 20.0)
+        self.assertEqual(inventory.findProductByName("Emma").quantity, 4)
+        self.assertEqual(len(inventory._products), PRODUCTS + 1)
+        self.assertPersisted()
+
+    def test_torn_last_row_is_ignored(self):
+        self.inventory.purchase("Book 1", 2)
+        with self.csv.with_suffix(".journal").open("a", encoding="utf-8") as f:
+            f.write("2,Book 2,Author,Cat,")
+        self.assertEqual(self.reload().findProductByName("Book 2").quantity, 1_000_000)
+        self.assertPersisted()
+
+    def test_deferred_purchases_survive_concurrent_compaction(self):
+        def buyer():
+            for i in range(20_000):
+                self.inventory.purchase(f"Book {i % PRODUCTS}", 1, defer=True)
+
+        thread = threading.Thread(target=buyer)
+        thread.start()
+        compactions = 0
+        while thread.is_alive() or not compactions:
+            self.inventory.compact()
+            compactions += 1
+        thread.join()
+        self.inventory.saveCSV(str(self.csv))
+        self.assertPersisted()
+
+    def test_purchases_never_compact(self):
+        self.inventory.openJournal(str(self.csv), compactEvery=5)
+        journal = self.csv.with_suffix(".journal")
+        for i in range(10):
+            self.assertTrue(self.inventory.purchase(f"Book {i}", 1))
+        # Las compras solo añaden filas; la compactación la pide quien guarda
+        self.assertEqual(len(journal.read_text(encoding="utf-8").splitlines()), 10)
+        self.assertTrue(self.inventory.compactIfDue())
+        self.assertFalse(journal.exists())
+        self.assertFalse(self.inventory.compactIfDue())
+        self.assertPersisted()
+
+    def test_failed_rewrite_keeps_dirty_rows(self):
+        self.inventory.purchase("Book 1", 3, defer=True)
+        # Un directorio con el nombre del temporal hace fallar la reescritura
+        self.csv.with_suffix(".tmp").mkdir()
+        with self.assertRaises(OSError):
+            self.inventory.compact()
+        self.csv.with_suffix(".tmp").rmdir()
+        self.inventory.saveCSV(str(self.csv))
+        self.assertPersisted()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Archivo: `test_inventory_load.py`
+
+Carga del inventario: desde el CSV o desde el snapshot, con el diario
+aplicado antes de indexar, los índices (nombres, búsqueda, órdenes,
+estadísticas, IDs) quedan igual que en el inventario que se guardó.
+
+    python -m unittest discover -s tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from Services.Inventory import PRODUCT_SORTS, Inventory
+from Utils.Events import NullSink
+
+PRODUCTS = 500
+
+
+class InventoryLoadTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv = Path(tmp.name) / "Inventario.csv"
+        self.inventory = Inventory(NullSink())
+        self.inventory.addProducts((f"Libro {i}", f"Autor {i % 9}", f"Cat {i % 4}", i % 50, 5.0 + i % 13)
+                                   for i in range(PRODUCTS))
+        self.inventory.addProduct("Canción", "Autor", "Música", 7, 99.0)
+        self.inventory.saveCSV(str(self.csv))
+        # Cambios en el diario: renombrado, compra y alta
+        self.inventory.openJournal(str(self.csv))
+        self.inventory.updateProduct("Libro 3", new_name="Dune", price=150.0)
+        self.inventory.purchase("Libro 4", 4)
+        self.inventory.addProduct("Emma", "Austen", "Novela", 200, 1.0)
+        self.inventory.saveCSV(str(self.csv))
+
+    def load(self, useSnapshot: bool) -> Inventory:
+        inventory = Inventory(NullSink())
+        inventory.loadCSV(str(self.csv), useSnapshot=useSnapshot)
+        return inventory
+
+    def assertSameIndexes(self, loaded: Inventory) -> None:
+        expected = self.inventory
+        self.assertEqual(loaded.productCount(), expected.productCount())
+        for sort in PRODUCT_SORTS:
+            for reverse in (False, True):
+                self.assertEqual([p.productID for p in loaded.listProducts(sort, 0, 30, reverse)],
+                                 [p.productID for p in expected.listProducts(sort, 0, 30, reverse)], sort)
+        for query in ("dune", "libro 3", "autor 2", "cancion", "emma"):
+            self.assertEqual([p.productID for p in loaded.searchProduct(query)],
+                             [p.productID for p in expected.searchProduct(query)], query)
+        self.assertIsNone(loaded.findProductByName("Libro 3"))
+        self.assertEqual(loaded.findProductByName("dune").price, 150.0)
+        self.assertEqual(loaded.findProductByName("Libro 4").quantity, 0)
+        self.assertTrue(loaded.productExists("CANCION"))
+        self.assertFalse(loaded.productExists("Libro 3"))
+        self.assertAlmostEqual(loaded._stats.totalValue, expected._stats.totalValue)
+        self.assertEqual(loaded._stats.mostExpensive().name, "Dune")
+        self.assertEqual(loaded._stats.mostStock().name, "Emma")
+        self.assertTrue(loaded.addProduct("Ulises", "Joyce", "Novela", 1, 1.0))
+        self.assertEqual(loaded.findProductByName("Ulises").productID, PRODUCTS + 3)
+
+    def test_load_from_csv(self):
+        self.assertSameIndexes(self.load(useSnapshot=False))
+
+    def test_load_from_snapshot(self):
+        self.load(useSnapshot=True)  # escribe el snapshot
+        self.assertSameIndexes(self.load(useSnapshot=True))
+
+    def test_changes_after_load_update_every_index(self):
+        loaded = self.load(useSnapshot=False)
+        loaded.updateProduct("Emma", new_name="Persuasión", quantity=1)
+        self.assertEqual([p.name for p in loaded.searchProduct("persuasion")], ["Persuasión"])
+        self.assertEqual(loaded.searchProduct("emma"), [])
+        self.assertEqual(loaded._stats.mostStock().name, "Libro 49")
+        self.assertEqual(loaded.listProducts("name", 0, 1, reverse=True)[0].name, "Persuasión")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Archivo: `test_inventory_stats.py`
+
+InventoryStats: tras altas en bloque, compras, reposiciones y cambios del
+administrador, los agregados mantenidos coinciden con recalcularlos sobre
+todo el inventario.
+
+    python -m unittest discover -s tests
+"""
+
+import math
+import random
+import unittest
+
+from Services.Inventory import Inventory
+from Services.InventoryStats import InventoryStats
+from Utils.Events import NullSink
+
+
+class InventoryStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.inventory = Inventory(NullSink())
+        # Alta en bloque: las estadísticas quedan pendientes hasta la primera consulta
+        self.inventory.addProducts([(f"Book {i:02}", "Author", "Cat", 10 + i % 6, float(i % 9 + 1))
+                                    for i in range(40)])
+
+    def assertMatchesRecount(self) -> None:
+        products = self.inventory._products
+        stats = self.inventory._stats
+        self.assertEqual(len(stats), len(products))
+        self.assertAlmostEqual(stats.totalValue, math.fsum(p.price * p.quantity for p in products), places=6)
+        # Con empate gana el ID más bajo
+        self.assertIs(stats.mostExpensive(), min(products, key=lambda p: (-p.price, p.productID)))
+        self.assertIs(stats.leastExpensive(), min(products, key=lambda p: (p.price, p.productID)))
+        self.assertIs(stats.mostStock(), min(products, key=lambda p: (-p.quantity, p.productID)))
+        self.assertIs(stats.leastStock(), min(products, key=lambda p: (p.quantity, p.productID)))
+
+    def test_purchases_and_updates(self):
+        # La primera compra llega antes de cualquier consulta, con el alta aún pendiente
+        self.assertTrue(self.inventory.purchase("Book 05", 3))
+        self.assertMatchesRecount()
+        rng = random.Random(5)
+        for step in range(300):
+            name = f"Book {rng.randint(0, 39):02}"
+            action = rng.random()
+            if action < 0.5:
+                self.inventory.purchase(name, rng.randint(1, 4), defer=rng.random() < 0.5)
+            elif action < 0.7:
+                self.inventory.restock(name, rng.randint(1, 4))
+            elif action < 0.9:
+                self.assertTrue(self.inventory.updateProduct(name, price=float(rng.randint(1, 30))))
+            else:
+                self.assertTrue(self.inventory.updateProduct(name, quantity=rng.randint(0, 20)))
+            if step % 25 == 0:
+                self.assertMatchesRecount()
+        self.assertTrue(self.inventory.addProduct("Late", "Author", "Cat", 100, 99.0))
+        self.assertMatchesRecount()
+        self.assertEqual(self.inventory._stats.mostExpensive().name, "Late")
+
+    def test_remove_and_clear(self):
+        stats = InventoryStats()
+        stats.extend(self.inventory._products)
+        stats.remove(self.inventory.findProductByName("Book 08").productID)  # precio 9, el más alto
+        self.assertEqual(len(stats), 39)
+        self.assertEqual(stats.mostExpensive().name, "Book 17")
+        stats.clear()
+        self.assertEqual((len(stats), stats.totalValue, stats.mostStock()), (0, 0.0, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Archivo: `test_names.py`
+
+Nombres equivalentes (sin mayúsculas ni acentos): NameSet y la resolución
+del producto que bloquea un alta en Inventory / LazyInventory.
+
+    python -m unittest discover -s tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from Services.Inventory import Inventory
+from Services.LazyInventory import LazyInventory
+from Utils.Events import NullSink
+from Utils.Validator import NameSet
+
+
+class NameSetTest(unittest.TestCase):
+    def test_find_returns_an_equivalent_stored_name(self):
+        names = NameSet(["Canción", "Dune"])
+        self.assertIn(" cancion ", names)
+        self.assertEqual(names.find("CANCION"), "Canción")
+        self.assertIsNone(names.find("Emma"))
+
+    def test_discarding_one_of_two_equivalent_names_keeps_the_other(self):
+        names = NameSet(["Canción", "Cancion"])
+        self.assertEqual(len(names), 1)
+        names.discard("Canción")
+        self.assertEqual(names.find("cancion"), "Cancion")
+        names.rename("Cancion", "Song")
+        self.assertNotIn("cancion", names)
+        self.assertEqual(names.find("song"), "Song")
+
+    def test_dedup_splits_new_and_repeated(self):
+        names = NameSet(["Dune"])
+        self.assertEqual(names.dedup(["Emma", "DUNE", "émma", "", "Ulises"]),
+                         (["Emma", "Ulises"], ["DUNE", "émma", ""]))
+
+
+class EquivalentProductTest(unittest.TestCase):
+    def test_accent_variant_resolves_to_the_existing_product(self):
+        inventory = Inventory(NullSink())
+        inventory.addProduct("Canción", "Autor", "Música", 5, 10.0)
+        self.assertFalse(inventory.addProduct("Cancion", "Autor", "Música", 1, 1.0))
+        self.assertIsNone(inventory.findProductByName("Cancion"))
+        product = inventory.findEquivalentProduct("Cancion")
+        self.assertEqual(product.name, "Canción")
+        self.assertTrue(inventory.updateProduct(product.name, quantity=7))
+        self.assertEqual(inventory.findProductByName("canción").quantity, 7)
+
+    def test_lazy_inventory_resolves_unmaterialized_rows(self):
+        inventory = Inventory(NullSink())
+        inventory.addProduct("Canción", "Autor", "Música", 5, 10.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "Inventario.csv")
+            inventory.saveCSV(path)
+            lazy = LazyInventory(NullSink())
+            lazy.loadCSV(path)
+            self.assertEqual(lazy.findEquivalentProduct("cancion").name, "Canción")
+            lazy._closeMap()
+
+
+if __name__ == "__main__":
+    unittest.main()
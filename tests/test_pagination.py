@@ -0,0 +1,136 @@
+"""
+Archivo: `test_pagination.py`
+
+Paginación sobre órdenes mantenidos: SortedIndex (por posición y por cursor,
+con altas masivas aplazadas), Inventory.listProducts(after=) y SaleStore.page
+coinciden con ordenar la lista completa en cada consulta.
+
+    python -m unittest discover -s tests
+"""
+
+import random
+import unittest
+
+from Services.Inventory import Inventory
+from Services.SaleService import SaleService
+from Utils.Events import NullSink
+from Utils.SortedIndex import SortedIndex
+
+
+class SortedIndexTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.keys = {i: rng.randint(0, 20) for i in range(1, 101)}
+
+    def expected(self, reverse: bool = False) -> list[int]:
+        return [i for _, i in sorted(((k, i) for i, k in self.keys.items()), reverse=reverse)]
+
+    def check(self, index: SortedIndex) -> None:
+        for reverse in (False, True):
+            ids = self.expected(reverse)
+            self.assertEqual(index.page(0, len(ids) + 5, reverse), ids)
+            self.assertEqual(index.page(10, 7, reverse), ids[10:17])
+            # Recorrer por cursor da las mismas páginas que por posición
+            pages, cursor = [], None
+            while True:
+                page = index.page(0, 9, reverse) if cursor is None else index.after(cursor, 9, reverse)
+                if not page:
+                    break
+                pages.extend(page)
+                cursor = page[-1]
+            self.assertEqual(pages, ids)
+        self.assertEqual(len(index), len(self.keys))
+
+    def test_add_update_remove(self):
+        index = SortedIndex()
+        for i, key in self.keys.items():
+            index.add(i, key)
+        self.check(index)
+        for i in (3, 50, 99):
+            self.keys[i] = -i
+            index.update(i, -i)
+        for i in (1, 42):
+            del self.keys[i]
+            index.remove(i)
+        self.check(index)
+        self.assertEqual(index.after(42, 5), [])  # cursor que ya no existe
+
+    def test_extend_and_bulk_adds_sort_on_first_query(self):
+        index = SortedIndex()
+        items = list(self.keys.items())
+        index.extend(items[:60])
+        for i, key in items[60:]:
+            index.add(i, key, bulk=True)
+        self.assertIn(5, index)
+        self.assertEqual(index.key(5), self.keys[5])
+        index.update(5, 1000)
+        self.keys[5] = 1000
+        self.check(index)
+        index.clear()
+        self.assertEqual(index.page(), [])
+
+
+class ListProductsTest(unittest.TestCase):
+    def setUp(self):
+        self.inventory = Inventory(NullSink())
+        self.inventory.addProducts([(f"Book {i:02}", "Author", "Cat", i % 5, float(i % 7 + 1))
+                                    for i in range(30)])
+
+    def byPrice(self) -> list[int]:
+        products = sorted(self.inventory._products, key=lambda p: (p.price, p.productID))
+        return [p.productID for p in products]
+
+    def test_cursor_pages_follow_the_sort_order(self):
+        first = self.inventory.listProducts("price", limit=10)
+        second = self.inventory.listProducts("price", limit=10, after=first[-1].productID)
+        self.assertEqual([p.productID for p in first + second], self.byPrice()[:20])
+        self.assertEqual([p.productID for p in self.inventory.listProducts("id", limit=3, reverse=True)],
+                         [30, 29, 28])
+
+    def test_cursor_survives_inserts_and_updates(self):
+        first = self.inventory.listProducts("price", limit=10)
+        cursor = first[-1]
+        # Un alta y un cambio de precio antes del cursor no desplazan la página siguiente
+        self.inventory.addProduct("Cheap", "Author", "Cat", 1, 0.5)
+        self.assertTrue(self.inventory.updateProduct(first[0].name, price=0.25))
+        ids = self.byPrice()
+        start = ids.index(cursor.productID) + 1
+        page = self.inventory.listProducts("price", limit=10, after=cursor.productID)
+        self.assertEqual([p.productID for p in page], ids[start:start + 10])
+
+    def test_unknown_sort_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.inventory.listProducts("author")
+
+
+class SalesPageTest(unittest.TestCase):
+    def setUp(self):
+        self.sales = SaleService(NullSink())
+        rng = random.Random(3)
+        for i in range(40):
+            self.sales.addSale(f"user{i % 4}", f"Book {rng.randint(0, 9)}", rng.randint(1, 5),
+                               float(rng.randint(1, 9)), 2)
+
+    def test_pages_match_sorting_everything(self):
+        store = self.sales._sales
+        all_sales = list(store.page(None, 0, len(store)))
+        self.assertEqual([s.saleID for s in all_sales], list(range(1, 41)))
+        self.assertEqual([s.saleID for s in store.page(None, 0, 3, reverse=True)], [40, 39, 38])
+        by_price = sorted(all_sales, key=lambda s: (s.price, s.saleID - 1))
+        self.assertEqual([s.saleID for s in store.page("price", 5, 10)],
+                         [s.saleID for s in by_price[5:15]])
+        by_name = sorted(all_sales, key=lambda s: (s.product.casefold(), s.saleID - 1), reverse=True)
+        self.assertEqual([s.saleID for s in store.page("name", 0, 10, reverse=True)],
+                         [s.saleID for s in by_name[:10]])
+
+    def test_new_sales_join_an_existing_order(self):
+        store = self.sales._sales
+        store.page("quantity")  # crea el orden
+        self.sales.addSale("late", "Book 0", 99, 1.0, 2)
+        self.assertEqual([s.saleID for s in store.page("quantity", 0, 1, reverse=True)], [41])
+        with self.assertRaises(ValueError):
+            store.page("user")
+
+
+if __name__ == "__main__":
+    unittest.main()
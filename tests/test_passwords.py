@@ -0,0 +1,72 @@
+"""
+Archivo: `test_passwords.py`
+
+Contraseñas: los Users.csv antiguos en texto plano se migran a hash al
+cargarlos, y las altas usan el algoritmo y coste configurados en AuthService.
+
+    python -m unittest discover -s tests
+"""
+
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from Services.AuthService import AuthService
+from Services.UserService import UserService
+from Utils.Events import NullSink
+from Utils.Passwords import is_hashed
+
+ITERATIONS = 1000  # coste bajo: la prueba no mide el hash
+
+
+class PasswordMigrationTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv = Path(tmp.name) / "Users.csv"
+
+    def storedPasswords(self) -> list[str]:
+        with self.csv.open(newline="", encoding="utf-8") as f:
+            return [row[3] for row in list(csv.reader(f))[1:]]
+
+    def test_load_hashes_plain_text_passwords(self):
+        with self.csv.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["userID", "name", "username", "password", "role"])
+            writer.writerow([1, "Ana", "ana", "secret", 1])
+            writer.writerow([2, "Luis", "luis", "hunter2", 2])
+        users = UserService(NullSink())
+        users.setPasswordHashing(iterations=ITERATIONS)
+        users.loadCSV(str(self.csv))
+
+        stored = self.storedPasswords()
+        self.assertEqual(len(stored), 2)
+        self.assertTrue(all(is_hashed(p) for p in stored))
+        self.assertNotIn("secret", self.csv.read_text(encoding="utf-8"))
+
+        # Sin iniciar sesión antes: la contraseña ya migrada sigue valiendo
+        reloaded = UserService(NullSink())
+        reloaded.loadCSV(str(self.csv), useSnapshot=False)
+        auth = AuthService(reloaded, iterations=ITERATIONS)
+        self.assertIsNotNone(auth.login("luis", "hunter2"))
+        self.assertIsNone(auth.login("luis", "secret"))
+
+    def test_save_never_writes_plain_text(self):
+        users = UserService(NullSink())  # usuarios de ejemplo, en texto plano
+        users.setPasswordHashing(iterations=ITERATIONS)
+        users.saveCSV(str(self.csv))
+        self.assertTrue(all(is_hashed(p) for p in self.storedPasswords()))
+
+    def test_new_users_use_the_configured_cost(self):
+        users = UserService(NullSink())
+        AuthService(users, iterations=ITERATIONS)
+        users.addUser("Ana", "ana", "secret", 1)
+        users.addUsers([("Luis", "luis", "hunter2", 2), ("Eva", "eva", "letmein", 2)])
+        users.updateUser("Ana", new_password="changed")
+        for username in ("ana", "luis", "eva"):
+            self.assertTrue(users.findUserByUsername(username).password.startswith(f"pbkdf2_sha256${ITERATIONS}$"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Archivo: `test_product_sales.py`
+
+productSales: las ventas se enlazan al producto por ID, así que renombrarlo
+no le quita las anteriores, tampoco tras guardar y recargar Sales.csv.
+
+    python -m unittest discover -s tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from Models.User import User
+from Services.Checkout import CheckoutService
+from Services.Inventory import Inventory
+from Services.SaleService import SaleService
+from Utils.Events import NullSink
+
+
+class ProductSalesTest(unittest.TestCase):
+    def setUp(self):
+        self.inventory = Inventory(NullSink())
+        self.inventory.addProducts([("Dune", "Herbert", "SciFi", 20, 10.0), ("Emma", "Austen", "Novel", 5, 8.0)])
+        self.sales = SaleService(NullSink(), self.inventory.categoryOf, self.inventory.productIdOf)
+        self.checkout = CheckoutService(self.inventory, self.sales)
+        self.user = User("Buyer", "buyer", "secret", 2)
+
+    def test_sales_follow_a_renamed_product(self):
+        self.assertIsNotNone(self.checkout.checkout(self.user, "Dune", 3))
+        # Sin productID: se enlaza por el nombre que tiene ahora
+        self.sales.addSale("ana", "Dune", 1, 10.0, 2)
+        self.assertTrue(self.inventory.updateProduct("Dune", new_name="Dune Messiah", price=12.0))
+        self.assertIsNotNone(self.checkout.checkout(self.user, "Dune Messiah", 2))
+        product = self.inventory.findProductByName("Dune Messiah")
+        stats = self.sales.productSales(product)
+        self.assertEqual((stats["units"], stats["count"], stats["revenue"]), (6, 3, 64.0))
+        self.assertEqual(stats["sell_through"], 6 / (6 + product.quantity))
+        self.assertIsNotNone(stats["last_sale"])
+        self.assertEqual(self.sales.productSales(self.inventory.findProductByName("Emma"))["units"], 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = str(Path(tmp) / "Sales.csv")
+            self.sales.saveCSV(csv_path)
+            reloaded = SaleService(NullSink(), self.inventory.categoryOf, self.inventory.productIdOf)
+            reloaded.loadCSV(csv_path, useSnapshot=False)
+        # El CSV guarda la fecha en segundos enteros
+        self.assertEqual(reloaded.productSales(product), {**stats, "last_sale": float(int(stats["last_sale"]))})
+
+    def test_reused_name_does_not_inherit_sales(self):
+        self.assertIsNotNone(self.checkout.checkout(self.user, "Emma", 2))
+        self.assertTrue(self.inventory.updateProduct("Emma", new_name="Persuasion"))
+        self.assertTrue(self.inventory.addProduct("Emma", "Other", "Novel", 5, 8.0))
+        self.assertEqual(self.sales.productSales(self.inventory.findProductByName("Emma"))["units"], 0)
+        self.assertEqual(self.sales.productSales(self.inventory.findProductByName("Persuasion"))["units"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Archivo: `test_sales_analytics.py`
+
+SalesAnalytics: top(dimensión, k, métrica) coincide con contar el historial
+completo aunque los acumulados cambien entre consultas, y series agrupa por
+hora o día. El top de categorías cuenta la categoría actual de cada producto
+(no la que tenía al venderse), igual en memoria que en SqliteRepository.
+
+    python -m unittest discover -s tests
+"""
+
+import random
+import tempfile
+import unittest
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+
+from Services.Inventory import Inventory
+from Services.SaleService import SaleService
+from Services.SalesAnalytics import SalesAnalytics
+from Services.SqliteRepository import SqliteRepository
+from Services.UserService import UserService
+from Utils.Events import NullSink
+
+
+class TopAndSeriesTest(unittest.TestCase):
+    def test_top_matches_counting_the_history(self):
+        rng = random.Random(11)
+        analytics = SalesAnalytics()
+        history = []
+        for step in range(400):
+            sale = (f"user{rng.randint(0, 9)}", f"Book {rng.randint(0, 29)}", rng.randint(1, 4),
+                    float(rng.randint(1, 20)))
+            analytics.add(*sale)
+            history.append(sale)
+            if step % 50 == 0:
+                analytics.top("product", 5, "units")  # los montículos se crean y siguen al día
+        for metric in ("revenue", "units", "count"):
+            for dimension, field in (("product", 1), ("user", 0)):
+                counts = Counter()
+                for sale in history:
+                    counts[sale[field]] += {"revenue": sale[2] * sale[3], "units": sale[2], "count": 1}[metric]
+                expected = counts.most_common()
+                top = analytics.top(dimension, 5, metric)
+                self.assertEqual([value for _, value in top], [value for _, value in expected[:5]])
+                for key, value in top:
+                    self.assertEqual(counts[key], value)
+                    self.assertEqual(analytics.get(dimension, key)[metric], value)
+        self.assertEqual(analytics.count, 400)
+        with self.assertRaises(ValueError):
+            analytics.top("author")
+        with self.assertRaises(ValueError):
+            analytics.top("user", metric="profit")
+
+    def test_series_by_hour_and_day(self):
+        analytics = SalesAnalytics()
+        stamps = [datetime(2026, 3, 1, 9, 15), datetime(2026, 3, 1, 9, 45), datetime(2026, 3, 1, 17, 5),
+                  datetime(2026, 3, 3, 8, 0)]
+        for i, stamp in enumerate(stamps, 1):
+            analytics.add("ana", "Dune", i, 10.0, stamp.timestamp())
+        analytics.add("ana", "Dune", 100, 10.0)  # sin fecha: no cuenta en las series
+        self.assertEqual(analytics.series("day"), [(date(2026, 3, 1), 60.0, 6, 3), (date(2026, 3, 3), 40.0, 4, 1)])
+        self.assertEqual(analytics.series("hour", start=datetime(2026, 3, 1, 10)),
+                         [(datetime(2026, 3, 1, 17), 30.0, 3, 1), (datetime(2026, 3, 3, 8), 40.0, 4, 1)])
+        self.assertEqual(analytics.series("day", end=date(2026, 3, 2)), [(date(2026, 3, 1), 60.0, 6, 3)])
+        with self.assertRaises(ValueError):
+            analytics.series("user")
+
+
+class TopCategoriesTest(unittest.TestCase):
+    def setUp(self):
+        self.inventory = Inventory(NullSink())
+        self.inventory.addProducts([("Dune", "Herbert", "SciFi", 50, 10.0),
+                                    ("Emma", "Austen", "Novel", 50, 8.0),
+                                    ("Ubik", "Dick", "SciFi", 50, 5.0)])
+        self.sales = SaleService(NullSink(), self.inventory.categoryOf, self.inventory.productIdOf)
+        for name, qty in (("Dune", 1), ("Emma", 2), ("Ubik", 3), ("Dune", 1)):
+            product = self.inventory.findProductByName(name)
+            self.sales.addSale("ana", name, qty, product.price, 1, product_id=product.productID)
+
+    def sqliteTop(self) -> list[tuple]:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        repo = SqliteRepository(str(Path(tmp.name) / "store.db"), NullSink())
+        self.addCleanup(repo.close)
+        repo.importAll(self.inventory, self.sales, UserService(NullSink()))
+        return repo.salesStatistics(self.sales)["top_categories"]
+
+    def test_recategorized_product_moves_its_sales(self):
+        self.assertEqual(self.sales.statistics()["top_categories"], [("SciFi", 35.0), ("Novel", 16.0)])
+        # Los acumulados ya existen: el cambio se ve sin recalcular el historial
+        self.assertTrue(self.inventory.updateProduct("Ubik", new_category="Novel"))
+        expected = [("Novel", 31.0), ("SciFi", 20.0)]
+        self.assertEqual(self.sales.statistics()["top_categories"], expected)
+        self.assertEqual(self.sqliteTop(), expected)
+
+    def test_sales_of_removed_products_are_not_counted(self):
+        sales = SaleService(NullSink(), self.inventory.categoryOf)
+        sales.addSale("ana", "Gone", 1, 99.0, 1, product_id=999)
+        sales.addSale("ana", "Emma", 1, 8.0, 1, product_id=self.inventory.findProductByName("Emma").productID)
+        self.assertEqual(sales.statistics()["top_categories"], [("Novel", 8.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Archivo: `test_sales_journal.py`
+
+Diario de ventas: las ventas se reaplican al cargar (también tras una caída
+a mitad de fila), la compactación (solo al guardar, nunca en una venta)
+vacía el diario y las ventas aplazadas
+(defer=True) que llegan mientras se compacta el CSV no se pierden.
+
+    python -m unittest discover -s tests
+"""
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from Services.Repository import CsvRepository
+from Services.SaleService import SaleService
+from Utils.Events import NullSink
+
+
+class SalesJournalTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv = Path(tmp.name) / "Sales.csv"
+        self.sales = SaleService(NullSink())
+
+    def reload(self) -> SaleService:
+        sales = SaleService(NullSink())
+        sales.loadCSV(str(self.csv), useSnapshot=False)
+        return sales
+
+    def addSales(self, count: int) -> None:
+        for i in range(count):
+            self.sales.addSale(f"user{i % 3}", f"Book {i % 4}", 1, 10.0, 1)
+
+    def test_journal_is_replayed_after_a_crash(self):
+        self.addSales(10)
+        self.sales.saveCSV(str(self.csv))
+        self.sales.openJournal(str(self.csv), compactEvery=0)
+        self.addSales(5)
+        journal = self.csv.with_suffix(".journal")
+        self.assertEqual(len(journal.read_text(encoding="utf-8").splitlines()), 5)
+        # Caída a mitad de una fila: la última queda cortada
+        with journal.open("a", encoding="utf-8") as f:
+            f.write("16,ana,Bo")
+
+        sales = self.reload()
+        self.assertEqual(list(sales._sales.saleIDs()), list(range(1, 16)))
+        # Reaplicar dos veces no duplica y los IDs siguen tras los del diario
+        self.assertEqual(len(self.reload()._sales), 15)
+        self.assertEqual(sales.addSale("ana", "Book 1", 1, 1.0, 1).saleID, 16)
+
+    def test_compaction_empties_the_journal(self):
+        self.addSales(10)
+        self.sales.saveCSV(str(self.csv))
+        self.sales.openJournal(str(self.csv), compactEvery=4)
+        journal = self.csv.with_suffix(".journal")
+        self.addSales(3)
+        self.assertFalse(self.sales.compactIfDue())
+        self.addSales(1)
+        # Las ventas solo añaden filas; la compactación la pide quien guarda
+        self.assertTrue(journal.exists())
+        self.assertTrue(self.sales.compactIfDue())
+        self.assertFalse(journal.exists())
+        self.addSales(2)
+        self.sales.compact()
+        self.assertFalse(journal.exists())
+        self.assertEqual(len(self.reload()._sales), 16)
+
+    def test_repository_compacts_when_saving(self):
+        repo = CsvRepository(str(self.csv.parent), compactEvery=3)
+        repo.loadSales(self.sales)
+        journal = self.csv.with_suffix(".journal")
+        self.addSales(4)
+        self.assertTrue(journal.exists())
+        repo.saveSales(self.sales)
+        self.assertFalse(journal.exists())
+        self.assertEqual(len(self.reload()._sales), 4)
+
+    def test_journal_without_csv_is_loaded(self):
+        self.sales.openJournal(str(self.csv), compactEvery=0)
+        self.addSales(3)
+        self.assertFalse(self.csv.exists())
+        self.assertEqual(list(self.reload()._sales.saleIDs()), [1, 2, 3])
+
+    def test_deferred_sales_survive_concurrent_compaction(self):
+        for i in range(20_000):
+            self.sales.addSale(f"user{i % 50}", f"Book {i % 100}", 1, 10.0, 1)
+        self.sales.saveCSV(str(self.csv))
+        self.sales.openJournal(str(self.csv), compactEvery=0)
+
+        added = []
+
+        def buyer():
+            for _ in range(20_000):
+                added.append(self.sales.addSale("buyer", "Book 0", 1, 10.0, 1, defer=True).saleID)
+
+        thread = threading.Thread(target=buyer)
+        thread.start()
+        compactions = 0
+        while thread.is_alive() or not compactions:
+            # Cada compactación reescribe el CSV mientras siguen llegando ventas
+            self.sales.compact()
+            self.sales.flushJournal()
+            compactions += 1
+        thread.join()
+        self.sales.flushJournal()
+
+        ids = set(self.reload()._sales.saleIDs())
+        self.assertEqual(len(ids), 20_000 + len(added))
+        self.assertTrue(ids.issuperset(added))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Archivo: `test_sales_load.py`
+
+Carga de Sales.csv: el cargador paralelo (workers > 1) da las mismas ventas,
+errores y duplicados que el secuencial, también con IDs repetidos entre
+bloques. iter_sales(unique=False) no descarta los repetidos.
+
+    python -m unittest discover -s tests
+"""
+
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from Services.SaleService import SALES_HEADER, SaleService, iter_sales
+from Utils.CsvStream import LoadReport
+from Utils.Events import NullSink
+
+ROWS = 4000
+
+
+class SalesLoadTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv = Path(tmp.name) / "Sales.csv"
+        with self.csv.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(SALES_HEADER)
+            for i in range(1, ROWS + 1):
+                writer.writerow([i, f"user{i % 7}", f"Book {i % 11}", i % 5 + 1, 12.5, i % 2 + 1,
+                                 "", 1_700_000_000 + i, i % 11 + 1])
+            # IDs repetidos al final: su primera aparición está en otro bloque
+            for i in (1, 2, ROWS // 2, ROWS // 2):
+                writer.writerow([i, "dup", "Book 0", 1, 1.0, 1])
+            writer.writerow(["x", "bad", "Book 0", 1, 1.0, 1])
+            writer.writerow([ROWS + 1, "short"])
+
+    def load(self, workers: int) -> tuple[SaleService, LoadReport]:
+        sales = SaleService(NullSink())
+        report = sales.loadCSV(str(self.csv), workers=workers, useSnapshot=False)
+        return sales, report
+
+    def test_parallel_load_matches_sequential(self):
+        sequential, expected = self.load(1)
+        parallel, report = self.load(4)
+        self.assertEqual(list(parallel._sales.rows()), list(sequential._sales.rows()))
+        self.assertEqual((report.loaded, report.skipped, report.duplicates),
+                         (expected.loaded, expected.skipped, expected.duplicates))
+        self.assertEqual(sorted(report.errors), sorted(expected.errors))
+        self.assertEqual((report.loaded, report.duplicates, report.skipped), (ROWS, 4, 6))
+        # Los IDs nuevos siguen al mayor cargado
+        self.assertEqual(parallel.addSale("ana", "Book 1", 1, 1.0, 1).saleID, ROWS + 1)
+
+    def test_iter_sales_without_dedup_keeps_every_row(self):
+        report = LoadReport(self.csv)
+        sales = list(iter_sales(self.csv, report, unique=False))
+        self.assertEqual(len(sales), ROWS + 4)
+        self.assertEqual((report.duplicates, report.skipped), (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Archivo: `test_search_index.py`
+
+SearchIndex: un alta masiva (extend, indexada en la primera consulta) da los
+mismos resultados que las altas una a una; searchProduct no falla con
+consultas numéricas que int() no acepta.
+
+    python -m unittest discover -s tests
+"""
+
+import unittest
+
+from Services.Inventory import Inventory
+from Utils.Events import NullSink
+from Utils.SearchIndex import SearchIndex
+
+DOCS = [(i, f"Libro {i} Año", f"Autor {i % 7}", f"Género {i % 3}") for i in range(1, 301)]
+QUERIES = ["libro 1", "ano", "AUTOR 3", "genero", "o", "12", "zz", "libro 29 año"]
+
+
+class SearchIndexTest(unittest.TestCase):
+    def test_extend_matches_adding_one_by_one(self):
+        eager, lazy = SearchIndex(), SearchIndex()
+        for doc in DOCS:
+            eager.add(*doc)
+        lazy.extend(DOCS)
+        for query in QUERIES:
+            self.assertEqual(lazy.search(query), eager.search(query), query)
+            self.assertEqual(lazy.search(query, 5), eager.search(query, 5), query)
+        self.assertEqual(len(lazy), len(DOCS))
+
+    def test_changes_after_extend_apply_on_top(self):
+        index = SearchIndex()
+        index.extend(DOCS[:10])
+        index.extend([(3, "Dune", "Herbert", "SciFi")])  # el último gana
+        index.remove(4)
+        index.add(11, "Emma", "Austen", "Novela")
+        self.assertEqual(index.search("dune"), [3])
+        self.assertEqual(index.search("libro 3"), [])
+        self.assertEqual(index.search("libro 4"), [])
+        self.assertEqual(index.search("emma"), [11])
+        self.assertEqual(len(index), 10)
+        index.clear()
+        self.assertEqual(index.search("libro"), [])
+
+
+class SearchProductTest(unittest.TestCase):
+    def test_numeric_queries(self):
+        inventory = Inventory(NullSink())
+        inventory.addProducts([("Dune", "Herbert", "SciFi", 1, 1.0), ("Libro 1", "Autor", "Cat", 1, 1.0)])
+        # "²" es un dígito para isdigit pero no un número para int()
+        self.assertEqual(inventory.searchProduct("²"), [])
+        self.assertEqual([p.name for p in inventory.searchProduct("1")], ["Dune", "Libro 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Archivo: `test_snapshot.py`
+
+Snapshots binarios (`.snap`): se leen en lugar del CSV solo si están al día
+y son válidos; si no, se vuelve al CSV y se regeneran.
+
+    python -m unittest discover -s tests
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import Services.SaleService as sale_service
+from Services.Inventory import Inventory
+from Services.SaleService import SaleService
+from Utils.Events import NullSink
+from Utils.Snapshot import SnapshotSchema, is_fresh, read_snapshot, snapshot_path, write_snapshot
+
+SCHEMA = SnapshotSchema(9, "qId", (1,))
+ROWS = [(1, "ana", 1.5), (2, "luis", 2.5), (3, "ana", 3.5)]
+
+
+class SnapshotFormatTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.snap = self.dir / "rows.snap"
+
+    def test_round_trip(self):
+        self.assertEqual(write_snapshot(self.snap, SCHEMA, ROWS), 3)
+        self.assertEqual(list(read_snapshot(self.snap, SCHEMA)), ROWS)
+
+    def test_invalid_snapshots_are_rejected(self):
+        self.assertIsNone(read_snapshot(self.snap, SCHEMA))  # no existe
+        write_snapshot(self.snap, SCHEMA, ROWS)
+        self.assertIsNone(read_snapshot(self.snap, SnapshotSchema(9, "qId", (1,), version=2)))
+        self.assertIsNone(read_snapshot(self.snap, SnapshotSchema(8, "qId", (1,))))
+        data = self.snap.read_bytes()
+        self.snap.write_bytes(data[:-1])  # truncado
+        self.assertIsNone(read_snapshot(self.snap, SCHEMA))
+        self.snap.write_bytes(b"PPSN")
+        self.assertIsNone(read_snapshot(self.snap, SCHEMA))
+
+    def test_snapshot_older_than_csv_is_stale(self):
+        csv_path = self.dir / "rows.csv"
+        csv_path.write_text("id\n", encoding="utf-8")
+        write_snapshot(self.snap, SCHEMA, ROWS)
+        self.assertTrue(is_fresh(self.snap, csv_path))
+        stat = self.snap.stat()
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertFalse(is_fresh(self.snap, csv_path))
+
+
+class ServiceSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv = Path(tmp.name) / "Sales.csv"
+        sales = SaleService(NullSink())
+        for i in range(50):
+            sales.addSale(f"user{i % 3}", f"Book {i % 4}", 1, 10.0, 1)
+        sales.saveCSV(str(self.csv))
+        parsed = SaleService(NullSink())
+        parsed.loadCSV(str(self.csv), useSnapshot=False)
+        self.expected = list(parsed._sales.rows())
+
+    def load(self) -> tuple[SaleService, mock.Mock]:
+        sales = SaleService(NullSink())
+        with mock.patch.object(sale_service, "iter_csv", wraps=sale_service.iter_csv) as parsed:
+            sales.loadCSV(str(self.csv))
+        return sales, parsed
+
+    def test_fresh_snapshot_skips_the_csv(self):
+        sales, parsed = self.load()
+        parsed.assert_not_called()
+        self.assertEqual(list(sales._sales.rows()), self.expected)
+
+    def test_csv_newer_than_snapshot_is_parsed_and_snapshot_regenerated(self):
+        with self.csv.open("a", newline="", encoding="utf-8") as f:
+            f.write("999,late,Book 0,1,10.0,1\n")
+        stat = snapshot_path(self.csv).stat()
+        os.utime(self.csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        sales, parsed = self.load()
+        parsed.assert_called_once()
+        self.assertEqual(len(sales._sales), 51)
+        sales, parsed = self.load()
+        parsed.assert_not_called()
+        self.assertEqual(len(sales._sales), 51)
+
+    def test_corrupt_snapshot_falls_back_to_csv(self):
+        snap = snapshot_path(self.csv)
+        snap.write_bytes(snap.read_bytes()[:-3])
+        sales, parsed = self.load()
+        parsed.assert_called_once()
+        self.assertEqual(list(sales._sales.rows()), self.expected)
+
+    def test_snapshot_holds_csv_rows_and_journal_is_replayed(self):
+        sales = SaleService(NullSink())
+        sales.loadCSV(str(self.csv))
+        sales.openJournal(str(self.csv), compactEvery=0)
+        sales.addSale("ana", "Book 9", 2, 5.0, 1)
+        snapshot_path(self.csv).unlink()
+        # Carga desde el CSV: el snapshot nuevo solo lleva sus filas, no las del diario
+        reloaded, _ = self.load()
+        self.assertEqual(len(reloaded._sales), 51)
+        self.assertEqual(sum(1 for _ in read_snapshot(snapshot_path(self.csv), sale_service.SALE_SNAPSHOT)), 50)
+        again, _ = self.load()
+        self.assertEqual(list(again._sales.rows()), list(reloaded._sales.rows()))
+
+    def test_inventory_snapshot_includes_replayed_journal(self):
+        path = self.csv.with_name("Inventario.csv")
+        inventory = Inventory(NullSink())
+        inventory.addProduct("Dune", "Herbert", "SciFi", 5, 10.0)
+        inventory.saveCSV(str(path))
+        inventory.openJournal(str(path))
+        inventory.purchase("Dune", 2)
+        snapshot_path(path).unlink()
+
+        first = Inventory(NullSink())
+        first.loadCSV(str(path))
+        second = Inventory(NullSink())
+        second.loadCSV(str(path))
+        self.assertEqual(first.findProductByName("Dune").quantity, 3)
+        self.assertEqual(second.findProductByName("Dune").quantity, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
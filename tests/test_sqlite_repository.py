@@ -0,0 +1,87 @@
+"""
+Archivo: `test_sqlite_repository.py`
+
+SqliteRepository: el stock lo lleva la base de datos; las compras lo
+descuentan en SQL y los cambios del administrador se guardan como diferencia,
+así que ninguno pisa al otro.
+
+    python -m unittest discover -s tests
+"""
+
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from Models.User import User
+from Services.Inventory import Inventory
+from Services.SaleService import SaleService
+from Services.SqliteRepository import SqliteRepository
+from Utils.Events import NullSink
+
+STOCK = 1000
+WORKERS = 8
+
+
+class SqliteRepositoryTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = SqliteRepository(str(Path(tmp.name) / "store.db"), NullSink())
+        self.addCleanup(self.repo.close)
+        self.inventory = Inventory(NullSink())
+        self.inventory.addProduct("Dune", "Herbert", "SciFi", STOCK, 10.0)
+        self.repo.saveInventory(self.inventory)
+        self.sales = SaleService(NullSink())
+        self.user = User("Buyer", "buyer", "secret", 2)
+
+    def storedStock(self, name: str = "Dune") -> int:
+        inventory = Inventory(NullSink())
+        self.repo.loadInventory(inventory)
+        return inventory.findProductByName(name).quantity
+
+    def test_admin_stock_edit_survives_reload(self):
+        self.inventory.addProduct("Emma", "Austen", "Novel", 0, 8.0)
+        self.repo.saveInventory(self.inventory)
+        self.assertTrue(self.inventory.updateProduct("Emma", quantity=25))
+        self.repo.saveInventory(self.inventory)
+        self.assertEqual(self.storedStock("Emma"), 25)
+
+    def test_unsaved_admin_edit_and_purchase_both_count(self):
+        self.assertTrue(self.inventory.updateProduct("Dune", quantity=STOCK + 10))
+        # La compra descuenta en la base de datos antes de guardar el cambio de stock
+        self.assertIsNotNone(self.repo.purchase(self.inventory, self.sales, self.user, "Dune", 3))
+        self.assertEqual(self.inventory.findProductByName("Dune").quantity, STOCK + 7)
+        self.repo.saveInventory(self.inventory)
+        self.assertEqual(self.storedStock(), STOCK + 7)
+
+    def test_concurrent_purchases_and_flushes_never_oversell(self):
+        stop = threading.Event()
+
+        def flusher():
+            while not stop.is_set():
+                self.repo.flush(self.inventory, self.sales)
+
+        def buyer(_):
+            sold = 0
+            while self.repo.purchase(self.inventory, self.sales, self.user, "Dune", 1) is not None:
+                sold += 1
+            return sold
+
+        thread = threading.Thread(target=flusher)
+        thread.start()
+        try:
+            with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+                sold = sum(pool.map(buyer, range(WORKERS)))
+        finally:
+            stop.set()
+            thread.join()
+        self.repo.flush(self.inventory, self.sales)
+        self.assertEqual(sold, STOCK)
+        self.assertEqual(self.storedStock(), 0)
+        self.assertEqual(self.inventory.findProductByName("Dune").quantity, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
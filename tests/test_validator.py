@@ -0,0 +1,71 @@
+"""
+Archivo: `test_validator.py`
+
+RecordSpec: la ruta rápida de parse_csv acepta y rechaza exactamente lo
+mismo que la validación campo a campo (parse_or_raise).
+
+    python -m unittest discover -s tests
+"""
+
+import itertools
+import unittest
+
+from Services.Inventory import PRODUCT_CSV_SPEC
+from Services.SaleService import SALE_CSV_SPEC
+from Utils.Validator import USER_SPEC, Field, RecordSpec
+
+TEXTS = ["Dune", "  Dune  ", "", "   ", "Ñandú 2", "x" * 10_001]
+INTS = ["0", "7", " 7 ", "-3", "+4", "1.5", "", "abc", str(2 ** 63), str(2 ** 63 - 1)]
+DECIMALS = ["12.5", "12,5", "1 250.5", "0", "-1", "inf", "nan", "", "abc", "1e3"]
+TIMESTAMPS = ["", "  ", "1700000000", "2024-01-02T03:04:05+00:00", "yesterday"]
+
+
+class RecordSpecTest(unittest.TestCase):
+    def assertSameAsFallback(self, spec: RecordSpec, row: list[str]) -> None:
+        try:
+            expected = spec.parse_or_raise(row)
+        except ValueError:
+            expected = ValueError
+        try:
+            actual = spec.parse_csv(row)
+        except ValueError:
+            actual = ValueError
+        self.assertEqual(actual, expected, row)
+
+    def test_sale_rows_match_fallback(self):
+        valid = ["5", "ana", "Dune", "2", "10.5", "1", "21.0", "2024-01-02T03:04:05+00:00", "3"]
+        columns = [INTS, TEXTS, TEXTS, INTS, DECIMALS, INTS, DECIMALS, TIMESTAMPS, INTS]
+        # Cada columna con todos sus casos, el resto válidas
+        for i, cases in enumerate(columns):
+            for value in cases:
+                self.assertSameAsFallback(SALE_CSV_SPEC, valid[:i] + [value] + valid[i + 1:])
+        # Filas cortas (opcionales ausentes) y largas
+        for n in range(len(valid) + 2):
+            self.assertSameAsFallback(SALE_CSV_SPEC, (valid + ["extra"] * 2)[:n])
+
+    def test_product_rows_match_fallback(self):
+        for quantity, price in itertools.product(INTS, DECIMALS):
+            self.assertSameAsFallback(PRODUCT_CSV_SPEC, ["1", "Dune", "Herbert", "SciFi", quantity, price])
+
+    def test_name_and_choice_fields_match_fallback(self):
+        names = ["Ana", "ana-2", "2ana", "an@", "", " Ana "]
+        for name, role in itertools.product(names, ["1", "2", "3", "x", ""]):
+            self.assertSameAsFallback(USER_SPEC, [name, "ana", "secret", role])
+        spec = RecordSpec(Field("price", "decimal", min_value=0, min_exclusive=True, max_value=100.0))
+        for value in ["0", "0.01", "100", "100.5", "50,5"]:
+            self.assertSameAsFallback(spec, [value])
+
+    def test_csv_parser_builds_from_fields(self):
+        parse = SALE_CSV_SPEC.csv_parser(dict, username="username", sale_id="saleID", product_id="productID")
+        self.assertEqual(parse(["5", "ana", "Dune", "2", "10.5", "1"]),
+                         {"username": "ana", "sale_id": 5, "product_id": None})
+        pick = SALE_CSV_SPEC.csv_parser(lambda *args: args, "product", "quantity")
+        self.assertEqual(pick(["5", "ana", "Dune", "2", "10,5", "1"]), ("Dune", 2))
+        with self.assertRaises(ValueError):
+            pick(["x", "ana", "Dune", "2", "10.5", "1"])
+        with self.assertRaises(ValueError):
+            SALE_CSV_SPEC.csv_parser(dict, "missing")
+
+
+if __name__ == "__main__":
+    unittest.main()